@@ -0,0 +1,56 @@
+"""Hot-path indexes for list filters, created_at ordering and dashboard counts
+
+Built with CREATE INDEX CONCURRENTLY so writes are not blocked on large
+tables; that cannot run inside a transaction, hence the autocommit block.
+Trailing id columns make (created_at, id) usable for keyset pagination.
+
+Revision ID: 0002_hot_path_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_hot_path_indexes"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    ("ix_payments_created_at_id", "payments", ["created_at", "id"], None),
+    ("ix_payments_status_created_at", "payments", ["status", "created_at", "id"], None),
+    ("ix_payments_method_created_at", "payments", ["method", "created_at", "id"], None),
+    ("ix_procurements_created_at_id", "procurements", ["created_at", "id"], None),
+    ("ix_procurements_status_created_at", "procurements", ["status", "created_at", "id"], None),
+    ("ix_procurements_category", "procurements", ["category"], None),
+    ("ix_purchase_requests_created_at_id", "purchase_requests", ["created_at", "id"], None),
+    ("ix_purchase_requests_status_created_at", "purchase_requests", ["status", "created_at", "id"], None),
+    ("ix_revenues_created_at_id", "revenues", ["created_at", "id"], None),
+    ("ix_revenues_status_collected_date", "revenues", ["status", "collected_date"], None),
+    ("ix_attachments_entity", "attachments", ["entity_type", "entity_id", "uploaded_at"], None),
+    ("ix_attachments_uploaded_at_id", "attachments", ["uploaded_at", "id"], None),
+    ("ix_notifications_user_created_at", "notifications", ["user_id", "created_at", "id"], None),
+    ("ix_notifications_user_unread", "notifications", ["user_id", "created_at"], "is_read = false"),
+    ("ix_audit_logs_created_at_id", "audit_logs", ["created_at", "id"], None),
+    ("ix_audit_logs_entity_action_user", "audit_logs", ["entity_type", "action", "user_id", "created_at"], None),
+    ("ix_audit_logs_user_created_at", "audit_logs", ["user_id", "created_at"], None),
+    ("ix_fraud_alerts_resolved_detected_at", "fraud_alerts", ["is_resolved", "detected_at", "id"], None),
+]
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,47 @@
+"""pg_trgm GIN indexes for substring and fuzzy search
+
+These serve the existing `ilike '%term%'` list filters as well as the
+similarity ranking used by /api/v1/search.
+
+Revision ID: 0003_search_trigram_indexes
+Revises: 0002_hot_path_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0003_search_trigram_indexes"
+down_revision = "0002_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs searched by the list endpoints and /search
+SEARCH_COLUMNS = [
+    ("payments", "payee"),
+    ("payments", "payment_id"),
+    ("payments", "reference"),
+    ("revenues", "source"),
+    ("revenues", "revenue_id"),
+    ("purchase_requests", "title"),
+    ("purchase_requests", "request_id"),
+    ("procurements", "title"),
+    ("procurements", "tender_id"),
+]
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for table, column in SEARCH_COLUMNS:
+            op.create_index(
+                f"ix_{table}_{column}_trgm",
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column in reversed(SEARCH_COLUMNS):
+            op.drop_index(f"ix_{table}_{column}_trgm", table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,65 @@
+"""Rollup tables, data versions and the vendor-ranking covering index
+
+payment_rollups/revenue_rollups hold the monthly totals maintained by
+RollupService and data_versions the per-dataset change counters behind the
+analytics ETags. Rollups start empty on an existing database: backfill them
+with `python rebuild_rollups.py` after upgrading.
+
+Revision ID: 0004_rollups_and_data_versions
+Revises: 0003_search_trigram_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_rollups_and_data_versions"
+down_revision = "0003_search_trigram_indexes"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "payment_rollups",
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("method", sa.String(), primary_key=True),
+        sa.Column("status", sa.String(), primary_key=True),
+        sa.Column("payee", sa.String(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=16, scale=2), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+
+    op.create_table(
+        "revenue_rollups",
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("category", sa.String(), primary_key=True),
+        sa.Column("status", sa.String(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=16, scale=2), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+
+    op.create_table(
+        "data_versions",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_payments_status_payee_amount",
+            "payments",
+            ["status", "payee", "amount"],
+            postgresql_include=["payment_date", "method"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_payments_status_payee_amount", table_name="payments", postgresql_concurrently=True, if_exists=True
+        )
+    for table in ("data_versions", "revenue_rollups", "payment_rollups"):
+        op.drop_table(table)
@@ -0,0 +1,54 @@
+"""NOT NULL timestamps for the keyset-paginated lists
+
+The list endpoints page on (timestamp, id). A NULL timestamp cannot be
+encoded in a cursor and never compares below one, so such rows would break
+or silently drop out of cursor pages. Existing NULLs are backfilled with the
+epoch (they sort last, as "oldest"), and the naive UTC columns that only had
+a Python-side default get a server default as well.
+
+NOT NULL is proven by a NOT VALID check constraint validated separately, so
+the ACCESS EXCLUSIVE lock taken by SET NOT NULL does not scan the table.
+
+Revision ID: 0005_pagination_not_null
+Revises: 0004_rollups_and_data_versions
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_pagination_not_null"
+down_revision = "0004_rollups_and_data_versions"
+branch_labels = None
+depends_on = None
+
+# (table, column, server default to add or None if it already has one)
+UTC_NOW = "timezone('utc', now())"
+COLUMNS = [
+    ("payments", "created_at", None),
+    ("revenues", "created_at", None),
+    ("procurements", "created_at", None),
+    ("purchase_requests", "created_at", None),
+    ("audit_logs", "created_at", None),
+    ("notifications", "created_at", UTC_NOW),
+    ("attachments", "uploaded_at", UTC_NOW),
+    ("fraud_alerts", "detected_at", UTC_NOW),
+]
+
+def upgrade() -> None:
+    # Each statement commits on its own so no lock is held across the backfill or the validation
+    with op.get_context().autocommit_block():
+        for table, column, default in COLUMNS:
+            if default:
+                op.alter_column(table, column, server_default=sa.text(default))
+            op.execute(f"UPDATE {table} SET {column} = 'epoch' WHERE {column} IS NULL")
+            constraint = f"ck_{table}_{column}_not_null"
+            op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {constraint} CHECK ({column} IS NOT NULL) NOT VALID")
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {constraint}")
+            op.alter_column(table, column, nullable=False)
+            op.drop_constraint(constraint, table)
+
+def downgrade() -> None:
+    for table, column, default in reversed(COLUMNS):
+        op.alter_column(table, column, nullable=True)
+        if default:
+            op.alter_column(table, column, server_default=None)
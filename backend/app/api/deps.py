@@ -1,38 +1,94 @@
-from typing import AsyncGenerator
-from fastapi import Depends, HTTPException, status
+from typing import AsyncGenerator, Union
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db import AsyncSessionLocal
+from app.db import AsyncSessionLocal, replica_router
 from app.core.config import settings
 from app.core import security
+from app.core.revocation import revocation_list
+from app.core.user_cache import CachedUser, user_cache
 from app.models.user import User
 from app.schemas.user import TokenData
 from sqlalchemy.future import select
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+# Clients send this after a write to read it back from the primary
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
 async def get_db() -> AsyncGenerator:
     async with AsyncSessionLocal() as session:
         yield session
 
-async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+async def get_read_sessionmaker(request: Request):
+    """
+    Session factory for read-only work, a replica's when one is healthy
+
+    Falls back to the primary when no replica is configured, every replica
+    lags past REPLICA_MAX_LAG_SECONDS, or the request carries X-Read-Primary.
+    Streaming responses use this directly so their session lives as long as
+    the response body rather than the request handler.
+    """
+    if request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true", "yes"):
+        return AsyncSessionLocal
+    return await replica_router.sessionmaker()
+
+async def get_read_db(request: Request) -> AsyncGenerator:
+    """Session for read-only endpoints (see get_read_sessionmaker)"""
+    factory = await get_read_sessionmaker(request)
+    async with factory() as session:
+        yield session
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> Union[User, CachedUser]:
+    """
+    Resolve the bearer token to a user
+
+    With AUTH_STATELESS_TOKENS the user is rebuilt from the token claims and
+    no database query is made. Otherwise, with USER_CACHE_ENABLED the result
+    is an immutable CachedUser served from a process-local LRU/TTL cache, so
+    most requests make no database query.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = security.verify_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
         token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
+    if payload.get("jti") and await revocation_list.is_revoked(payload["jti"]):
+        raise credentials_exception
+    
+    if settings.AUTH_STATELESS_TOKENS and "role" in payload:
+        return CachedUser(
+            id=payload["uid"],
+            email=email,
+            full_name=payload.get("name"),
+            is_active=True,  # Inactive users cannot log in or refresh
+            is_superuser=payload.get("su", False),
+            role=payload["role"],
+            permissions_version=payload.get("pv"),
+        )
+    
+    if settings.USER_CACHE_ENABLED:
+        cached = user_cache.get(token_data.email)
+        if cached is not None:
+            return cached
     
     result = await db.execute(select(User).where(User.email == token_data.email))
     user = result.scalars().first()
     if user is None:
         raise credentials_exception
-    return user
+    if not settings.USER_CACHE_ENABLED:
+        return user
+    snapshot = CachedUser.from_user(user)
+    user_cache.set(token_data.email, snapshot)
+    return snapshot
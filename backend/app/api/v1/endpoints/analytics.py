@@ -1,157 +1,272 @@
-from typing import Dict, Any
-from fastapi import APIRouter, Depends
+from typing import Dict, Any, List, Optional, Sequence
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import func
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from app.api import deps
+from app.core.cache import analytics_cache
+from app.core.http_cache import make_etag, not_modified
+from app.core.singleflight import analytics_flight, flight_key
 from app.models.user import User
 from app.models.procurement import Procurement
-from app.models.payment import Payment
 from app.models.purchase_request import PurchaseRequest
-from app.models.revenue import Revenue
+from app.models.rollup import PaymentRollup, RevenueRollup
+from app.services.analytics_service import analytics_service, bucket_label, shift_bucket
+from app.services.forecasting import forecasting_service, forecast
+from app.services.snapshot_service import snapshot_service
+from app.services.summary_service import summary_service
+from app.services.version_service import version_service
 
 router = APIRouter()
 
+# Opt-in: answer from the columnar snapshot when it is at most this many seconds old
+MaxStaleness = Query(None, ge=0, description="Accept snapshot data up to this many seconds old")
+
+DASHBOARD_DATASETS = ("procurement", "purchase_requests", "payments", "revenue")
+
+async def _not_modified(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    datasets: Sequence[str],
+    snapshot=None,
+    versions: Optional[Dict[str, int]] = None,
+) -> Optional[Response]:
+    """
+    304 if the caller's ETag still matches the data this response depends on
+
+    The ETag covers the query string, today's date ("this month" and default
+    ranges move with it) and either the dataset versions or, for snapshot
+    reads, the snapshot build time. Callers that also cache the body pass the
+    `versions` they keyed it by, so body and ETag always agree.
+    """
+    if snapshot is not None:
+        version = ("snapshot", snapshot.built_at)
+    else:
+        version = versions if versions is not None else await version_service.get(db, datasets)
+    etag = make_etag(request.url.path, str(request.query_params), datetime.utcnow().date(), version)
+    return not_modified(request, response, etag)
+
+async def _in_own_session(session_factory, fn, *args) -> Any:
+    """
+    Run `fn(session, *args)` on a session opened for this call
+
+    Coalesced work is awaited by every request sharing its key, so it must not
+    borrow the session of the request that started it: that session is closed
+    as soon as its request finishes or is cancelled.
+    """
+    async with session_factory() as session:
+        return await fn(session, *args)
+
 @router.get("/dashboard", response_model=Dict[str, Any])
 async def get_dashboard_stats(
-    db: AsyncSession = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
+    session_factory = Depends(deps.get_read_sessionmaker),
     current_user: User = Depends(deps.get_current_user),
 ):
     """Get dashboard statistics"""
+    versions = await version_service.get(db, DASHBOARD_DATASETS)
+    cached = await _not_modified(request, response, db, DASHBOARD_DATASETS, versions=versions)
+    if cached:
+        return cached
+    # Keyed by the data versions: other workers' writes do not clear this
+    # process's cache, so a body is only reused for the data it was built from
+    key = ("dashboard", datetime.utcnow().date(), tuple(sorted(versions.items())))
+    cached = analytics_cache.get(key)
+    if cached is not None:
+        return cached
+    return await analytics_flight.do(key, lambda: _in_own_session(session_factory, _compute_dashboard_stats, key))
+
+async def _compute_dashboard_stats(db: AsyncSession, cache_key) -> Dict[str, Any]:
+    # One round trip: each table contributes a single-row aggregate, cross joined
+    current_month_start = datetime.utcnow().date().replace(day=1)
+    tenders = select(
+        func.count().label("active_tenders")
+    ).where(Procurement.status == "active").subquery()
+    requests = select(
+        func.count().label("pending_requests")
+    ).where(PurchaseRequest.status == "pending_approval").subquery()
+    payments = select(
+        func.sum(PaymentRollup.count).filter(PaymentRollup.status == "pending_approval").label("pending_count"),
+        func.sum(PaymentRollup.amount).filter(PaymentRollup.status == "pending_approval").label("pending_amount"),
+    ).subquery()
+    revenue = select(
+        func.sum(RevenueRollup.amount).filter(
+            RevenueRollup.status == "collected",
+            RevenueRollup.month == current_month_start,
+        ).label("revenue_this_month")
+    ).subquery()
     
-    # Active tenders
-    active_tenders_result = await db.execute(
-        select(func.count(Procurement.id)).where(Procurement.status == "active")
-    )
-    active_tenders = active_tenders_result.scalar() or 0
-    
-    # Pending purchase requests
-    pending_requests_result = await db.execute(
-        select(func.count(PurchaseRequest.id)).where(PurchaseRequest.status == "pending_approval")
-    )
-    pending_requests = pending_requests_result.scalar() or 0
-    
-    # Pending payments
-    pending_payments_result = await db.execute(
-        select(func.count(Payment.id), func.sum(Payment.amount))
-        .where(Payment.status == "pending_approval")
-    )
-    pending_payments_count, pending_payments_amount = pending_payments_result.first()
-    
-    # Revenue this month
-    current_month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    revenue_result = await db.execute(
-        select(func.sum(Revenue.amount))
-        .where(Revenue.status == "collected")
-        .where(Revenue.collected_date >= current_month_start)
-    )
-    revenue_this_month = revenue_result.scalar() or 0
+    result = await db.execute(select(tenders, requests, payments, revenue))
+    row = result.one()
     
-    return {
-        "active_tenders": active_tenders,
-        "pending_purchase_requests": pending_requests,
+    stats = {
+        "active_tenders": row.active_tenders or 0,
+        "pending_purchase_requests": row.pending_requests or 0,
         "pending_payments": {
-            "count": pending_payments_count or 0,
-            "amount": float(pending_payments_amount or 0)
+            "count": int(row.pending_count or 0),
+            "amount": float(row.pending_amount or 0)
         },
-        "revenue_this_month": float(revenue_this_month)
+        "revenue_this_month": float(row.revenue_this_month or 0)
     }
+    analytics_cache.set(cache_key, stats)
+    return stats
+
+@router.get("/cache-stats", response_model=Dict[str, Any])
+async def get_cache_stats(
+    current_user: User = Depends(deps.get_current_user),
+):
+    """Hit/miss counters for the dashboard statistics cache"""
+    return analytics_cache.stats()
+
+@router.get("/coalescing-stats", response_model=Dict[str, Any])
+async def get_coalescing_stats(
+    current_user: User = Depends(deps.get_current_user),
+):
+    """How many concurrent analytics calls shared an in-flight query"""
+    return analytics_flight.stats()
 
 @router.get("/procurement-trends", response_model=Dict[str, Any])
 async def get_procurement_trends(
-    db: AsyncSession = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    max_staleness: Optional[int] = MaxStaleness,
+    db: AsyncSession = Depends(deps.get_read_db),
+    session_factory = Depends(deps.get_read_sessionmaker),
     current_user: User = Depends(deps.get_current_user),
 ):
     """Get procurement trends over time"""
-    # Get procurement count by status
-    status_result = await db.execute(
-        select(Procurement.status, func.count(Procurement.id))
-        .group_by(Procurement.status)
-    )
-    status_counts = {status: count for status, count in status_result.all()}
-    
-    # Get procurement count by category
-    category_result = await db.execute(
-        select(Procurement.category, func.count(Procurement.id))
-        .group_by(Procurement.category)
+    snapshot = snapshot_service.get(max_staleness)
+    cached = await _not_modified(request, response, db, ("procurement",), snapshot)
+    if cached:
+        return cached
+    if snapshot is not None:
+        procurements = snapshot.tables["procurements"]
+        return {
+            "by_status": {k: v["count"] for k, v in procurements.group_by("status").items()},
+            "by_category": {k: v["count"] for k, v in procurements.group_by("category").items()},
+        }
+    return await analytics_flight.do(
+        flight_key("procurement-trends"), lambda: _in_own_session(session_factory, _compute_procurement_trends)
     )
-    category_counts = {category: count for category, count in category_result.all()}
+
+async def _compute_procurement_trends(db: AsyncSession) -> Dict[str, Any]:
+    # Status and category counts from one GROUPING SETS scan
+    summary = await summary_service.summarize(db, "procurement", ["status", "category"])
+    groups = summary["groups"]
     
     return {
-        "by_status": status_counts,
-        "by_category": category_counts
+        "by_status": {row["status"]: row["count"] for row in groups.get("status", [])},
+        "by_category": {row["category"]: row["count"] for row in groups.get("category", [])}
     }
 
 @router.get("/payment-summary", response_model=Dict[str, Any])
 async def get_payment_summary(
-    db: AsyncSession = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    max_staleness: Optional[int] = MaxStaleness,
+    db: AsyncSession = Depends(deps.get_read_db),
+    session_factory = Depends(deps.get_read_sessionmaker),
     current_user: User = Depends(deps.get_current_user),
 ):
     """Get payment summary by method and status"""
-    # Get payment count and amount by method
-    method_result = await db.execute(
-        select(Payment.method, func.count(Payment.id), func.sum(Payment.amount))
-        .group_by(Payment.method)
+    snapshot = snapshot_service.get(max_staleness)
+    cached = await _not_modified(request, response, db, ("payments",), snapshot)
+    if cached:
+        return cached
+    if snapshot is not None:
+        payments = snapshot.tables["payments"]
+        return {
+            "by_method": payments.group_by("method", "amount"),
+            "by_status": payments.group_by("status", "amount"),
+        }
+    return await analytics_flight.do(
+        flight_key("payment-summary"), lambda: _in_own_session(session_factory, _compute_payment_summary)
     )
-    method_summary = {
-        method: {"count": count, "amount": float(amount or 0)}
-        for method, count, amount in method_result.all()
-    }
-    
-    # Get payment count and amount by status
-    status_result = await db.execute(
-        select(Payment.status, func.count(Payment.id), func.sum(Payment.amount))
-        .group_by(Payment.status)
+
+async def _compute_payment_summary(db: AsyncSession) -> Dict[str, Any]:
+    # Method and status breakdowns from one GROUPING SETS scan of the rollup
+    result = await db.execute(
+        select(
+            PaymentRollup.method,
+            PaymentRollup.status,
+            func.grouping(PaymentRollup.method).label("method_rolled_up"),
+            func.sum(PaymentRollup.count),
+            func.sum(PaymentRollup.amount),
+        )
+        .group_by(func.grouping_sets(PaymentRollup.method, PaymentRollup.status))
     )
-    status_summary = {
-        status: {"count": count, "amount": float(amount or 0)}
-        for status, count, amount in status_result.all()
-    }
     
-    return {
-        "by_method": method_summary,
-        "by_status": status_summary
-    }
+    summary = {"by_method": {}, "by_status": {}}
+    for method, status, method_rolled_up, count, amount in result.all():
+        totals = {"count": int(count or 0), "amount": float(amount or 0)}
+        if method_rolled_up:
+            summary["by_status"][status] = totals
+        else:
+            summary["by_method"][method] = totals
+    return summary
+
+@router.get("/summary/{entity}", response_model=Dict[str, Any])
+async def get_summary(
+    request: Request,
+    response: Response,
+    entity: str,
+    dimensions: List[str] = Query(..., description="e.g. status, method, category, month"),
+    measures: List[str] = Query(["count"], description="'count' or '<sum|avg|min|max>:<column>'"),
+    mode: str = Query("sets", pattern="^(sets|rollup|cube)$"),
+    db: AsyncSession = Depends(deps.get_read_db),
+    session_factory = Depends(deps.get_read_sessionmaker),
+    current_user: User = Depends(deps.get_current_user),
+):
+    """Multi-dimensional breakdown of payments, revenue, procurement or purchase_requests in one query"""
+    try:
+        _, dimension_names, measure_names = summary_service.build(entity, dimensions, measures, mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    cached = await _not_modified(request, response, db, (entity,))
+    if cached:
+        return cached
+    
+    key = flight_key("summary", entity=entity, dimensions=dimension_names, measures=measure_names, mode=mode)
+    return await analytics_flight.do(
+        key, lambda: _in_own_session(session_factory, summary_service.summarize, entity, dimension_names, measures, mode)
+    )
 
 @router.get("/spending-trends")
 async def get_spending_trends(
-    db: AsyncSession = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    granularity: str = Query("month", pattern="^(day|week|month|quarter)$"),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    max_staleness: Optional[int] = MaxStaleness,
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
-    """Get monthly spending trends for the last 12 months"""
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=365)
-    
-    query = select(Payment).where(
-        Payment.status == "completed",
-        Payment.payment_date >= start_date
-    )
-    result = await db.execute(query)
-    payments = result.scalars().all()
-    
-    monthly_data = {}
-    for i in range(12):
-        d = end_date - timedelta(days=30 * i)
-        key = d.strftime("%Y-%m")
-        monthly_data[key] = 0
-        
-    for payment in payments:
-        if payment.payment_date:
-            key = payment.payment_date.strftime("%Y-%m")
-            if key in monthly_data:
-                monthly_data[key] += payment.amount
-                
-    labels = sorted(monthly_data.keys())
-    data = [monthly_data[label] for label in labels]
+    """Get spending trends bucketed by day, week, month or quarter (default: last 12 months)"""
+    snapshot = snapshot_service.get(max_staleness)
+    cached = await _not_modified(request, response, db, ("payments",), snapshot)
+    if cached:
+        return cached
+    try:
+        if snapshot is not None:
+            buckets = snapshot.spending_by_period(granularity, start_date, end_date)
+        else:
+            buckets = await analytics_service.spending_by_period(db, granularity, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
-        "labels": labels,
+        "granularity": granularity,
+        "labels": [bucket_label(bucket, granularity) for bucket, _ in buckets],
         "datasets": [
             {
-                "label": "Monthly Spending",
-                "data": data,
+                "label": "Spending",
+                "data": [total for _, total in buckets],
                 "borderColor": "#3b82f6",
                 "backgroundColor": "rgba(59, 130, 246, 0.1)",
                 "fill": True
@@ -161,81 +276,88 @@ async def get_spending_trends(
 
 @router.get("/vendor-performance")
 async def get_vendor_performance(
-    db: AsyncSession = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    method: Optional[str] = Query(None),
+    max_staleness: Optional[int] = MaxStaleness,
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
-    """Get top vendors by spending"""
-    query = select(Payment).where(Payment.status == "completed")
-    result = await db.execute(query)
-    payments = result.scalars().all()
-    
-    vendor_stats = {}
-    for payment in payments:
-        vendor = payment.vendor
-        if vendor not in vendor_stats:
-            vendor_stats[vendor] = {"amount": 0, "count": 0}
-        vendor_stats[vendor]["amount"] += payment.amount
-        vendor_stats[vendor]["count"] += 1
-        
-    sorted_vendors = sorted(vendor_stats.items(), key=lambda x: x[1]["amount"], reverse=True)[:10]
+    """Get top vendors (payees) by completed spending"""
+    snapshot = snapshot_service.get(max_staleness)
+    cached = await _not_modified(request, response, db, ("payments",), snapshot)
+    if cached:
+        return cached
+    if snapshot is not None:
+        vendors = snapshot.top_vendors(limit, start_date, end_date, method)
+    else:
+        vendors = await analytics_service.top_vendors(db, limit, start_date, end_date, method)
     
     return {
-        "labels": [v[0] for v in sorted_vendors],
+        "labels": [v["payee"] for v in vendors],
         "datasets": [
             {
                 "label": "Total Spend",
-                "data": [v[1]["amount"] for v in sorted_vendors],
+                "data": [v["total"] for v in vendors],
                 "backgroundColor": "#10b981"
             }
-        ]
+        ],
+        "vendors": vendors
     }
 
 @router.get("/forecast")
 async def get_spending_forecast(
-    db: AsyncSession = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    horizon: int = Query(3, ge=1, le=24),
+    history: int = Query(36, ge=3, le=120),
+    dataset: str = Query("payments", pattern="^(payments|revenue)$"),
+    group_by: Optional[str] = Query(None, pattern="^(method|category)$"),
+    confidence: float = Query(0.95, gt=0, lt=1),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
-    """Simple spending forecast for next 3 months"""
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=180)
-    
-    query = select(Payment).where(
-        Payment.status == "completed",
-        Payment.payment_date >= start_date
-    )
-    result = await db.execute(query)
-    payments = result.scalars().all()
+    """Holt-Winters forecast of monthly totals, optionally one series per method/category"""
+    cached = await _not_modified(request, response, db, (dataset,))
+    if cached:
+        return cached
+    try:
+        months, names, values = await analytics_service.monthly_series(db, dataset, group_by, history)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    monthly_totals = {}
-    for payment in payments:
-        if payment.payment_date:
-            key = payment.payment_date.strftime("%Y-%m")
-            monthly_totals[key] = monthly_totals.get(key, 0) + payment.amount
-            
-    if not monthly_totals:
+    if not values.any():
         return {"labels": [], "datasets": []}
-        
-    values = list(monthly_totals.values())
-    avg_spend = sum(values) / len(values) if values else 0
     
-    forecast_data = []
-    labels = []
-    current_month = end_date
+    default_label = "Projected Spending" if dataset == "payments" else "Projected Revenue"
+    fit = forecasting_service.fit(values)
+    projection = forecast(fit, horizon, confidence)
+    last_month = datetime.combine(months[-1], datetime.min.time())
+    labels = [bucket_label(shift_bucket(last_month, "month", i), "month") for i in range(1, horizon + 1)]
     
-    for i in range(1, 4):
-        next_month = current_month + timedelta(days=30 * i)
-        labels.append(next_month.strftime("%Y-%m"))
-        forecast_data.append(avg_spend * (1 + (0.05 * i)))
-        
     return {
         "labels": labels,
         "datasets": [
             {
-                "label": "Projected Spending",
-                "data": forecast_data,
+                "label": f"Projected {name}" if group_by else default_label,
+                "data": projection.mean[i].tolist(),
+                "lower": projection.lower[i].tolist(),
+                "upper": projection.upper[i].tolist(),
                 "borderColor": "#8b5cf6",
                 "borderDash": [5, 5],
                 "fill": False
             }
-        ]
+            for i, name in enumerate(names)
+        ],
+        "model": {
+            "method": fit.method,
+            "confidence": confidence,
+            "parameters": {
+                name: {"alpha": float(fit.alpha[i]), "beta": float(fit.beta[i]), "gamma": float(fit.gamma[i])}
+                for i, name in enumerate(names)
+            }
+        }
     }
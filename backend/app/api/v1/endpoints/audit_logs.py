@@ -1,9 +1,10 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.api import deps
+from app.core.pagination import paginate
 from app.models.audit_log import AuditLog
 from app.models.user import User
 from app.schemas.audit_log import AuditLogResponse
@@ -12,11 +13,13 @@ router = APIRouter()
 
 @router.get("/", response_model=List[AuditLogResponse])
 async def list_audit_logs(
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_user),
     entity_type: Optional[str] = Query(None),
     action: Optional[str] = Query(None),
     user_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
 ):
@@ -35,9 +38,7 @@ async def list_audit_logs(
     if conditions:
         query = query.where(*conditions)
     
-    query = query.offset(skip).limit(limit).order_by(AuditLog.created_at.desc())
-    result = await db.execute(query)
-    return result.scalars().all()
+    return await paginate(db, query, AuditLog.created_at, AuditLog.id, response, cursor, skip, limit)
 
 @router.get("/{log_id}", response_model=AuditLogResponse)
 async def get_audit_log(
@@ -1,32 +1,93 @@
 from datetime import timedelta
-from typing import Any
+from typing import Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.api import deps
 from app.core import security
 from app.core.config import settings
+from app.core.revocation import revocation_list
+from app.core.user_cache import invalidate_user, user_cache
 from app.models.user import User
-from app.schemas.user import Token, UserCreate, UserResponse
+from app.schemas.user import LogoutRequest, RefreshRequest, Token, UserCreate, UserResponse
+from app.services.version_service import version_service
 
 router = APIRouter()
 
+async def _issue_tokens(db: AsyncSession, user: User) -> dict:
+    """Access + refresh token pair; stateless access tokens embed role claims"""
+    if settings.AUTH_STATELESS_TOKENS:
+        permissions_version = (await version_service.get(db, ["roles"]))["roles"]
+        claims = security.user_claims(user, permissions_version)
+        access_token_expires = timedelta(minutes=settings.STATELESS_ACCESS_TOKEN_EXPIRE_MINUTES)
+    else:
+        claims = {"uid": user.id}
+        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return {
+        "access_token": security.create_access_token(user.email, expires_delta=access_token_expires, claims=claims),
+        "refresh_token": security.create_refresh_token(user.email, user.id),
+        "token_type": "bearer",
+    }
+
+async def _revoke(payload: dict) -> None:
+    if payload.get("jti"):
+        await revocation_list.revoke(payload["jti"], payload["exp"])
+
 @router.post("/login", response_model=Token)
 async def login_access_token(db: AsyncSession = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()) -> Any:
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalars().first()
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+    if not user or not await security.verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     elif not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    return {
-        "access_token": security.create_access_token(user.email, expires_delta=access_token_expires),
-        "token_type": "bearer",
-    }
+    # Upgrade hashes made with an old cost factor while we have the plaintext
+    if security.needs_rehash(user.hashed_password):
+        user.hashed_password = await security.get_password_hash_async(form_data.password)
+        await db.commit()
+    
+    # A fresh login always starts from the current database state
+    invalidate_user(user.email)
+    return await _issue_tokens(db, user)
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(body: RefreshRequest, db: AsyncSession = Depends(deps.get_db)) -> Any:
+    """Exchange a refresh token for a new token pair (the old refresh token is revoked)"""
+    invalid = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    try:
+        payload = security.verify_token(body.refresh_token, token_type="refresh")
+    except JWTError:
+        raise invalid
+    if await revocation_list.is_revoked(payload["jti"]):
+        raise invalid
+    
+    # The only point where stateless sessions re-read the user: picks up role
+    # changes and deactivation at most one access-token lifetime late
+    result = await db.execute(select(User).where(User.id == payload["uid"]))
+    user = result.scalars().first()
+    if not user or not user.is_active or user.email != payload["sub"]:
+        raise invalid
+    await _revoke(payload)
+    return await _issue_tokens(db, user)
+
+@router.post("/logout")
+async def logout(
+    body: Optional[LogoutRequest] = None,
+    token: str = Depends(deps.oauth2_scheme),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """Revoke the current access token and, if given, the refresh token"""
+    await _revoke(security.verify_token(token))
+    if body and body.refresh_token:
+        try:
+            await _revoke(security.verify_token(body.refresh_token, token_type="refresh"))
+        except JWTError:
+            pass
+    return {"message": "Logged out"}
 
 @router.post("/register", response_model=UserResponse)
 async def register_user(user_in: UserCreate, db: AsyncSession = Depends(deps.get_db)) -> Any:
@@ -40,13 +101,14 @@ async def register_user(user_in: UserCreate, db: AsyncSession = Depends(deps.get
     user = User(
         email=user_in.email,
         full_name=user_in.full_name,
-        hashed_password=security.get_password_hash(user_in.password),
+        hashed_password=await security.get_password_hash_async(user_in.password),
         is_active=user_in.is_active,
         is_superuser=user_in.is_superuser,
         role=user_in.role,
     )
     db.add(user)
     await db.commit()
+    invalidate_user(user.email)
     await db.refresh(user)
     return user
 
@@ -54,3 +116,13 @@ async def register_user(user_in: UserCreate, db: AsyncSession = Depends(deps.get
 async def get_current_user_info(current_user: User = Depends(deps.get_current_user)) -> Any:
     """Get current user information"""
     return current_user
+
+@router.get("/user-cache-stats")
+async def get_user_cache_stats(current_user: User = Depends(deps.get_current_user)) -> Any:
+    """Hit/miss counters for the authenticated-user cache"""
+    return {"enabled": settings.USER_CACHE_ENABLED, **user_cache.stats()}
+
+@router.get("/hashing-stats")
+async def get_hashing_stats(current_user: User = Depends(deps.get_current_user)) -> Any:
+    """Queue depth of the bcrypt thread pool"""
+    return security.hash_queue_stats()
@@ -1,66 +1,35 @@
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
 from app.api import deps
 from app.models.user import User
-from app.models.payment import Payment
-from app.models.procurement import Procurement
-from app.services.export_service import export_service
+from app.services.export_service import EXPORT_SOURCES, XLSX_MEDIA_TYPE, export_service
 
 router = APIRouter()
 
 @router.get("/{module}")
 async def export_data(
     module: str,
-    format: str = Query("csv", regex="^(csv|excel)$"),
-    db: AsyncSession = Depends(deps.get_db),
+    format: str = Query("csv", pattern="^(csv|excel)$"),
+    sheets: List[str] = Query([], description="Extra modules added as worksheets (excel only)"),
+    session_factory = Depends(deps.get_read_sessionmaker),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """Export data for a specific module"""
-    
-    data = []
+    modules = list(dict.fromkeys([module, *sheets]))
+    if any(name not in EXPORT_SOURCES for name in modules):
+        raise HTTPException(status_code=400, detail=f"Invalid module. Available: {', '.join(EXPORT_SOURCES)}")
     filename = f"{module}_export"
     
-    if module == "payments":
-        result = await db.execute(select(Payment))
-        payments = result.scalars().all()
-        data = [
-            {
-                "id": p.id,
-                "amount": p.amount,
-                "vendor": p.vendor,
-                "status": p.status,
-                "date": p.payment_date,
-                "method": p.payment_method
-            }
-            for p in payments
-        ]
-    elif module == "procurement":
-        result = await db.execute(select(Procurement))
-        tenders = result.scalars().all()
-        data = [
-            {
-                "id": t.id,
-                "title": t.title,
-                "status": t.status,
-                "budget": t.budget,
-                "deadline": t.deadline
-            }
-            for t in tenders
-        ]
-    else:
-        raise HTTPException(status_code=400, detail="Invalid module")
-    
     if format == "csv":
-        stream = export_service.export_to_csv(data)
+        stream = export_service.stream_csv(session_factory, module)
         media_type = "text/csv"
         filename += ".csv"
     else:
-        stream = export_service.export_to_excel(data)
-        media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        workbook = await export_service.build_xlsx(session_factory, modules)
+        stream = export_service.iter_file(workbook)
+        media_type = XLSX_MEDIA_TYPE
         filename += ".xlsx"
         
     return StreamingResponse(
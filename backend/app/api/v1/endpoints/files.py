@@ -1,10 +1,11 @@
-from typing import List
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, Response
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.api import deps
+from app.core.pagination import paginate
 from app.models.user import User
 from app.models.attachment import Attachment
 from app.schemas.attachment import AttachmentResponse, AttachmentCreate
@@ -46,9 +47,13 @@ async def upload_file(
 
 @router.get("/", response_model=List[AttachmentResponse])
 async def list_files(
+    response: Response,
     entity_type: str = Query(None),
     entity_id: int = Query(None),
-    db: AsyncSession = Depends(deps.get_db),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_user),
 ):
     """List all files, optionally filtered by entity"""
@@ -60,9 +65,7 @@ async def list_files(
             Attachment.entity_id == entity_id
         )
     
-    query = query.order_by(Attachment.uploaded_at.desc())
-    result = await db.execute(query)
-    return result.scalars().all()
+    return await paginate(db, query, Attachment.uploaded_at, Attachment.id, response, cursor, skip, limit)
 
 @router.get("/{file_id}/download")
 async def download_file(
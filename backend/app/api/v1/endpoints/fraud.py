@@ -1,8 +1,9 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.api import deps
+from app.core.pagination import paginate
 from app.models.fraud_alert import FraudAlert
 from app.models.user import User
 from pydantic import BaseModel
@@ -23,14 +24,17 @@ router = APIRouter()
 
 @router.get("/", response_model=List[FraudAlertResponse])
 async def list_fraud_alerts(
+    response: Response,
     resolved: bool = False,
-    db: AsyncSession = Depends(deps.get_db),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """List fraud alerts"""
-    query = select(FraudAlert).where(FraudAlert.is_resolved == resolved).order_by(FraudAlert.detected_at.desc())
-    result = await db.execute(query)
-    return result.scalars().all()
+    query = select(FraudAlert).where(FraudAlert.is_resolved == resolved)
+    return await paginate(db, query, FraudAlert.detected_at, FraudAlert.id, response, cursor, skip, limit)
 
 @router.put("/{alert_id}/resolve")
 async def resolve_alert(
@@ -0,0 +1,24 @@
+from typing import Any
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.models.user import User
+from app.services.import_service import IMPORT_SOURCES, READERS, import_service
+
+router = APIRouter()
+
+@router.post("/{entity}")
+async def import_file(
+    entity: str,
+    file: UploadFile = File(..., description="CSV or XLSX with a header row of *Create field names"),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """Bulk import payments, revenue or purchase requests; returns the job report"""
+    if entity not in IMPORT_SOURCES:
+        raise HTTPException(status_code=404, detail=f"Unsupported entity. Available: {', '.join(IMPORT_SOURCES)}")
+    file_format = (file.filename or "").rsplit(".", 1)[-1].lower()
+    if file_format not in READERS:
+        raise HTTPException(status_code=400, detail="Upload a .csv or .xlsx file")
+    return await import_service.run(db, entity, file.file, file_format, current_user)
@@ -0,0 +1,36 @@
+from typing import Any, Dict
+from fastapi import APIRouter, Depends
+
+from app.api import deps
+from app.core import security
+from app.core.cache import analytics_cache
+from app.core.permissions import permission_matrix
+from app.core.pool_metrics import pool_stats
+from app.core.singleflight import analytics_flight
+from app.core.user_cache import user_cache
+from app.db import engine, replica_router
+from app.models.user import User
+from app.services.forecasting import forecasting_service
+from app.services.snapshot_service import snapshot_service
+
+router = APIRouter()
+
+@router.get("/", response_model=Dict[str, Any])
+async def get_metrics(
+    current_user: User = Depends(deps.get_current_user),
+):
+    """Process-local runtime metrics: connection pool, caches, coalescing and hashing"""
+    snapshot = snapshot_service.current()
+    return {
+        "db_pool": pool_stats(engine.pool),
+        "read_replicas": replica_router.stats(),
+        "caches": {
+            "analytics": analytics_cache.stats(),
+            "users": user_cache.stats(),
+            "forecast_fits": forecasting_service.cache_stats(),
+        },
+        "singleflight": analytics_flight.stats(),
+        "password_hashing": security.hash_queue_stats(),
+        "permission_matrix": {"version": permission_matrix.version, "reloads": permission_matrix.reloads},
+        "snapshot_age_seconds": snapshot.age_seconds if snapshot else None,
+    }
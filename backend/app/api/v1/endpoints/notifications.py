@@ -1,9 +1,10 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.api import deps
+from app.core.pagination import paginate
 from app.models.notification import Notification
 from app.models.user import User
 from app.schemas.notification import NotificationResponse
@@ -12,20 +13,16 @@ router = APIRouter()
 
 @router.get("/", response_model=List[NotificationResponse])
 async def list_notifications(
-    skip: int = 0,
-    limit: int = 50,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """List current user's notifications"""
-    result = await db.execute(
-        select(Notification)
-        .where(Notification.user_id == current_user.id)
-        .order_by(Notification.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    return result.scalars().all()
+    query = select(Notification).where(Notification.user_id == current_user.id)
+    return await paginate(db, query, Notification.created_at, Notification.id, response, cursor, skip, limit)
 
 @router.put("/{notification_id}/read", response_model=NotificationResponse)
 async def mark_notification_read(
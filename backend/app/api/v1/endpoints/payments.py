@@ -1,32 +1,39 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import or_, func
+from sqlalchemy import and_, or_, func
 
 from app.api import deps
+from app.core.pagination import paginate
+from app.core.cache import analytics_cache
+from app.core.http_cache import make_etag, not_modified
 from app.models.payment import Payment
+from app.models.rollup import PaymentRollup
 from app.models.user import User
+from app.schemas.batch import BatchCreateRequest, BatchResponse
 from app.schemas.payment import PaymentCreate, PaymentUpdate, PaymentResponse
+from app.services.batch_service import batch_service
+from app.services.id_service import id_service
+from app.services.rollup_service import rollup_service
+from app.services.version_service import version_service
 
 router = APIRouter()
 
-def generate_payment_id() -> str:
-    """Generate a unique payment ID like PAY-2023-156"""
-    from datetime import datetime
-    import random
-    year = datetime.now().year
-    num = random.randint(1, 999)
-    return f"PAY-{year}-{num:03d}"
+async def generate_payment_id(db: AsyncSession) -> str:
+    """Next unique payment ID like PAY-2023-1042"""
+    return await id_service.next_id(db, "PAY")
 
 @router.get("/", response_model=List[PaymentResponse])
 async def list_payments(
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_user),
     status: Optional[str] = Query(None),
     method: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
 ):
@@ -51,62 +58,84 @@ async def list_payments(
     if conditions:
         query = query.where(*conditions)
     
-    query = query.offset(skip).limit(limit).order_by(Payment.created_at.desc())
-    result = await db.execute(query)
-    return result.scalars().all()
+    return await paginate(db, query, Payment.created_at, Payment.id, response, cursor, skip, limit)
 
 @router.get("/stats", response_model=Dict[str, Any])
 async def get_payment_stats(
-    db: AsyncSession = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_user),
 ):
     """Get payment statistics"""
-    # Pending payments
-    pending_result = await db.execute(
-        select(func.count(Payment.id), func.sum(Payment.amount))
-        .where(Payment.status == "pending_approval")
-    )
-    pending_count, pending_amount = pending_result.first()
+    versions = await version_service.get(db, ["payments"])
+    cached = not_modified(request, response, make_etag("payment_stats", datetime.utcnow().date(), versions))
+    if cached:
+        return cached
     
-    # Scheduled payments
-    scheduled_result = await db.execute(
-        select(func.count(Payment.id), func.sum(Payment.amount))
-        .where(Payment.status == "scheduled")
-    )
-    scheduled_count, scheduled_amount = scheduled_result.first()
+    # Keyed like the ETag so another worker's stale body is never served under it
+    cache_key = ("payment_stats", datetime.utcnow().date(), versions["payments"])
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
-    # Completed payments this month
-    from datetime import datetime
-    current_month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    completed_result = await db.execute(
-        select(func.count(Payment.id), func.sum(Payment.amount))
-        .where(Payment.status == "completed")
-        .where(Payment.payment_date >= current_month_start)
+    # Single pass over the monthly rollup, one FILTERed aggregate per bucket
+    current_month_start = datetime.utcnow().date().replace(day=1)
+    is_pending = PaymentRollup.status == "pending_approval"
+    is_scheduled = PaymentRollup.status == "scheduled"
+    is_completed_this_month = and_(
+        PaymentRollup.status == "completed",
+        PaymentRollup.month == current_month_start,
     )
-    completed_count, completed_amount = completed_result.first()
+    result = await db.execute(
+        select(
+            func.sum(PaymentRollup.count).filter(is_pending),
+            func.sum(PaymentRollup.amount).filter(is_pending),
+            func.sum(PaymentRollup.count).filter(is_scheduled),
+            func.sum(PaymentRollup.amount).filter(is_scheduled),
+            func.sum(PaymentRollup.count).filter(is_completed_this_month),
+            func.sum(PaymentRollup.amount).filter(is_completed_this_month),
+        )
+    )
+    (
+        pending_count, pending_amount,
+        scheduled_count, scheduled_amount,
+        completed_count, completed_amount,
+    ) = result.first()
     
-    return {
+    stats = {
         "pending": {
-            "count": pending_count or 0,
+            "count": int(pending_count or 0),
             "amount": float(pending_amount or 0)
         },
         "scheduled": {
-            "count": scheduled_count or 0,
+            "count": int(scheduled_count or 0),
             "amount": float(scheduled_amount or 0)
         },
         "completed_this_month": {
-            "count": completed_count or 0,
+            "count": int(completed_count or 0),
             "amount": float(completed_amount or 0)
         }
     }
+    analytics_cache.set(cache_key, stats)
+    return stats
 
 @router.get("/{payment_id}", response_model=PaymentResponse)
 async def get_payment(
     payment_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ):
     """Get a single payment by ID"""
+    version = await version_service.row_version(db, Payment, payment_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Payment not found")
+    cached = not_modified(request, response, make_etag("payments", payment_id, version))
+    if cached:
+        return cached
+    
     result = await db.execute(select(Payment).where(Payment.id == payment_id))
     payment = result.scalars().first()
     if not payment:
@@ -120,7 +149,7 @@ async def create_payment(
     current_user: User = Depends(deps.get_current_user),
 ):
     """Create/schedule a new payment"""
-    payment_id = generate_payment_id()
+    payment_id = await generate_payment_id(db)
     
     payment = Payment(
         payment_id=payment_id,
@@ -132,10 +161,30 @@ async def create_payment(
         payment_date=payment_in.payment_date,
     )
     db.add(payment)
+    await rollup_service.record_payment_change(db, None, rollup_service.snapshot_payment(payment))
+    await version_service.bump(db, "payments")
     await db.commit()
+    analytics_cache.clear()
     await db.refresh(payment)
     return payment
 
+@router.post("/batch", response_model=BatchResponse)
+async def batch_payments(
+    batch: BatchCreateRequest[PaymentCreate],
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    Create up to BATCH_MAX_ITEMS payments in one transaction
+
+    Creates only: existing payments change through /{payment_id}/process.
+    """
+    report = await batch_service.apply(db, "payments", batch, current_user)
+    if not report["committed"]:
+        response.status_code = 400
+    return report
+
 @router.post("/{payment_id}/process", response_model=PaymentResponse)
 async def process_payment(
     payment_id: int,
@@ -153,6 +202,7 @@ async def process_payment(
     
     try:
         process_result = await payment_service.process_payment(payment, db, current_user.id)
+        analytics_cache.clear()
         return payment
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
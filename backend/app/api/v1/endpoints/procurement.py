@@ -1,32 +1,37 @@
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import or_
 
 from app.api import deps
+from app.core.pagination import paginate
+from app.core.cache import analytics_cache
+from app.core.http_cache import make_etag, not_modified
 from app.models.procurement import Procurement
 from app.models.user import User
+from app.schemas.batch import BatchRequest, BatchResponse
 from app.schemas.procurement import ProcurementCreate, ProcurementUpdate, ProcurementResponse
+from app.services.batch_service import batch_service
+from app.services.id_service import id_service
+from app.services.version_service import version_service
 
 router = APIRouter()
 
-def generate_tender_id() -> str:
-    """Generate a unique tender ID like TN-2023-067"""
-    from datetime import datetime
-    import random
-    year = datetime.now().year
-    num = random.randint(1, 999)
-    return f"TN-{year}-{num:03d}"
+async def generate_tender_id(db: AsyncSession) -> str:
+    """Next unique tender ID like TN-2023-1042"""
+    return await id_service.next_id(db, "TN")
 
 @router.get("/", response_model=List[ProcurementResponse])
 async def list_procurements(
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_user),
     status: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
 ):
@@ -50,17 +55,24 @@ async def list_procurements(
     if conditions:
         query = query.where(*conditions)
     
-    query = query.offset(skip).limit(limit).order_by(Procurement.created_at.desc())
-    result = await db.execute(query)
-    return result.scalars().all()
+    return await paginate(db, query, Procurement.created_at, Procurement.id, response, cursor, skip, limit)
 
 @router.get("/{procurement_id}", response_model=ProcurementResponse)
 async def get_procurement(
     procurement_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ):
     """Get a single procurement by ID"""
+    version = await version_service.row_version(db, Procurement, procurement_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Procurement not found")
+    cached = not_modified(request, response, make_etag("procurement", procurement_id, version))
+    if cached:
+        return cached
+    
     result = await db.execute(select(Procurement).where(Procurement.id == procurement_id))
     procurement = result.scalars().first()
     if not procurement:
@@ -74,7 +86,7 @@ async def create_procurement(
     current_user: User = Depends(deps.get_current_user),
 ):
     """Create a new procurement/tender"""
-    tender_id = generate_tender_id()
+    tender_id = await generate_tender_id(db)
     
     procurement = Procurement(
         tender_id=tender_id,
@@ -88,10 +100,25 @@ async def create_procurement(
         created_by=current_user.id,
     )
     db.add(procurement)
+    await version_service.bump(db, "procurement")
     await db.commit()
+    analytics_cache.clear()
     await db.refresh(procurement)
     return procurement
 
+@router.post("/batch", response_model=BatchResponse)
+async def batch_procurement(
+    batch: BatchRequest[ProcurementCreate, ProcurementUpdate],
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+):
+    """Create and update up to BATCH_MAX_ITEMS procurements in one transaction"""
+    report = await batch_service.apply(db, "procurement", batch, current_user)
+    if not report["committed"]:
+        response.status_code = 400
+    return report
+
 @router.put("/{procurement_id}", response_model=ProcurementResponse)
 async def update_procurement(
     procurement_id: int,
@@ -110,7 +137,9 @@ async def update_procurement(
     for field, value in update_data.items():
         setattr(procurement, field, value)
     
+    await version_service.bump(db, "procurement")
     await db.commit()
+    analytics_cache.clear()
     await db.refresh(procurement)
     return procurement
 
@@ -127,5 +156,7 @@ async def delete_procurement(
         raise HTTPException(status_code=404, detail="Procurement not found")
     
     await db.delete(procurement)
+    await version_service.bump(db, "procurement")
     await db.commit()
+    analytics_cache.clear()
     return {"message": "Procurement deleted successfully"}
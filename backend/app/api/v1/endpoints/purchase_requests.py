@@ -1,31 +1,36 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import or_
 
 from app.api import deps
+from app.core.pagination import paginate
+from app.core.cache import analytics_cache
+from app.core.http_cache import make_etag, not_modified
 from app.models.purchase_request import PurchaseRequest
 from app.models.user import User
+from app.schemas.batch import BatchRequest, BatchResponse
 from app.schemas.purchase_request import PurchaseRequestCreate, PurchaseRequestUpdate, PurchaseRequestResponse
+from app.services.batch_service import batch_service
+from app.services.id_service import id_service
+from app.services.version_service import version_service
 
 router = APIRouter()
 
-def generate_request_id() -> str:
-    """Generate a unique request ID like PR-2023-089"""
-    from datetime import datetime
-    import random
-    year = datetime.now().year
-    num = random.randint(1, 999)
-    return f"PR-{year}-{num:03d}"
+async def generate_request_id(db: AsyncSession) -> str:
+    """Next unique request ID like PR-2023-1042"""
+    return await id_service.next_id(db, "PR")
 
 @router.get("/", response_model=List[PurchaseRequestResponse])
 async def list_purchase_requests(
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_user),
     status: Optional[str] = Query(None),
     department: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
 ):
@@ -49,17 +54,24 @@ async def list_purchase_requests(
     if conditions:
         query = query.where(*conditions)
     
-    query = query.offset(skip).limit(limit).order_by(PurchaseRequest.created_at.desc())
-    result = await db.execute(query)
-    return result.scalars().all()
+    return await paginate(db, query, PurchaseRequest.created_at, PurchaseRequest.id, response, cursor, skip, limit)
 
 @router.get("/{request_id}", response_model=PurchaseRequestResponse)
 async def get_purchase_request(
     request_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ):
     """Get a single purchase request by ID"""
+    version = await version_service.row_version(db, PurchaseRequest, request_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Purchase request not found")
+    cached = not_modified(request, response, make_etag("purchase_requests", request_id, version))
+    if cached:
+        return cached
+    
     result = await db.execute(select(PurchaseRequest).where(PurchaseRequest.id == request_id))
     purchase_request = result.scalars().first()
     if not purchase_request:
@@ -73,7 +85,7 @@ async def create_purchase_request(
     current_user: User = Depends(deps.get_current_user),
 ):
     """Create a new purchase request"""
-    request_id = generate_request_id()
+    request_id = await generate_request_id(db)
     
     purchase_request = PurchaseRequest(
         request_id=request_id,
@@ -84,10 +96,25 @@ async def create_purchase_request(
         requester_id=current_user.id,
     )
     db.add(purchase_request)
+    await version_service.bump(db, "purchase_requests")
     await db.commit()
+    analytics_cache.clear()
     await db.refresh(purchase_request)
     return purchase_request
 
+@router.post("/batch", response_model=BatchResponse)
+async def batch_purchase_requests(
+    batch: BatchRequest[PurchaseRequestCreate, PurchaseRequestUpdate],
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+):
+    """Create and update up to BATCH_MAX_ITEMS purchase requests in one transaction"""
+    report = await batch_service.apply(db, "purchase_requests", batch, current_user)
+    if not report["committed"]:
+        response.status_code = 400
+    return report
+
 @router.put("/{request_id}", response_model=PurchaseRequestResponse)
 async def update_purchase_request(
     request_id: int,
@@ -106,7 +133,9 @@ async def update_purchase_request(
     for field, value in update_data.items():
         setattr(purchase_request, field, value)
     
+    await version_service.bump(db, "purchase_requests")
     await db.commit()
+    analytics_cache.clear()
     await db.refresh(purchase_request)
     return purchase_request
 
@@ -123,7 +152,9 @@ async def approve_purchase_request(
         raise HTTPException(status_code=404, detail="Purchase request not found")
     
     purchase_request.status = "approved"
+    await version_service.bump(db, "purchase_requests")
     await db.commit()
+    analytics_cache.clear()
     await db.refresh(purchase_request)
     return purchase_request
 
@@ -140,6 +171,8 @@ async def reject_purchase_request(
         raise HTTPException(status_code=404, detail="Purchase request not found")
     
     purchase_request.status = "rejected"
+    await version_service.bump(db, "purchase_requests")
     await db.commit()
+    analytics_cache.clear()
     await db.refresh(purchase_request)
     return purchase_request
@@ -1,31 +1,37 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import or_
 
 from app.api import deps
+from app.core.pagination import paginate
+from app.core.cache import analytics_cache
+from app.core.http_cache import make_etag, not_modified
 from app.models.revenue import Revenue
 from app.models.user import User
+from app.schemas.batch import BatchRequest, BatchResponse
 from app.schemas.revenue import RevenueCreate, RevenueUpdate, RevenueResponse
+from app.services.batch_service import batch_service
+from app.services.id_service import id_service
+from app.services.rollup_service import rollup_service
+from app.services.version_service import version_service
 
 router = APIRouter()
 
-def generate_revenue_id() -> str:
-    """Generate a unique revenue ID like REV-2023-089"""
-    from datetime import datetime
-    import random
-    year = datetime.now().year
-    num = random.randint(1, 999)
-    return f"REV-{year}-{num:03d}"
+async def generate_revenue_id(db: AsyncSession) -> str:
+    """Next unique revenue ID like REV-2023-1042"""
+    return await id_service.next_id(db, "REV")
 
 @router.get("/", response_model=List[RevenueResponse])
 async def list_revenues(
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_user),
     status: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
 ):
@@ -49,17 +55,24 @@ async def list_revenues(
     if conditions:
         query = query.where(*conditions)
     
-    query = query.offset(skip).limit(limit).order_by(Revenue.created_at.desc())
-    result = await db.execute(query)
-    return result.scalars().all()
+    return await paginate(db, query, Revenue.created_at, Revenue.id, response, cursor, skip, limit)
 
 @router.get("/{revenue_id}", response_model=RevenueResponse)
 async def get_revenue(
     revenue_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ):
     """Get a single revenue record by ID"""
+    version = await version_service.row_version(db, Revenue, revenue_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Revenue record not found")
+    cached = not_modified(request, response, make_etag("revenue", revenue_id, version))
+    if cached:
+        return cached
+    
     result = await db.execute(select(Revenue).where(Revenue.id == revenue_id))
     revenue = result.scalars().first()
     if not revenue:
@@ -73,7 +86,7 @@ async def create_revenue(
     current_user: User = Depends(deps.get_current_user),
 ):
     """Create a new revenue record"""
-    revenue_id = generate_revenue_id()
+    revenue_id = await generate_revenue_id(db)
     
     revenue = Revenue(
         revenue_id=revenue_id,
@@ -84,10 +97,26 @@ async def create_revenue(
         due_date=revenue_in.due_date,
     )
     db.add(revenue)
+    await rollup_service.record_revenue_change(db, None, rollup_service.snapshot_revenue(revenue))
+    await version_service.bump(db, "revenue")
     await db.commit()
+    analytics_cache.clear()
     await db.refresh(revenue)
     return revenue
 
+@router.post("/batch", response_model=BatchResponse)
+async def batch_revenue(
+    batch: BatchRequest[RevenueCreate, RevenueUpdate],
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+):
+    """Create and update up to BATCH_MAX_ITEMS revenue records in one transaction"""
+    report = await batch_service.apply(db, "revenue", batch, current_user)
+    if not report["committed"]:
+        response.status_code = 400
+    return report
+
 @router.put("/{revenue_id}", response_model=RevenueResponse)
 async def update_revenue(
     revenue_id: int,
@@ -101,11 +130,16 @@ async def update_revenue(
     if not revenue:
         raise HTTPException(status_code=404, detail="Revenue record not found")
     
+    before = rollup_service.snapshot_revenue(revenue)
+    
     # Update fields
     update_data = revenue_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(revenue, field, value)
     
+    await rollup_service.record_revenue_change(db, before, rollup_service.snapshot_revenue(revenue))
+    await version_service.bump(db, "revenue")
     await db.commit()
+    analytics_cache.clear()
     await db.refresh(revenue)
     return revenue
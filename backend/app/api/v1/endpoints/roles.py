@@ -8,7 +8,8 @@ from app.api import deps
 from app.models.role import Role
 from app.models.permission import Permission
 from app.schemas.role import RoleCreate, RoleUpdate, RoleResponse, PermissionResponse
-from app.core.permissions import has_permission
+from app.core.permissions import has_permission, permission_matrix
+from app.services.version_service import version_service
 
 router = APIRouter()
 
@@ -52,7 +53,9 @@ async def create_role(
         role.permissions = permissions
     
     db.add(role)
+    await version_service.bump(db, "roles")
     await db.commit()
+    permission_matrix.invalidate()
     await db.refresh(role)
     
     # Re-fetch with permissions loaded
@@ -96,7 +99,9 @@ async def update_role(
         permissions = result.scalars().all()
         role.permissions = permissions
     
+    await version_service.bump(db, "roles")
     await db.commit()
+    permission_matrix.invalidate()
     await db.refresh(role)
     return role
 
@@ -114,5 +119,7 @@ async def delete_role(
         raise HTTPException(status_code=404, detail="Role not found")
     
     await db.delete(role)
+    await version_service.bump(db, "roles")
     await db.commit()
+    permission_matrix.invalidate()
     return {"message": "Role deleted successfully"}
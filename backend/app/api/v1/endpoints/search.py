@@ -0,0 +1,22 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api import deps
+from app.models.user import User
+from app.services.search_service import SEARCH_SOURCES, search_service
+
+router = APIRouter()
+
+@router.get("/")
+async def search(
+    q: str = Query(..., min_length=2, description="Text to find in payees, titles, sources and reference numbers"),
+    types: Optional[List[str]] = Query(None, description=f"Subset of: {', '.join(SEARCH_SOURCES)}"),
+    limit: int = Query(5, ge=1, le=25, description="Results per type"),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """Search payments, revenue, purchase requests and tenders in one call"""
+    try:
+        results = await search_service.search(q, types or list(SEARCH_SOURCES), limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"query": q, "results": results}
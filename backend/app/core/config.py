@@ -10,6 +10,43 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
     ALGORITHM: str = "HS256"
     DATABASE_URL: str = os.getenv("DATABASE_URL", "postgresql+asyncpg://postgres:postgres@db:5432/RIZON")
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")  # Comma-separated; empty = no replicas
+    REPLICA_MAX_LAG_SECONDS: float = 5  # Replicas lagging more than this are skipped
+    REPLICA_LAG_CHECK_SECONDS: float = 2
+    REPLICA_LAG_CHECK_TIMEOUT: float = 1  # A probe slower than this marks the replica unreachable
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30  # Seconds to wait for a connection before failing the request
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800  # Seconds; keep below any proxy/server idle timeout
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection (0 behind pgbouncer)
+    ID_BLOCK_SIZE: int = 20  # Business IDs each worker claims per sequence round-trip
+    BATCH_MAX_ITEMS: int = 100  # Creates + updates accepted by one /batch call
+    EXPORT_BATCH_SIZE: int = 2000  # Rows fetched per server-side cursor round-trip when exporting
+    EXPORT_SPOOL_MAX_BYTES: int = 16 * 1024 * 1024  # Finished XLSX files larger than this spill to a temp file
+    IMPORT_CHUNK_SIZE: int = 5000  # Rows validated, COPY'd and committed together
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+    ANALYTICS_CACHE_TTL_SECONDS: int = 30
+    ANALYTICS_FANOUT_CONCURRENCY: int = 4  # Max pooled connections one analytics request may hold
+    COUNT_EXACT_THRESHOLD: int = 10_000  # List totals above this come from planner estimates
+    COUNT_CACHE_TTL_SECONDS: int = 10
+    HTTP_CACHE_MAX_AGE: int = 0  # Seconds a browser may reuse a response before revalidating its ETag
+    # Stateless mode: access tokens carry uid/role/superuser/permission-version claims
+    # and are authorized without a database lookup; pair with short expiry + refresh
+    AUTH_STATELESS_TOKENS: bool = False
+    STATELESS_ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    REVOCATION_BACKEND: str = "memory"  # memory | redis
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://redis:6379/0")
+    BCRYPT_ROUNDS: int = 12  # Changing this rehashes passwords transparently on next login
+    PASSWORD_HASH_CONCURRENCY: int = 2  # bcrypt worker threads per process
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_TTL_SECONDS: int = 60  # Upper bound on how long a role/deactivation change can go unseen
+    USER_CACHE_MAXSIZE: int = 10_000
+    ROLE_VERSION_CHECK_SECONDS: float = 5  # How often each worker checks for role/permission edits
+    SNAPSHOT_DIR: str = os.getenv("SNAPSHOT_DIR", "snapshots")
+    SNAPSHOT_REFRESH_SECONDS: int = 0  # 0 disables the in-process snapshot refresher
+    SNAPSHOT_RETENTION_SECONDS: int = 600  # Superseded builds older than this are deleted on publish
 
 settings = Settings()
 
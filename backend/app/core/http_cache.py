@@ -0,0 +1,38 @@
+import hashlib
+from typing import Any, Optional
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag derived from the data versions a response was built from"""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+def _matches(header: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored"""
+    if header.strip() == "*":
+        return True
+    strip = lambda tag: tag.strip().removeprefix("W/")
+    return strip(etag) in {strip(tag) for tag in header.split(",")}
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Per-user data: only the browser may cache it, and must revalidate with the ETag
+    response.headers["Cache-Control"] = f"private, max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate"
+    response.headers["Vary"] = "Authorization"
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Return a 304 response if the client already has this version
+
+    Otherwise the cache headers are set on `response` and None is returned, so
+    the endpoint goes on to build the full body.
+    """
+    header = request.headers.get("if-none-match")
+    if header and _matches(header, etag):
+        response = Response(status_code=304)
+        set_cache_headers(response, etag)
+        return response
+    set_cache_headers(response, etag)
+    return None
@@ -0,0 +1,136 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Hashable, List, Optional, Tuple
+from fastapi import HTTPException, Response
+from sqlalchemy import Table, func, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.future import select
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Total rows matching the filters, and whether that number is "exact" or an "estimate"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_COUNT_KIND_HEADER = "X-Total-Count-Kind"
+
+RELTUPLES_SQL = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+
+# (total, kind) per filter signature; short-lived, so new rows show up within seconds
+count_cache = TTLCache(ttl=settings.COUNT_CACHE_TTL_SECONDS, maxsize=1000)
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, keeping its bound parameters"""
+    inherit_cache = False
+
+    def __init__(self, statement: Any):
+        self.statement = statement
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Opaque cursor for the position just after (timestamp, id)"""
+    raw = json.dumps([timestamp.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Raises:
+        ValueError: If the cursor was not produced by encode_cursor
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+def count_signature(query: Any) -> Hashable:
+    """Cache key for a list query: its SQL plus bound filter values"""
+    compiled = query.compile(dialect=postgresql.dialect())
+    return (str(compiled), repr(sorted(compiled.params.items())))
+
+def _plan_rows(plan: Any) -> int:
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+async def _estimate(db: AsyncSession, query: Any) -> Optional[int]:
+    """Planner row estimate: table statistics when unfiltered, EXPLAIN otherwise"""
+    froms = query.get_final_froms()
+    if query.whereclause is None and len(froms) == 1 and isinstance(froms[0], Table):
+        result = await db.execute(RELTUPLES_SQL, {"table": froms[0].name})
+        estimate = result.scalar()
+        # -1 (or NULL) means the table has never been analyzed
+        return estimate if estimate is not None and estimate >= 0 else None
+    result = await db.execute(Explain(query))
+    return _plan_rows(result.scalar())
+
+async def count_total(db: AsyncSession, query: Any) -> Tuple[int, str]:
+    """
+    Number of rows `query` matches, as (total, "exact" | "estimate")
+
+    Exact COUNT(*) is only run when the planner expects fewer than
+    COUNT_EXACT_THRESHOLD rows; above that the estimate is returned as-is.
+    """
+    key = count_signature(query)
+    cached = count_cache.get(key)
+    if cached is not None:
+        return cached
+
+    estimate = await _estimate(db, query)
+    if estimate is None or estimate < settings.COUNT_EXACT_THRESHOLD:
+        result = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+        total = (result.scalar(), "exact")
+    else:
+        total = (estimate, "estimate")
+    count_cache.set(key, total)
+    return total
+
+async def paginate(
+    db: AsyncSession,
+    query: Any,
+    order_column: Any,
+    id_column: Any,
+    response: Response,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[Any]:
+    """
+    Newest-first page of `query`, keyset-paginated on (order_column, id)
+
+    With a cursor the page starts right after the cursor position, so deep
+    pages cost the same as the first one and concurrent inserts do not shift
+    results. Without one, `skip` is applied as an offset (backward compatible).
+    Either way the next page's cursor is returned in the X-Next-Cursor header,
+    and the size of the whole filtered set in X-Total-Count.
+    """
+    total, kind = await count_total(db, query)
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+    response.headers[TOTAL_COUNT_KIND_HEADER] = kind
+
+    query = query.order_by(order_column.desc(), id_column.desc())
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.where(tuple_(order_column, id_column) < position)
+    elif skip:
+        query = query.offset(skip)
+
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.scalars().all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, order_column.key), last.id)
+    return rows
@@ -1,11 +1,83 @@
+import asyncio
+import time
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
 from fastapi import HTTPException, Depends, status
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
 from app.api import deps
+from app.core.config import settings
 from app.models.user import User
-from app.models.role import Role
+from app.models.role import Role, role_permissions
+from app.models.permission import Permission
+from app.services.version_service import version_service
 from sqlalchemy.ext.asyncio import AsyncSession
 
+class PermissionMatrix:
+    """Immutable role name -> {(resource, action)} map, stamped with the "roles" data version"""
+
+    def __init__(self, grants: Dict[str, FrozenSet[Tuple[str, str]]], version: int):
+        self.grants = grants
+        self.version = version
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, Optional[str], Optional[str]]], version: int) -> "PermissionMatrix":
+        grants: Dict[str, set] = {}
+        for role, resource, action in rows:
+            permissions = grants.setdefault(role, set())
+            if resource is not None:
+                permissions.add((resource, action))
+        return cls({role: frozenset(p) for role, p in grants.items()}, version)
+
+    def allows(self, role: str, resource: str, action: str) -> Optional[bool]:
+        """None if the role does not exist, otherwise whether it grants the permission"""
+        permissions = self.grants.get(role)
+        if permissions is None:
+            return None
+        return (resource, action) in permissions
+
+class PermissionMatrixCache:
+    """
+    Process-local PermissionMatrix, rebuilt lazily when the "roles" version changes
+
+    The version row is read at most once per ROLE_VERSION_CHECK_SECONDS, so
+    authorization costs no database query in between and other workers pick
+    up role edits within that interval.
+    """
+
+    def __init__(self):
+        self._matrix: Optional[PermissionMatrix] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self.reloads = 0
+
+    async def get(self, db: AsyncSession) -> PermissionMatrix:
+        if self._matrix is not None and time.monotonic() - self._checked_at < settings.ROLE_VERSION_CHECK_SECONDS:
+            return self._matrix
+        async with self._lock:
+            if self._matrix is not None and time.monotonic() - self._checked_at < settings.ROLE_VERSION_CHECK_SECONDS:
+                return self._matrix
+            version = (await version_service.get(db, ["roles"]))["roles"]
+            if self._matrix is None or self._matrix.version != version:
+                result = await db.execute(
+                    select(Role.name, Permission.resource, Permission.action)
+                    .select_from(Role)
+                    .outerjoin(role_permissions, role_permissions.c.role_id == Role.id)
+                    .outerjoin(Permission, Permission.id == role_permissions.c.permission_id)
+                )
+                self._matrix = PermissionMatrix.from_rows(result.all(), version)
+                self.reloads += 1
+            self._checked_at = time.monotonic()
+            return self._matrix
+
+    @property
+    def version(self) -> int:
+        return self._matrix.version if self._matrix is not None else -1
+
+    def invalidate(self) -> None:
+        """Force a version check on the next request (used after local role edits)"""
+        self._checked_at = 0.0
+
+permission_matrix = PermissionMatrixCache()
+
 class PermissionChecker:
     def __init__(self, resource: str, action: str):
         self.resource = resource
@@ -20,30 +92,23 @@ class PermissionChecker:
         if current_user.is_superuser:
             return True
 
-        # Get user's role
-        # Assuming User.role stores the role name (string)
-        # We need to fetch the Role object and its permissions
-        result = await db.execute(
-            select(Role)
-            .options(selectinload(Role.permissions))
-            .where(Role.name == current_user.role)
-        )
-        role = result.scalars().first()
-
-        if not role:
+        # A token minted after a role edit proves the local matrix is stale
+        token_version = getattr(current_user, "permissions_version", None)
+        if token_version is not None and permission_matrix.version < token_version:
+            permission_matrix.invalidate()
+
+        # User.role stores the role name; look it up in the cached matrix
+        matrix = await permission_matrix.get(db)
+        allowed = matrix.allows(current_user.role, self.resource, self.action)
+
+        if allowed is None:
             # If role doesn't exist in DB (legacy or mismatch), deny
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User role not found or invalid"
             )
 
-        # Check if role has the required permission
-        has_perm = any(
-            p.resource == self.resource and p.action == self.action
-            for p in role.permissions
-        )
-
-        if not has_perm:
+        if not allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Not enough permissions. Required: {self.resource}:{self.action}"
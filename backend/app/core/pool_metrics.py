@@ -0,0 +1,96 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Dict, Sequence
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Upper bounds in milliseconds; the last bucket is open-ended
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class Histogram:
+    """Fixed-bucket histogram in the Prometheus style (cumulative on export)"""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative, buckets = 0, {}
+        for bound, count in zip([*map(str, self.bounds), "+Inf"], self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"buckets": buckets, "count": self.count, "sum": round(self.sum, 3)}
+
+class PoolMetrics:
+    """Checkout wait times, timeouts and overflow events for one engine's pool"""
+
+    def __init__(self):
+        self.wait_ms = Histogram(WAIT_BUCKETS_MS)
+        self.timeouts = 0
+        self.overflow_events = 0
+
+# Keyed by the pool's logging name (create_engine's pool_logging_name), which
+# Pool.recreate() passes on, so counters survive the new instance it builds
+_metrics: Dict[str, PoolMetrics] = {}
+
+def metrics_for(pool: Any) -> PoolMetrics:
+    return _metrics.setdefault(pool._orig_logging_name or "default", PoolMetrics())
+
+# Set while a checkout is being timed; _do_get recurses and may interleave across tasks
+_timing: ContextVar[bool] = ContextVar("pool_checkout_timing", default=False)
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waits"""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics_for(self)
+
+    def _do_get(self):
+        if _timing.get():
+            return super()._do_get()
+        token = _timing.set(True)
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.wait_ms.observe((time.perf_counter() - started) * 1000)
+            _timing.reset(token)
+
+    def _inc_overflow(self) -> bool:
+        created = super()._inc_overflow()
+        # _overflow counts up from -pool_size; above zero means beyond pool_size
+        if created and self._overflow > 0:
+            self.metrics.overflow_events += 1
+        return created
+
+def pool_stats(pool: Any) -> Dict[str, Any]:
+    """Live pool occupancy plus the accumulated checkout metrics"""
+    stats: Dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+        })
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        stats.update({
+            "wait_ms": pool.metrics.wait_ms.snapshot(),
+            "timeouts": pool.metrics.timeouts,
+            "overflow_events": pool.metrics.overflow_events,
+        })
+    return stats
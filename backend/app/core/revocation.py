@@ -0,0 +1,63 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Dict
+
+from app.core.config import settings
+
+class RevocationBackend(ABC):
+    """
+    Set of revoked token ids (jti claims)
+
+    Entries only need to live until the token would have expired anyway, which
+    keeps the set small when access tokens are short-lived.
+    """
+
+    @abstractmethod
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """Revoke a token until its `exp` (unix seconds)"""
+
+    @abstractmethod
+    async def is_revoked(self, jti: str) -> bool:
+        ...
+
+class MemoryRevocationBackend(RevocationBackend):
+    """Process-local backend; for tests and single-worker deployments"""
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        now = time.time()
+        # Drop entries whose tokens have expired on their own
+        for key in [k for k, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[key]
+        self._revoked[jti] = expires_at
+
+    async def is_revoked(self, jti: str) -> bool:
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+class RedisRevocationBackend(RevocationBackend):
+    """Shared backend so every worker sees a revocation immediately"""
+
+    def __init__(self, url: str, prefix: str = "revoked:"):
+        import redis.asyncio as redis
+        self._redis = redis.from_url(url)
+        self._prefix = prefix
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        ttl = int(expires_at - time.time()) + 1
+        if ttl > 0:
+            await self._redis.set(self._prefix + jti, 1, ex=ttl)
+
+    async def is_revoked(self, jti: str) -> bool:
+        return bool(await self._redis.exists(self._prefix + jti))
+
+def create_backend(name: str = settings.REVOCATION_BACKEND) -> RevocationBackend:
+    if name == "redis":
+        return RedisRevocationBackend(settings.REDIS_URL)
+    if name == "memory":
+        return MemoryRevocationBackend()
+    raise ValueError(f"Unsupported revocation backend: {name}")
+
+revocation_list = create_backend()
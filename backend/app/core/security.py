@@ -1,24 +1,100 @@
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
-from jose import jwt
+from typing import Any, Dict, Optional, Union
+from jose import JWTError, jwt
 import bcrypt
 from app.core.config import settings
 
-def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
+# bcrypt releases the GIL, so a small thread pool gives real parallelism while
+# bounding how many cores a login storm can take from request handling
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_CONCURRENCY, thread_name_prefix="bcrypt"
+)
+_hash_queued = 0
+_hash_completed = 0
+
+def create_access_token(
+    subject: Union[str, Any],
+    expires_delta: timedelta = None,
+    claims: Optional[Dict[str, Any]] = None,
+) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject), "type": "access", "jti": uuid.uuid4().hex}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def create_refresh_token(subject: Union[str, Any], user_id: int) -> str:
+    expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode = {"exp": expire, "sub": str(subject), "uid": user_id, "type": "refresh", "jti": uuid.uuid4().hex}
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+def user_claims(user: Any, permissions_version: int) -> Dict[str, Any]:
+    """Claims that let a stateless access token stand in for the user row"""
+    return {
+        "uid": user.id,
+        "name": user.full_name,
+        "role": user.role,
+        "su": bool(user.is_superuser),
+        "pv": permissions_version,
+    }
+
+def verify_token(token: str, token_type: str = "access") -> Dict[str, Any]:
+    """
+    Decode and validate a token's signature, expiry and type
+
+    Raises:
+        JWTError: If the token is invalid, expired or of the wrong type
+    """
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    # Tokens issued before the type claim existed are access tokens
+    if payload.get("type", "access") != token_type:
+        raise JWTError(f"Expected a {token_type} token")
+    return payload
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 def get_password_hash(password: str) -> str:
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
+def needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a different cost factor than BCRYPT_ROUNDS"""
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+async def _run_hash(fn, *args):
+    global _hash_queued, _hash_completed
+    _hash_queued += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+    finally:
+        _hash_queued -= 1
+        _hash_completed += 1
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bcrypt thread pool, keeping the event loop free"""
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the bcrypt thread pool, keeping the event loop free"""
+    return await _run_hash(get_password_hash, password)
+
+def hash_queue_stats() -> Dict[str, Any]:
+    return {
+        "workers": settings.PASSWORD_HASH_CONCURRENCY,
+        # Waiting plus running; anything above `workers` is queued
+        "queue_depth": _hash_queued,
+        "completed": _hash_completed,
+        "rounds": settings.BCRYPT_ROUNDS,
+    }
+
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+def flight_key(endpoint: str, **params: Any) -> Hashable:
+    """
+    Build a coalescing key from an endpoint name and its query parameters
+
+    Parameters are sorted by name and normalized (datetimes to ISO strings,
+    lists to tuples) so equivalent requests map to the same key.
+    """
+    def normalize(value: Any) -> Hashable:
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, (list, tuple, set, frozenset)):
+            items = sorted(value) if isinstance(value, (set, frozenset)) else value
+            return tuple(normalize(v) for v in items)
+        return value
+
+    return (endpoint, tuple(sorted((name, normalize(value)) for name, value in params.items())))
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls into one in-flight execution.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same task and receive the same result (or
+    exception). Once the task finishes the key is released, so later calls run
+    fresh. The task is shielded, so one caller disconnecting does not cancel
+    the work for the others; for the same reason `fn` must not use anything
+    owned by the first caller, such as its request's database session.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+# Shared by the analytics router
+analytics_flight = SingleFlight()
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+@dataclass(frozen=True)
+class CachedUser:
+    """
+    Immutable snapshot of the columns request handlers read from the current user
+
+    Detached from any session, so it can be shared between concurrent requests.
+    Attribute names match the User model.
+    """
+    id: int
+    email: str
+    full_name: Optional[str]
+    is_active: bool
+    is_superuser: bool
+    role: str
+    permissions_version: Optional[int] = None  # "pv" claim of a stateless token
+
+    @classmethod
+    def from_user(cls, user: Any) -> "CachedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+            role=user.role,
+        )
+
+# Keyed by token subject (email); bounded so a token flood cannot grow it forever
+user_cache = TTLCache(ttl=settings.USER_CACHE_TTL_SECONDS, maxsize=settings.USER_CACHE_MAXSIZE)
+
+def invalidate_user(email: str) -> None:
+    """Drop a cached user; call after deactivating a user or changing their role"""
+    user_cache.invalidate(email)
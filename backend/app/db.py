@@ -1,10 +1,127 @@
+import asyncio
+import itertools
 import os
+import time
+from typing import List, Optional
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import DDL, event, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from app.core.config import settings
+from app.core.pool_metrics import InstrumentedAsyncQueuePool, pool_stats
 
 Base = declarative_base()
 
-DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://postgres:postgres@db:5432/RIZON")
+# Trigram search indexes need pg_trgm; create_all (tests) must install it first
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+DATABASE_URL = settings.DATABASE_URL
+
+def _create_engine(url: str, name: str):
+    return create_async_engine(
+        url,
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name=name,  # Also keys the pool's checkout metrics
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+
+engine = _create_engine(DATABASE_URL, "primary")
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+async def check_schema_revision() -> None:
+    """
+    Fail fast if the database is not at the latest Alembic revision
+
+    Replaces create_all on startup: one single-row query instead of reflecting
+    every table. Apply migrations with `alembic upgrade head`.
+    """
+    head = ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_current_head()
+    try:
+        async with engine.connect() as conn:
+            current = await conn.scalar(text("SELECT version_num FROM alembic_version"))
+    except Exception as e:
+        raise RuntimeError(
+            "Database has no Alembic revision; run `alembic upgrade head` "
+            "(for a schema created by create_all, `alembic stamp 0001_baseline` first)"
+        ) from e
+    if current != head:
+        raise RuntimeError(f"Database is at revision {current}, expected {head}; run `alembic upgrade head`")
+
+# Seconds of replay lag; 0 on a primary or on a plain database used as a stand-in replica
+REPLICA_LAG_SQL = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+class Replica:
+    def __init__(self, url: str, name: str):
+        self.name = name
+        self.engine = _create_engine(url, name)
+        self.sessionmaker = sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.lag: Optional[float] = None  # None until the first probe completes
+        self.checked_at = 0.0
+        self.probe: Optional[asyncio.Task] = None
+
+class ReplicaRouter:
+    """
+    Round-robin over read replicas, skipping any that lag past REPLICA_MAX_LAG_SECONDS
+
+    Requests only read each replica's cached lag. Once it is older than
+    REPLICA_LAG_CHECK_SECONDS a single background probe refreshes it, bounded
+    by REPLICA_LAG_CHECK_TIMEOUT, so a hung replica never stalls a request. A
+    replica that cannot be reached in time, or has not been probed yet, counts
+    as lagging. With no healthy replica (or none configured) reads go to the
+    primary.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url, f"replica_{index}") for index, url in enumerate(urls)]
+        self._next = itertools.count()
+        self.primary_fallbacks = 0
+
+    async def _measure(self, replica: Replica) -> float:
+        async with replica.engine.connect() as conn:
+            return float(await conn.scalar(REPLICA_LAG_SQL))
+
+    async def _probe(self, replica: Replica) -> None:
+        try:
+            replica.lag = await asyncio.wait_for(self._measure(replica), settings.REPLICA_LAG_CHECK_TIMEOUT)
+        except Exception:
+            replica.lag = float("inf")
+        replica.checked_at = time.monotonic()
+
+    def _lag(self, replica: Replica) -> float:
+        stale = time.monotonic() - replica.checked_at >= settings.REPLICA_LAG_CHECK_SECONDS
+        if stale and (replica.probe is None or replica.probe.done()):
+            replica.probe = asyncio.create_task(self._probe(replica))
+        return replica.lag if replica.lag is not None else float("inf")
+
+    async def sessionmaker(self):
+        if self.replicas:
+            start = next(self._next)
+            for offset in range(len(self.replicas)):
+                replica = self.replicas[(start + offset) % len(self.replicas)]
+                if self._lag(replica) <= settings.REPLICA_MAX_LAG_SECONDS:
+                    return replica.sessionmaker
+            self.primary_fallbacks += 1
+        return AsyncSessionLocal
+
+    def stats(self):
+        return {
+            "replicas": [{"name": r.name, "lag_seconds": r.lag, "pool": pool_stats(r.engine.pool)} for r in self.replicas],
+            "primary_fallbacks": self.primary_fallbacks,
+        }
+
+replica_router = ReplicaRouter([url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()])
@@ -1,16 +1,25 @@
+import asyncio
 from fastapi import FastAPI, WebSocket, Query, status
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1.endpoints import auth, procurement, purchase_requests, payments, revenue, audit_logs, analytics, files, roles, notifications, export, fraud
-from app.db import engine, Base
+from app.api.v1.endpoints import auth, procurement, purchase_requests, payments, revenue, audit_logs, analytics, files, roles, notifications, export, fraud, metrics, search, imports
+from app.db import check_schema_revision
 from app.websocket.connection_manager import manager
 from app.core import security
+from app.core.config import settings
+from app.services.snapshot_service import snapshot_service
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await check_schema_revision()
+    refresher = None
+    if settings.SNAPSHOT_REFRESH_SECONDS > 0:
+        refresher = asyncio.create_task(snapshot_service.refresh_forever(settings.SNAPSHOT_REFRESH_SECONDS))
     yield
+    if refresher:
+        refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresher
 
 app = FastAPI(title="RIZON API", version="0.1", lifespan=lifespan)
 
@@ -21,6 +30,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count", "X-Total-Count-Kind"],
 )
 
 # Register routers
@@ -36,13 +46,16 @@ app.include_router(roles.router, prefix="/api/v1/roles", tags=["roles"])
 app.include_router(notifications.router, prefix="/api/v1/notifications", tags=["notifications"])
 app.include_router(export.router, prefix="/api/v1/export", tags=["export"])
 app.include_router(fraud.router, prefix="/api/v1/fraud", tags=["fraud"])
+app.include_router(imports.router, prefix="/api/v1/import", tags=["import"])
+app.include_router(search.router, prefix="/api/v1/search", tags=["search"])
+app.include_router(metrics.router, prefix="/api/v1/metrics", tags=["metrics"])
 
 @app.websocket("/ws/{user_id}")
 async def websocket_endpoint(websocket: WebSocket, user_id: int, token: str = Query(...)):
     try:
         # Verify token
         payload = security.verify_token(token)
-        token_user_id = int(payload.get("sub"))
+        token_user_id = int(payload.get("uid"))
         if token_user_id != user_id:
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
             return
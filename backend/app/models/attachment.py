@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, BigInteger
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, Index, text
 from datetime import datetime
 from app.db import Base
 
@@ -17,6 +17,13 @@ class Attachment(Base):
     entity_id = Column(Integer, nullable=False)
     
     uploaded_by = Column(Integer, nullable=False)  # User ID
-    uploaded_at = Column(DateTime, default=datetime.utcnow)
+    # Keyset pagination order: NOT NULL (see alembic 0005_pagination_not_null)
+    uploaded_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=text("timezone('utc', now())"))
     
     description = Column(String, nullable=True)
+
+    __table_args__ = (
+        # Hot-path filters and ordering (see alembic 0002_hot_path_indexes)
+        Index("ix_attachments_entity", "entity_type", "entity_id", "uploaded_at"),
+        Index("ix_attachments_uploaded_at_id", "uploaded_at", "id"),
+    )
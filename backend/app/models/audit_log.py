@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, Index
 from sqlalchemy.sql import func
 from app.db import Base
 
@@ -13,4 +13,12 @@ class AuditLog(Base):
     changes = Column(JSON, nullable=True)  # Store before/after data
     ip_address = Column(String, nullable=True)
     user_agent = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Keyset pagination order: NOT NULL (see alembic 0005_pagination_not_null)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # Hot-path filters and ordering (see alembic 0002_hot_path_indexes)
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+        Index("ix_audit_logs_entity_action_user", "entity_type", "action", "user_id", "created_at"),
+        Index("ix_audit_logs_user_created_at", "user_id", "created_at"),
+    )
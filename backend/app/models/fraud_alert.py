@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, Index, text
 from datetime import datetime
 from app.db import Base
 
@@ -10,6 +10,12 @@ class FraudAlert(Base):
     severity = Column(String, default="medium") # low, medium, high, critical
     description = Column(String, nullable=False)
     is_resolved = Column(Boolean, default=False)
-    detected_at = Column(DateTime, default=datetime.utcnow)
+    # Keyset pagination order: NOT NULL (see alembic 0005_pagination_not_null)
+    detected_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=text("timezone('utc', now())"))
     resolved_at = Column(DateTime, nullable=True)
     resolved_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    __table_args__ = (
+        # Hot-path filters and ordering (see alembic 0002_hot_path_indexes)
+        Index("ix_fraud_alerts_resolved_detected_at", "is_resolved", "detected_at", "id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, text
 from datetime import datetime
 from app.db import Base
 
@@ -11,5 +11,12 @@ class Notification(Base):
     message = Column(String, nullable=False)
     type = Column(String, default="info")  # info, success, warning, error
     is_read = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Keyset pagination order: NOT NULL (see alembic 0005_pagination_not_null)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=text("timezone('utc', now())"))
     action_url = Column(String, nullable=True)
+
+    __table_args__ = (
+        # Hot-path filters and ordering (see alembic 0002_hot_path_indexes)
+        Index("ix_notifications_user_created_at", "user_id", "created_at", "id"),
+        Index("ix_notifications_user_unread", "user_id", "created_at", postgresql_where=text("is_read = false")),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from app.db import Base
 
@@ -15,5 +15,23 @@ class Payment(Base):
     payment_date = Column(DateTime(timezone=True), nullable=True)
     processed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     notes = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Keyset pagination order: NOT NULL (see alembic 0005_pagination_not_null)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # Covering index for vendor ranking: aggregates are answered from the index alone
+        Index(
+            "ix_payments_status_payee_amount",
+            "status", "payee", "amount",
+            postgresql_include=["payment_date", "method"],
+        ),
+        # Hot-path filters and ordering (see alembic 0002_hot_path_indexes)
+        Index("ix_payments_created_at_id", "created_at", "id"),
+        Index("ix_payments_status_created_at", "status", "created_at", "id"),
+        Index("ix_payments_method_created_at", "method", "created_at", "id"),
+        # Trigram indexes for ilike/fuzzy search (see alembic 0003_search_trigram_indexes)
+        Index("ix_payments_payee_trgm", "payee", postgresql_using="gin", postgresql_ops={"payee": "gin_trgm_ops"}),
+        Index("ix_payments_payment_id_trgm", "payment_id", postgresql_using="gin", postgresql_ops={"payment_id": "gin_trgm_ops"}),
+        Index("ix_payments_reference_trgm", "reference", postgresql_using="gin", postgresql_ops={"reference": "gin_trgm_ops"}),
+    )
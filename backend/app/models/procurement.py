@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, Numeric, ForeignKey, Text
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Numeric, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from app.db import Base
 
@@ -16,5 +16,16 @@ class Procurement(Base):
     status = Column(String, default="draft")  # draft, active, evaluation, awarded, archived
     bids_count = Column(Integer, default=0)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Keyset pagination order: NOT NULL (see alembic 0005_pagination_not_null)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # Hot-path filters and ordering (see alembic 0002_hot_path_indexes)
+        Index("ix_procurements_created_at_id", "created_at", "id"),
+        Index("ix_procurements_status_created_at", "status", "created_at", "id"),
+        Index("ix_procurements_category", "category"),
+        # Trigram indexes for ilike/fuzzy search (see alembic 0003_search_trigram_indexes)
+        Index("ix_procurements_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_procurements_tender_id_trgm", "tender_id", postgresql_using="gin", postgresql_ops={"tender_id": "gin_trgm_ops"}),
+    )
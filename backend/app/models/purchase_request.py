@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from app.db import Base
 
@@ -13,5 +13,15 @@ class PurchaseRequest(Base):
     requester_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     status = Column(String, default="pending_approval")  # pending_approval, approved, rejected, completed
     total_value = Column(Numeric(precision=12, scale=2), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Keyset pagination order: NOT NULL (see alembic 0005_pagination_not_null)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # Hot-path filters and ordering (see alembic 0002_hot_path_indexes)
+        Index("ix_purchase_requests_created_at_id", "created_at", "id"),
+        Index("ix_purchase_requests_status_created_at", "status", "created_at", "id"),
+        # Trigram indexes for ilike/fuzzy search (see alembic 0003_search_trigram_indexes)
+        Index("ix_purchase_requests_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_purchase_requests_request_id_trgm", "request_id", postgresql_using="gin", postgresql_ops={"request_id": "gin_trgm_ops"}),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Numeric, Text
+from sqlalchemy import Column, Integer, String, DateTime, Numeric, Text, Index
 from sqlalchemy.sql import func
 from app.db import Base
 
@@ -14,5 +14,15 @@ class Revenue(Base):
     status = Column(String, default="pending")  # pending, collected, overdue
     due_date = Column(DateTime(timezone=True), nullable=True)
     collected_date = Column(DateTime(timezone=True), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Keyset pagination order: NOT NULL (see alembic 0005_pagination_not_null)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # Hot-path filters and ordering (see alembic 0002_hot_path_indexes)
+        Index("ix_revenues_created_at_id", "created_at", "id"),
+        Index("ix_revenues_status_collected_date", "status", "collected_date"),
+        # Trigram indexes for ilike/fuzzy search (see alembic 0003_search_trigram_indexes)
+        Index("ix_revenues_source_trgm", "source", postgresql_using="gin", postgresql_ops={"source": "gin_trgm_ops"}),
+        Index("ix_revenues_revenue_id_trgm", "revenue_id", postgresql_using="gin", postgresql_ops={"revenue_id": "gin_trgm_ops"}),
+    )
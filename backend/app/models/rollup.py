@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Numeric
+from sqlalchemy.sql import func
+from app.db import Base
+
+class PaymentRollup(Base):
+    """Monthly payment totals, maintained incrementally by RollupService"""
+    __tablename__ = "payment_rollups"
+
+    month = Column(Date, primary_key=True)  # First day of the UTC month
+    method = Column(String, primary_key=True)
+    status = Column(String, primary_key=True)
+    payee = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    amount = Column(Numeric(precision=16, scale=2), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class RevenueRollup(Base):
+    """Monthly revenue totals, maintained incrementally by RollupService"""
+    __tablename__ = "revenue_rollups"
+
+    month = Column(Date, primary_key=True)  # First day of the UTC month
+    category = Column(String, primary_key=True)
+    status = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    amount = Column(Numeric(precision=16, scale=2), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,58 @@
+from typing import Any, ClassVar, Dict, Generic, List, Literal, Optional, Tuple, TypeVar
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.core.config import settings
+
+CreateT = TypeVar("CreateT")
+UpdateT = TypeVar("UpdateT")
+
+BatchMode = Literal["all_or_nothing", "best_effort"]
+
+class BatchUpdate(BaseModel, Generic[UpdateT]):
+    id: int
+    changes: UpdateT
+
+def check_batch_size(total: int) -> None:
+    if not total:
+        raise ValueError("A batch needs at least one item")
+    if total > settings.BATCH_MAX_ITEMS:
+        raise ValueError(f"A batch may contain at most {settings.BATCH_MAX_ITEMS} items")
+
+class BatchRequest(BaseModel, Generic[CreateT, UpdateT]):
+    mode: BatchMode = "all_or_nothing"
+    create: List[CreateT] = Field(default_factory=list)
+    update: List[BatchUpdate[UpdateT]] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def check_size(self):
+        check_batch_size(len(self.create) + len(self.update))
+        return self
+
+class BatchCreateRequest(BaseModel, Generic[CreateT]):
+    """Creates only, for entities whose rows change through dedicated endpoints"""
+    model_config = ConfigDict(extra="forbid")
+
+    mode: BatchMode = "all_or_nothing"
+    create: List[CreateT] = Field(default_factory=list)
+    update: ClassVar[Tuple[()]] = ()
+
+    @model_validator(mode="after")
+    def check_size(self):
+        check_batch_size(len(self.create))
+        return self
+
+class BatchItemResult(BaseModel):
+    op: Literal["create", "update"]
+    index: int  # Position in the request's create/update list
+    status: Literal["ok", "error", "rolled_back"]
+    id: Optional[int] = None
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    mode: BatchMode
+    committed: bool
+    created: int
+    updated: int
+    failed: int
+    results: List[BatchItemResult]
@@ -0,0 +1,281 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import DateTime, Row, cast, func, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+import numpy as np
+
+from app.core.config import settings
+from app.db import engine
+from app.models.payment import Payment
+from app.models.rollup import PaymentRollup, RevenueRollup
+
+GRANULARITIES = ("day", "week", "month", "quarter")
+
+# Upper bound on the number of buckets a single request may produce
+MAX_BUCKETS = 1000
+
+def _add_months(value: datetime, months: int) -> datetime:
+    """Shift a bucket start (always day 1) by a number of calendar months"""
+    index = value.year * 12 + (value.month - 1) + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+def to_utc(value: datetime) -> datetime:
+    """Normalize a datetime to naive UTC (naive input is assumed to be UTC)"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def truncate(value: datetime, granularity: str) -> datetime:
+    """Python equivalent of Postgres date_trunc for the supported granularities"""
+    day = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    if granularity == "quarter":
+        return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+    raise ValueError(f"Unsupported granularity: {granularity}")
+
+def shift_bucket(value: datetime, granularity: str, count: int = 1) -> datetime:
+    """Move a bucket start forward (or backward) by a number of buckets"""
+    if granularity == "day":
+        return value + timedelta(days=count)
+    if granularity == "week":
+        return value + timedelta(weeks=count)
+    if granularity == "month":
+        return _add_months(value, count)
+    if granularity == "quarter":
+        return _add_months(value, 3 * count)
+    raise ValueError(f"Unsupported granularity: {granularity}")
+
+def bucket_range(start: datetime, end: datetime, granularity: str) -> List[datetime]:
+    """All bucket starts from the bucket containing start to the one containing end"""
+    current = truncate(start, granularity)
+    last = truncate(end, granularity)
+    buckets = []
+    while current <= last:
+        buckets.append(current)
+        if len(buckets) > MAX_BUCKETS:
+            raise ValueError(f"Date range too large for {granularity} granularity (max {MAX_BUCKETS} buckets)")
+        current = shift_bucket(current, granularity)
+    return buckets
+
+def bucket_label(value: datetime, granularity: str) -> str:
+    """Chart label for a bucket start"""
+    if granularity == "month":
+        return value.strftime("%Y-%m")
+    if granularity == "quarter":
+        return f"{value.year}-Q{(value.month - 1) // 3 + 1}"
+    return value.strftime("%Y-%m-%d")
+
+def resolve_range(
+    granularity: str,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    default_buckets: int = 12,
+) -> Tuple[datetime, datetime]:
+    """
+    Resolve a caller supplied range to naive UTC bucket boundaries
+
+    Returns:
+        (first bucket start, exclusive upper bound)
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+    end = truncate(to_utc(end_date) if end_date else datetime.utcnow(), granularity)
+    if start_date:
+        start = truncate(to_utc(start_date), granularity)
+    else:
+        start = shift_bucket(end, granularity, -(default_buckets - 1))
+    if start > end:
+        raise ValueError("start_date must be before end_date")
+    return start, shift_bucket(end, granularity)
+
+async def run_concurrently(*statements, max_concurrency: Optional[int] = None) -> List[List[Row]]:
+    """
+    Execute independent read-only statements concurrently
+
+    Each statement runs on its own pooled connection from app.db.engine, so
+    end-to-end latency is roughly that of the slowest statement. At most
+    max_concurrency connections are held at once (ANALYTICS_FANOUT_CONCURRENCY
+    by default) so a single request cannot drain the pool.
+
+    Returns:
+        Fully fetched rows for each statement, in argument order
+    """
+    limit = asyncio.Semaphore(max_concurrency or settings.ANALYTICS_FANOUT_CONCURRENCY)
+
+    async def run(statement) -> List[Row]:
+        async with limit:
+            async with engine.connect() as conn:
+                result = await conn.execute(statement)
+                return result.all()
+
+    return list(await asyncio.gather(*(run(statement) for statement in statements)))
+
+def utc_bucket(column, granularity: str):
+    """
+    date_trunc expression over a timestamptz column in UTC
+
+    The granularity is rendered inline rather than bound so that the same
+    expression can appear in both SELECT and GROUP BY.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+    return func.date_trunc(literal_column(f"'{granularity}'"), func.timezone(literal_column("'UTC'"), column))
+
+# The date a payment is bucketed by: payment_date, or created_at while it is
+# unset. payment_rollups use the same rule, so every granularity agrees.
+PAYMENT_PERIOD_DATE = func.coalesce(Payment.payment_date, Payment.created_at)
+
+class AnalyticsService:
+    """Database-side aggregations backing the analytics endpoints"""
+
+    async def spending_by_period(
+        self,
+        db: AsyncSession,
+        granularity: str = "month",
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[datetime, float]]:
+        """
+        Sum completed payments per time bucket
+
+        Month and quarter buckets are read from payment_rollups; day and week
+        buckets are computed in Postgres with date_trunc on the UTC
+        PAYMENT_PERIOD_DATE. Either way only one row per non-empty bucket leaves the database
+        and empty buckets are filled with zero.
+
+        Returns:
+            List of (bucket start, total amount) ordered by bucket
+        """
+        start, upper = resolve_range(granularity, start_date, end_date)
+        buckets = bucket_range(start, upper - timedelta(microseconds=1), granularity)
+
+        if granularity in ("month", "quarter"):
+            bucket = func.date_trunc(
+                literal_column(f"'{granularity}'"), cast(PaymentRollup.month, DateTime)
+            ).label("bucket")
+            query = select(bucket, func.sum(PaymentRollup.amount)).where(
+                PaymentRollup.status == "completed",
+                PaymentRollup.month >= start.date(),
+                PaymentRollup.month < upper.date(),
+            )
+        else:
+            bucket = utc_bucket(PAYMENT_PERIOD_DATE, granularity).label("bucket")
+            query = select(bucket, func.sum(Payment.amount)).where(
+                Payment.status == "completed",
+                PAYMENT_PERIOD_DATE >= start.replace(tzinfo=timezone.utc),
+                PAYMENT_PERIOD_DATE < upper.replace(tzinfo=timezone.utc),
+            )
+        result = await db.execute(query.group_by(bucket))
+        totals: Dict[datetime, float] = {
+            to_utc(row_bucket): float(total or 0) for row_bucket, total in result.all()
+        }
+        return [(b, totals.get(b, 0.0)) for b in buckets]
+
+    async def top_vendors(
+        self,
+        db: AsyncSession,
+        limit: int = 10,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        method: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank payees by completed spend
+
+        Grouping, ordering and the LIMIT all run in Postgres, so at most
+        `limit` rows are returned regardless of table size.
+
+        Returns:
+            List of dicts with payee, count, total, average and last_payment_date
+        """
+        total = func.sum(Payment.amount).label("total")
+        query = (
+            select(
+                Payment.payee,
+                func.count().label("count"),
+                total,
+                func.avg(Payment.amount).label("average"),
+                func.max(Payment.payment_date).label("last_payment_date"),
+            )
+            .where(Payment.status == "completed")
+            .group_by(Payment.payee)
+            .order_by(total.desc(), Payment.payee)
+            .limit(limit)
+        )
+        if start_date:
+            query = query.where(Payment.payment_date >= start_date)
+        if end_date:
+            query = query.where(Payment.payment_date <= end_date)
+        if method:
+            query = query.where(Payment.method == method)
+
+        result = await db.execute(query)
+        return [
+            {
+                "payee": row.payee,
+                "count": row.count,
+                "total": float(row.total or 0),
+                "average": float(row.average or 0),
+                "last_payment_date": row.last_payment_date,
+            }
+            for row in result.all()
+        ]
+
+    async def monthly_series(
+        self,
+        db: AsyncSession,
+        dataset: str = "payments",
+        group_by: Optional[str] = None,
+        months: int = 36,
+    ) -> Tuple[List[date], List[str], np.ndarray]:
+        """
+        Aligned monthly totals from the rollup tables, ready for forecasting
+
+        Payments count completed amounts and may be split by method; revenue
+        counts collected amounts and may be split by category. The series end
+        at the last complete month; months with no activity are zero.
+
+        Returns:
+            (month starts, series names, array of shape (n_series, months))
+        """
+        if dataset == "payments":
+            model, status, groupable = PaymentRollup, "completed", ("method",)
+        elif dataset == "revenue":
+            model, status, groupable = RevenueRollup, "collected", ("category",)
+        else:
+            raise ValueError(f"Unsupported dataset: {dataset}")
+        if group_by is not None and group_by not in groupable:
+            raise ValueError(f"{dataset} can only be grouped by: {', '.join(groupable)}")
+
+        # Complete months only: the current month would drag the last point down
+        last = shift_bucket(truncate(datetime.utcnow(), "month"), "month", -1)
+        month_starts = [shift_bucket(last, "month", -i).date() for i in range(months - 1, -1, -1)]
+        index = {month: i for i, month in enumerate(month_starts)}
+
+        group = getattr(model, group_by) if group_by else literal_column("'Total'")
+        query = (
+            select(model.month, group, func.sum(model.amount))
+            .where(model.status == status, model.month >= month_starts[0], model.month <= month_starts[-1])
+            .group_by(model.month)
+        )
+        if group_by:
+            query = query.group_by(group)
+        result = await db.execute(query)
+        rows = result.all()
+
+        names = sorted({name for _, name, _ in rows}) or ["Total"]
+        positions = {name: i for i, name in enumerate(names)}
+        values = np.zeros((len(names), months))
+        for month, name, amount in rows:
+            if month in index:
+                values[positions[name], index[month]] = float(amount or 0)
+        return month_starts, names, values
+
+analytics_service = AnalyticsService()
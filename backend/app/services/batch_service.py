@@ -0,0 +1,215 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from sqlalchemy import Column, cast, values
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql import insert, update
+
+from app.core.cache import analytics_cache
+from app.models.payment import Payment
+from app.models.procurement import Procurement
+from app.models.purchase_request import PurchaseRequest
+from app.models.revenue import Revenue
+from app.schemas.batch import BatchCreateRequest, BatchRequest
+from app.services.id_service import id_service
+from app.services.rollup_service import rollup_service
+from app.services.version_service import version_service
+
+@dataclass(frozen=True)
+class BatchSource:
+    model: Any
+    prefix: str  # Business ID prefix handed to id_service
+    id_column: str
+    dataset: str  # data_versions name bumped on commit
+    extra: Callable[[Any], Dict[str, Any]] = lambda user: {}  # Columns set from the current user on create
+    snapshot: Optional[Callable[[Any], Any]] = None  # Rollup contribution of a row, if the entity has rollups
+    record: Optional[Callable[..., Any]] = None  # Applies a list of (before, after) rollup changes
+
+BATCH_SOURCES: Dict[str, BatchSource] = {
+    "payments": BatchSource(
+        Payment, "PAY", "payment_id", "payments",
+        snapshot=rollup_service.snapshot_payment, record=rollup_service.record_payment_changes,
+    ),
+    "revenue": BatchSource(
+        Revenue, "REV", "revenue_id", "revenue",
+        snapshot=rollup_service.snapshot_revenue, record=rollup_service.record_revenue_changes,
+    ),
+    "procurement": BatchSource(
+        Procurement, "TN", "tender_id", "procurement",
+        extra=lambda user: {"created_by": user.id},
+    ),
+    "purchase_requests": BatchSource(
+        PurchaseRequest, "PR", "request_id", "purchase_requests",
+        extra=lambda user: {"requester_id": user.id},
+    ),
+}
+
+class BatchError(Exception):
+    """Abandons an all_or_nothing batch"""
+
+def _error(e: DBAPIError) -> str:
+    return str(e.orig).splitlines()[0] if e.orig is not None else str(e)
+
+class BatchService:
+    """
+    Many creates/updates of one entity in a single transaction
+
+    Creates go out as one multi-row INSERT ... RETURNING and updates as one
+    UPDATE ... FROM (VALUES ...) RETURNING, followed by one rollup statement,
+    one version bump and one commit. If a multi-row statement fails,
+    best_effort mode retries its items one at a time under savepoints to find
+    the offenders; all_or_nothing mode rolls the whole batch back.
+    """
+
+    async def _insert(self, db: AsyncSession, table: Any, rows: List[Dict[str, Any]]) -> List[Any]:
+        result = await db.execute(insert(table).values(rows).returning(*table.c))
+        return result.all()
+
+    async def _update(self, db: AsyncSession, table: Any, columns: List[str], rows: List[Dict[str, Any]]) -> List[Any]:
+        """UPDATE every row in `rows` (id + `columns`) with one statement"""
+        data = values(
+            Column("id", table.c.id.type),
+            *[Column(name, table.c[name].type) for name in columns],
+            name="batch",
+        ).data([tuple(row[c] for c in ["id", *columns]) for row in rows])
+        statement = (
+            update(table)
+            .where(table.c.id == data.c.id)
+            # Cast again: a column that is NULL in every row would otherwise be typed text
+            .values({name: cast(data.c[name], table.c[name].type) for name in columns})
+            .returning(*table.c)
+        )
+        result = await db.execute(statement)
+        return result.all()
+
+    async def _run(self, db: AsyncSession, best_effort: bool, fn: Callable, items: List[Any]) -> Tuple[List[Any], Dict[int, str]]:
+        """
+        Run `fn(items)` under a savepoint; returns (returned rows, errors by item position)
+
+        In best_effort mode a failed multi-row statement is retried per item.
+        """
+        try:
+            async with db.begin_nested():
+                return await fn(items), {}
+        except DBAPIError as e:
+            if not best_effort:
+                raise BatchError(_error(e)) from e
+            if len(items) == 1:
+                return [], {0: _error(e)}
+        rows, errors = [], {}
+        for position, item in enumerate(items):
+            try:
+                async with db.begin_nested():
+                    rows.extend(await fn([item]))
+            except DBAPIError as e:
+                errors[position] = _error(e)
+        return rows, errors
+
+    def _rolled_back(self, request: Union[BatchRequest, BatchCreateRequest], results: Dict[Tuple[str, int], Dict[str, Any]], message: str) -> Dict[str, Any]:
+        """Report for an all_or_nothing batch that was abandoned: nothing was written"""
+        report = []
+        for op, count in (("create", len(request.create)), ("update", len(request.update))):
+            for index in range(count):
+                result = results.get((op, index))
+                if result is None or result["status"] != "error":
+                    result = {"op": op, "index": index, "status": "rolled_back", "error": message}
+                report.append(result)
+        return {"mode": request.mode, "committed": False, "created": 0, "updated": 0, "failed": len(report), "results": report}
+
+    async def apply(self, db: AsyncSession, entity: str, request: Union[BatchRequest, BatchCreateRequest], user: Any) -> Dict[str, Any]:
+        source = BATCH_SOURCES[entity]
+        table = source.model.__table__
+        best_effort = request.mode == "best_effort"
+        results: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        changes = []
+
+        def fail(op: str, index: int, error: str) -> None:
+            results[(op, index)] = {"op": op, "index": index, "status": "error", "error": error}
+
+        def succeed(op: str, index: int, row: Any) -> None:
+            data = dict(row._mapping)
+            results[(op, index)] = {"op": op, "index": index, "status": "ok", "id": data["id"], "data": data}
+
+        try:
+            if request.create:
+                ids = await id_service.reserve(db, source.prefix, len(request.create))
+                rows = [
+                    {**item.model_dump(), **source.extra(user), source.id_column: business_id}
+                    for item, business_id in zip(request.create, ids)
+                ]
+                returned, errors = await self._run(db, best_effort, lambda batch: self._insert(db, table, batch), rows)
+                by_business_id = {row._mapping[source.id_column]: row for row in returned}
+                for index, business_id in enumerate(ids):
+                    if index in errors:
+                        fail("create", index, errors[index])
+                    else:
+                        row = by_business_id[business_id]
+                        succeed("create", index, row)
+                        if source.snapshot:
+                            changes.append((None, source.snapshot(row)))
+
+            if request.update:
+                targets = sorted({item.id for item in request.update})
+                # Lock in id order so concurrent batches cannot deadlock, and so no
+                # other writer can change a column between this read and the update
+                result = await db.execute(
+                    select(*table.c).where(table.c.id.in_(targets)).order_by(table.c.id).with_for_update()
+                )
+                existing = {row.id: row for row in result.all()}
+                seen, pending = set(), []
+                for index, item in enumerate(request.update):
+                    if item.id in seen:
+                        fail("update", index, "Duplicate id in batch")
+                    elif item.id not in existing:
+                        fail("update", index, f"{entity} {item.id} not found")
+                    else:
+                        pending.append((index, item))
+                    seen.add(item.id)
+                if not best_effort and len(pending) < len(request.update):
+                    raise BatchError("Invalid update items")
+
+                columns = sorted({name for _, item in pending for name in item.changes.model_dump(exclude_unset=True)})
+                rows = [
+                    {**dict(existing[item.id]._mapping), **item.changes.model_dump(exclude_unset=True)}
+                    for _, item in pending
+                ]
+                if columns:
+                    returned, errors = await self._run(
+                        db, best_effort, lambda batch: self._update(db, table, columns, batch), rows
+                    )
+                else:
+                    returned, errors = [existing[item.id] for _, item in pending], {}
+                by_id = {row.id: row for row in returned}
+                for position, (index, item) in enumerate(pending):
+                    if position in errors:
+                        fail("update", index, errors[position])
+                        continue
+                    row = by_id[item.id]
+                    succeed("update", index, row)
+                    if source.snapshot:
+                        changes.append((source.snapshot(existing[item.id]), source.snapshot(row)))
+        except BatchError as e:
+            await db.rollback()
+            return self._rolled_back(request, results, str(e))
+
+        succeeded = [r for r in results.values() if r["status"] == "ok"]
+        if succeeded:
+            if changes:
+                await source.record(db, changes)
+            await version_service.bump(db, source.dataset)
+        await db.commit()
+        if succeeded:
+            analytics_cache.clear()
+
+        ordered = sorted(results.values(), key=lambda r: (r["op"] != "create", r["index"]))
+        return {
+            "mode": request.mode,
+            "committed": True,
+            "created": sum(1 for r in succeeded if r["op"] == "create"),
+            "updated": sum(1 for r in succeeded if r["op"] == "update"),
+            "failed": len(results) - len(succeeded),
+            "results": ordered,
+        }
+
+batch_service = BatchService()
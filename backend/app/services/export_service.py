@@ -1,30 +1,149 @@
-import pandas as pd
-from io import BytesIO
-from typing import List, Dict, Any
+import asyncio
+import csv
+import io
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, List, Sequence, Tuple
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from sqlalchemy import DateTime, Float, Numeric
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.models.fraud_alert import FraudAlert
+from app.models.payment import Payment
+from app.models.procurement import Procurement
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+DATETIME_FORMAT = "yyyy-mm-dd hh:mm:ss"
+MONEY_FORMAT = "#,##0.00"
+
+# module -> (header, column) pairs; only these columns are read
+EXPORT_SOURCES: Dict[str, List[Tuple[str, Any]]] = {
+    "payments": [
+        ("id", Payment.id),
+        ("amount", Payment.amount),
+        ("vendor", Payment.payee),
+        ("status", Payment.status),
+        ("date", Payment.payment_date),
+        ("method", Payment.method),
+    ],
+    "procurement": [
+        ("id", Procurement.id),
+        ("title", Procurement.title),
+        ("status", Procurement.status),
+        ("budget", Procurement.estimated_value),
+        ("deadline", Procurement.deadline),
+    ],
+    "fraud_alerts": [
+        ("id", FraudAlert.id),
+        ("payment_id", FraudAlert.payment_id),
+        ("severity", FraudAlert.severity),
+        ("description", FraudAlert.description),
+        ("resolved", FraudAlert.is_resolved),
+        ("detected_at", FraudAlert.detected_at),
+    ],
+}
+
+def excel_datetime(value: datetime) -> datetime:
+    """Excel has no time zones: aware values are written as naive UTC"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
 
 class ExportService:
-    def export_to_csv(self, data: List[Dict[str, Any]]) -> BytesIO:
-        """Export data to CSV"""
-        if not data:
-            return BytesIO(b"")
-            
-        df = pd.DataFrame(data)
-        output = BytesIO()
-        df.to_csv(output, index=False)
-        output.seek(0)
-        return output
+    def headers(self, module: str) -> List[str]:
+        return [header for header, _ in EXPORT_SOURCES[module]]
+
+    def statement(self, module: str):
+        """SELECT of the exported columns only, in primary-key order"""
+        columns = [column for _, column in EXPORT_SOURCES[module]]
+        return select(*columns).order_by(columns[0])
+
+    async def stream_csv(self, session_factory: Callable, module: str) -> AsyncIterator[bytes]:
+        """
+        CSV export as a byte stream, one chunk per server-side cursor batch
 
-    def export_to_excel(self, data: List[Dict[str, Any]]) -> BytesIO:
-        """Export data to Excel"""
-        if not data:
-            return BytesIO(b"")
-            
-        df = pd.DataFrame(data)
-        output = BytesIO()
-        # Use openpyxl engine
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False)
+        The session is opened here rather than by the request so it stays
+        open while the response body is sent; memory use is bounded by
+        EXPORT_BATCH_SIZE rows whatever the table size.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.headers(module))
+        async with session_factory() as session:
+            result = await session.stream(
+                self.statement(module).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+            )
+            async for rows in result.partitions():
+                writer.writerows(rows)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    def cell_converters(self, sheet: Any, module: str) -> List[Callable[[Any], Any]]:
+        """Per-column value converters: typed, formatted cells for datetimes and money"""
+        def typed(number_format: str, convert: Callable[[Any], Any] = lambda v: v):
+            def cell(value: Any) -> Any:
+                if value is None:
+                    return None
+                written = WriteOnlyCell(sheet, value=convert(value))
+                written.number_format = number_format
+                return written
+            return cell
+
+        converters = []
+        for _, column in EXPORT_SOURCES[module]:
+            if isinstance(column.type, DateTime):
+                converters.append(typed(DATETIME_FORMAT, excel_datetime))
+            elif isinstance(column.type, Numeric) and not isinstance(column.type, Float):
+                converters.append(typed(MONEY_FORMAT))
+            else:
+                converters.append(lambda v: v)
+        return converters
+
+    def _append_rows(self, sheet: Any, converters: List[Callable[[Any], Any]], rows: Sequence[Any]) -> None:
+        for row in rows:
+            sheet.append([convert(value) for convert, value in zip(converters, row)])
+
+    async def build_xlsx(self, session_factory: Callable, modules: Sequence[str]) -> BinaryIO:
+        """
+        Workbook with one sheet per module, written with openpyxl's write-only mode
+
+        Rows go straight from the server-side cursor to the sheet (which
+        openpyxl buffers on disk), so memory stays flat; the finished file is
+        kept in a SpooledTemporaryFile that moves to disk past
+        EXPORT_SPOOL_MAX_BYTES. The caller owns (and must close) the file.
+        """
+        workbook = Workbook(write_only=True)
+        async with session_factory() as session:
+            for module in modules:
+                sheet = workbook.create_sheet(title=module[:31])
+                sheet.append(self.headers(module))
+                converters = self.cell_converters(sheet, module)
+                result = await session.stream(
+                    self.statement(module).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+                )
+                async for rows in result.partitions():
+                    await asyncio.to_thread(self._append_rows, sheet, converters, rows)
+
+        output = tempfile.SpooledTemporaryFile(max_size=settings.EXPORT_SPOOL_MAX_BYTES)
+        try:
+            await asyncio.to_thread(workbook.save, output)
+        except BaseException:
+            output.close()
+            raise
         output.seek(0)
         return output
 
+    async def iter_file(self, file: BinaryIO, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Stream a file's contents and close it afterwards"""
+        try:
+            while chunk := await asyncio.to_thread(file.read, chunk_size):
+                yield chunk
+        finally:
+            file.close()
+
 export_service = ExportService()
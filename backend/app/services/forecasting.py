@@ -0,0 +1,173 @@
+import hashlib
+import itertools
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Any, Dict
+import numpy as np
+
+from app.core.cache import TTLCache
+
+# Smoothing parameter grid searched for every series in one vectorized pass
+ALPHAS = (0.1, 0.3, 0.5, 0.7, 0.9)
+BETAS = (0.0, 0.05, 0.15, 0.3)
+GAMMAS = (0.05, 0.2, 0.4)
+
+@dataclass(frozen=True)
+class HoltWintersFit:
+    """Fitted state for a batch of aligned series (one row per series)"""
+    level: np.ndarray      # (n_series,)
+    trend: np.ndarray      # (n_series,)
+    season: np.ndarray     # (n_series, season_length), indexed by period position
+    alpha: np.ndarray      # (n_series,)
+    beta: np.ndarray       # (n_series,)
+    gamma: np.ndarray      # (n_series,)
+    sigma: np.ndarray      # (n_series,) one-step residual standard deviation
+    n_obs: int
+    season_length: int
+    method: str            # "holt_winters", "holt" or "mean"
+
+@dataclass(frozen=True)
+class Forecast:
+    mean: np.ndarray       # (n_series, horizon)
+    lower: np.ndarray
+    upper: np.ndarray
+
+def _param_grid(seasonal: bool) -> np.ndarray:
+    gammas = GAMMAS if seasonal else (0.0,)
+    return np.array(list(itertools.product(ALPHAS, BETAS, gammas)), dtype=float)  # (n_params, 3)
+
+def fit_holt_winters(y: np.ndarray, season_length: int = 12) -> HoltWintersFit:
+    """
+    Fit additive Holt-Winters to every row of y at once
+
+    Each series is fitted against the whole parameter grid simultaneously
+    (arrays are shaped series x parameters), and the parameters with the lowest
+    one-step squared error are kept per series. The only Python loop is over
+    time steps. Falls back to Holt's linear trend when there are fewer than two
+    full seasons, and to a flat mean when there are fewer than three points.
+
+    Args:
+        y: Array of shape (n_series, n_obs), oldest observation first
+
+    Returns:
+        HoltWintersFit with per-series state and parameters
+    """
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    n_series, n_obs = y.shape
+    zeros = np.zeros(n_series)
+
+    if n_obs < 3:
+        level = y.mean(axis=1) if n_obs else zeros
+        sigma = y.std(axis=1) if n_obs else zeros
+        return HoltWintersFit(
+            level=level, trend=zeros, season=np.zeros((n_series, season_length)),
+            alpha=zeros, beta=zeros, gamma=zeros, sigma=sigma,
+            n_obs=n_obs, season_length=season_length, method="mean",
+        )
+
+    seasonal = n_obs >= 2 * season_length
+    m = season_length if seasonal else 1
+    grid = _param_grid(seasonal)
+    alpha, beta, gamma = (grid[:, i][None, :] for i in range(3))  # (1, n_params)
+    n_params = len(grid)
+
+    # Initial state from the first two seasons, broadcast across the grid. The
+    # first-season mean sits at its midpoint, so the level is advanced to the
+    # end of that season and the seasonal indices are detrended; fitting then
+    # starts at t = m.
+    if seasonal:
+        first = y[:, :m].mean(axis=1)
+        second = y[:, m:2 * m].mean(axis=1)
+        slope = (second - first) / m
+        offsets = np.arange(m) - (m - 1) / 2
+        level = np.repeat((first + slope * (m - 1) / 2)[:, None], n_params, axis=1)
+        trend = np.repeat(slope[:, None], n_params, axis=1)
+        initial_season = y[:, :m] - (first[:, None] + slope[:, None] * offsets[None, :])
+        season = np.repeat(initial_season[:, None, :], n_params, axis=1)
+    else:
+        level = np.repeat(y[:, :1], n_params, axis=1)
+        trend = np.repeat((y[:, 1:2] - y[:, :1]), n_params, axis=1)
+        season = np.zeros((n_series, n_params, 1))
+
+    sse = np.zeros((n_series, n_params))
+    for t in range(m if seasonal else 1, n_obs):
+        obs = y[:, t][:, None]
+        s = season[:, :, t % m]
+        err = obs - (level + trend + s)
+        sse += err * err
+        new_level = alpha * (obs - s) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        season[:, :, t % m] = gamma * (obs - new_level) + (1 - gamma) * s
+        level = new_level
+
+    best = sse.argmin(axis=1)
+    rows = np.arange(n_series)
+    dof = max(n_obs - (m + 3 if seasonal else 3), 1)
+
+    # Store seasonal components by absolute period position (t % m)
+    best_season = season[rows, best] if seasonal else np.zeros((n_series, season_length))
+
+    return HoltWintersFit(
+        level=level[rows, best],
+        trend=trend[rows, best],
+        season=best_season,
+        alpha=grid[best, 0],
+        beta=grid[best, 1],
+        gamma=grid[best, 2],
+        sigma=np.sqrt(sse[rows, best] / dof),
+        n_obs=n_obs,
+        season_length=season_length,
+        method="holt_winters" if seasonal else "holt",
+    )
+
+def forecast(fit: HoltWintersFit, horizon: int, confidence: float = 0.95) -> Forecast:
+    """
+    Project a fitted batch `horizon` steps ahead with prediction intervals
+
+    Interval widths use the additive Holt-Winters h-step variance
+    sigma^2 * (1 + sum_{j<h} (alpha * (1 + j * beta) + gamma * [j % m == 0])^2).
+    """
+    steps = np.arange(1, horizon + 1)[None, :]                     # (1, h)
+    m = fit.season_length
+    positions = (fit.n_obs + steps - 1) % m
+    season = np.take_along_axis(fit.season, np.broadcast_to(positions, (fit.season.shape[0], horizon)), axis=1)
+    mean = fit.level[:, None] + steps * fit.trend[:, None] + season
+
+    j = np.arange(1, horizon)[None, :]                             # (1, h-1)
+    c = fit.alpha[:, None] * (1 + j * fit.beta[:, None]) + fit.gamma[:, None] * (j % m == 0)
+    variance_factor = 1 + np.concatenate([np.zeros((c.shape[0], 1)), np.cumsum(c * c, axis=1)], axis=1)
+    if fit.method == "mean":
+        variance_factor = np.ones_like(mean)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    half_width = z * fit.sigma[:, None] * np.sqrt(variance_factor)
+    return Forecast(mean=mean, lower=mean - half_width, upper=mean + half_width)
+
+class ForecastingService:
+    """Holt-Winters forecasts over pre-aggregated monthly series"""
+
+    def __init__(self):
+        # Fits are keyed on the input data itself, so new data means a new fit
+        self._fits = TTLCache(ttl=24 * 60 * 60, maxsize=256)
+
+    def fit(self, y: np.ndarray, season_length: int = 12) -> HoltWintersFit:
+        y = np.ascontiguousarray(np.atleast_2d(y), dtype=float)
+        key = (hashlib.sha1(y.tobytes()).hexdigest(), y.shape, season_length)
+        fit = self._fits.get(key)
+        if fit is None:
+            fit = fit_holt_winters(y, season_length)
+            self._fits.set(key, fit)
+        return fit
+
+    def forecast(
+        self,
+        y: np.ndarray,
+        horizon: int,
+        season_length: int = 12,
+        confidence: float = 0.95,
+    ) -> Forecast:
+        return forecast(self.fit(y, season_length), horizon, confidence)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self._fits.stats()
+
+forecasting_service = ForecastingService()
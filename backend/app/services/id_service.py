@@ -0,0 +1,100 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+# Business ID prefixes: payments, revenue, purchase requests, tenders
+ID_PREFIXES = ("PAY", "REV", "PR", "TN")
+
+# Random IDs used to be drawn from 1-999, so sequences start above that range
+SEQUENCE_START = 1000
+
+def sequence_name(prefix: str, year: int) -> str:
+    if prefix not in ID_PREFIXES:
+        raise ValueError(f"Unknown ID prefix: {prefix}")
+    return f"business_id_{prefix.lower()}_{int(year)}"
+
+def format_id(prefix: str, year: int, number: int) -> str:
+    return f"{prefix}-{year}-{number:03d}"
+
+class IdService:
+    """
+    Business IDs (PAY-2024-1000, TN-2024-1001, ...) from per-prefix, per-year sequences
+
+    Each sequence advances by the block size, so one nextval() hands this
+    worker a whole block of numbers and most IDs are issued from memory.
+    Numbers are unique across workers but not gap-free: a block left unused
+    when a worker stops is simply skipped.
+    """
+
+    def __init__(self, block_size: Optional[int] = None):
+        self.block_size = block_size or settings.ID_BLOCK_SIZE
+        self._blocks: Dict[Tuple[str, int], Tuple[int, int]] = {}  # (prefix, year) -> (next, end)
+        self._increments: Dict[str, int] = {}  # sequence name -> increment it was created with
+        self._locks: Dict[Tuple[str, int], asyncio.Lock] = {}
+        self.allocations = 0
+
+    async def _ensure_sequence(self, db: AsyncSession, name: str) -> int:
+        """Create the sequence if needed (on its own committed connection); returns its increment"""
+        if name not in self._increments:
+            async with db.bind.begin() as conn:
+                # Serialize creators so concurrent first use cannot collide in pg_class
+                await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": name})
+                await conn.execute(text(
+                    f"CREATE SEQUENCE IF NOT EXISTS {name} "
+                    f"INCREMENT BY {self.block_size} START WITH {SEQUENCE_START}"
+                ))
+                result = await conn.execute(
+                    text("SELECT increment_by FROM pg_sequences "
+                         "WHERE schemaname = current_schema() AND sequencename = :name"),
+                    {"name": name},
+                )
+                self._increments[name] = result.scalar()
+        return self._increments[name]
+
+    async def _allocate(self, db: AsyncSession, prefix: str, year: int, blocks: int = 1) -> List[Tuple[int, int]]:
+        """Claim `blocks` fresh blocks from the database as [start, end) ranges"""
+        name = sequence_name(prefix, year)
+        increment = await self._ensure_sequence(db, name)
+        result = await db.execute(
+            text(f"SELECT nextval('{name}') FROM generate_series(1, :blocks)"), {"blocks": blocks}
+        )
+        self.allocations += 1
+        return [(start, start + increment) for start in result.scalars().all()]
+
+    async def next_id(self, db: AsyncSession, prefix: str, year: Optional[int] = None) -> str:
+        """Next business ID for the prefix, e.g. PAY-2024-1042"""
+        year = year or datetime.now().year
+        key = (prefix, year)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            number, end = self._blocks.get(key, (0, 0))
+            if number >= end:
+                [(number, end)] = await self._allocate(db, prefix, year)
+            self._blocks[key] = (number + 1, end)
+        return format_id(prefix, year, number)
+
+    async def reserve(self, db: AsyncSession, prefix: str, count: int, year: Optional[int] = None) -> List[str]:
+        """
+        Reserve `count` IDs in one round-trip (bulk imports)
+
+        Whole blocks are claimed directly from the sequence; any tail beyond
+        `count` is discarded rather than mixed into this worker's current block.
+        """
+        if count <= 0:
+            return []
+        year = year or datetime.now().year
+        increment = await self._ensure_sequence(db, sequence_name(prefix, year))
+        ranges = await self._allocate(db, prefix, year, blocks=-(-count // increment))
+        numbers = [n for start, end in ranges for n in range(start, end)][:count]
+        return [format_id(prefix, year, n) for n in numbers]
+
+    def reset(self) -> None:
+        """Forget cached blocks and known sequences (tests, or after a schema reset)"""
+        self._blocks.clear()
+        self._increments.clear()
+
+id_service = IdService()
@@ -0,0 +1,239 @@
+import asyncio
+import codecs
+import csv
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Tuple
+import asyncpg
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Column, MetaData, Table, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import analytics_cache
+from app.core.config import settings
+from app.models.payment import Payment
+from app.models.purchase_request import PurchaseRequest
+from app.models.revenue import Revenue
+from app.schemas.payment import PaymentCreate
+from app.schemas.purchase_request import PurchaseRequestCreate
+from app.schemas.revenue import RevenueCreate
+from app.services.id_service import id_service
+from app.services.rollup_service import rollup_service
+from app.services.version_service import version_service
+
+@dataclass(frozen=True)
+class ImportSource:
+    model: Any
+    schema: Any  # Pydantic *Create schema each row is validated against
+    prefix: str  # Business ID prefix handed to id_service
+    id_column: str
+    dataset: str  # data_versions name bumped on import
+    columns: Tuple[str, ...]  # Columns loaded through the staging table, in COPY order
+    extra: Callable[[Any], Dict[str, Any]] = lambda user: {}
+
+IMPORT_SOURCES: Dict[str, ImportSource] = {
+    "payments": ImportSource(
+        Payment, PaymentCreate, "PAY", "payment_id", "payments",
+        ("payment_id", "payee", "reference", "method", "amount", "notes", "payment_date", "status"),
+    ),
+    "revenue": ImportSource(
+        Revenue, RevenueCreate, "REV", "revenue_id", "revenue",
+        ("revenue_id", "source", "category", "description", "amount", "due_date", "collected_date", "status"),
+    ),
+    "purchase_requests": ImportSource(
+        PurchaseRequest, PurchaseRequestCreate, "PR", "request_id", "purchase_requests",
+        ("request_id", "title", "department", "description", "total_value", "requester_id", "status"),
+        extra=lambda user: {"requester_id": user.id},
+    ),
+}
+
+def iter_csv(file: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """Rows of a UTF-8 CSV (BOM tolerated) as header -> value dicts, read incrementally"""
+    yield from csv.DictReader(codecs.getreader("utf-8-sig")(file))
+
+def iter_xlsx(file: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """Rows of the first worksheet, streamed with openpyxl's read-only mode"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+        for values in rows:
+            yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+READERS = {"csv": iter_csv, "xlsx": iter_xlsx}
+
+# Errors that reject a chunk: SQLAlchemy statements raise DBAPIError, the raw
+# asyncpg COPY raises PostgresError for server-side rejections and an
+# InterfaceError subclass (asyncpg's client-side DataError) for a record it
+# cannot encode
+CHUNK_ERRORS = (DBAPIError, asyncpg.PostgresError, asyncpg.InterfaceError)
+
+def chunk_error_message(e: Exception) -> str:
+    return str(e.orig if isinstance(e, DBAPIError) else e)
+
+def clean_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop unnamed columns and turn blank cells into missing values"""
+    cleaned = {}
+    for key, value in row.items():
+        if not key:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        if value not in ("", None):
+            cleaned[key.strip()] = value
+    return cleaned
+
+def validate_chunk(schema: Any, rows: List[Tuple[int, Dict[str, Any]]]) -> Tuple[List[BaseModel], List[Dict[str, Any]]]:
+    """Validate (line number, raw row) pairs; returns (valid models, per-row errors)"""
+    valid, errors = [], []
+    for line, row in rows:
+        try:
+            valid.append(schema.model_validate(clean_row(row)))
+        except ValidationError as e:
+            errors.append({
+                "row": line,
+                "errors": [
+                    {"field": ".".join(str(part) for part in error["loc"]), "message": error["msg"]}
+                    for error in e.errors()
+                ],
+            })
+    return valid, errors
+
+def read_chunk(rows: Iterator[Dict[str, Any]], size: int, first_line: int) -> List[Tuple[int, Dict[str, Any]]]:
+    chunk = []
+    for row in rows:
+        chunk.append((first_line + len(chunk), row))
+        if len(chunk) == size:
+            break
+    return chunk
+
+@dataclass
+class ImportReport:
+    entity: str
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    total_rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    chunks: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    errors_truncated: bool = False
+    started: float = field(default_factory=time.monotonic)
+
+    def add_errors(self, errors: List[Dict[str, Any]]) -> None:
+        self.failed += len(errors)
+        room = settings.IMPORT_MAX_REPORTED_ERRORS - len(self.errors)
+        self.errors.extend(errors[:max(room, 0)])
+        self.errors_truncated = self.errors_truncated or len(errors) > room
+
+    def fail_chunk(self, first_line: int, last_line: int, rows: int, message: str) -> None:
+        """Record a chunk the database rejected as a whole (its valid rows were not imported)"""
+        self.add_errors([{"rows": f"{first_line}-{last_line}", "errors": [{"field": None, "message": message}]}])
+        self.failed += rows - 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        return {
+            "job_id": self.job_id,
+            "entity": self.entity,
+            "total_rows": self.total_rows,
+            "imported": self.imported,
+            "failed": self.failed,
+            "chunks": self.chunks,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.imported / elapsed) if elapsed else None,
+            "errors": self.errors,
+            "errors_truncated": self.errors_truncated,
+        }
+
+class ImportService:
+    """
+    Bulk loader for payments, revenue and purchase requests
+
+    The upload is parsed and validated off the event loop one chunk at a
+    time. Each valid chunk gets its business IDs in one reservation, is
+    COPY'd into a temporary staging table and merged with a single
+    INSERT ... SELECT, together with the rollup and data-version updates,
+    and committed. Invalid rows are skipped and reported; a chunk the
+    database rejects is rolled back and reported as a whole.
+    """
+
+    def staging_table(self, source: ImportSource) -> Table:
+        name = f"import_{source.model.__tablename__}"
+        table = source.model.__table__
+        return Table(name, MetaData(), *[Column(c, table.c[c].type) for c in source.columns])
+
+    def records(self, source: ImportSource, models: List[BaseModel], ids: List[str], user: Any) -> List[tuple]:
+        """COPY records in `source.columns` order"""
+        table = source.model.__table__
+        defaults = {c: table.c[c].default.arg for c in source.columns if table.c[c].default is not None}
+        extra = source.extra(user)
+        records = []
+        for model, business_id in zip(models, ids):
+            values = {**defaults, **model.model_dump(), **extra, source.id_column: business_id}
+            records.append(tuple(values.get(c) for c in source.columns))
+        return records
+
+    async def _load_chunk(self, db: AsyncSession, source: ImportSource, records: List[tuple]) -> int:
+        staging = self.staging_table(source)
+        columns = ", ".join(source.columns)
+        await db.execute(text(
+            f"CREATE TEMP TABLE {staging.name} ON COMMIT DROP AS "
+            f"SELECT {columns} FROM {source.model.__tablename__} WITH NO DATA"
+        ))
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(staging.name, records=records, columns=list(source.columns))
+
+        result = await db.execute(text(
+            f"INSERT INTO {source.model.__tablename__} ({columns}) SELECT {columns} FROM {staging.name}"
+        ))
+        await rollup_service.record_bulk_insert(db, source.model, staging)
+        await version_service.bump(db, source.dataset)
+        await db.commit()
+        return result.rowcount
+
+    async def run(self, db: AsyncSession, entity: str, file: BinaryIO, file_format: str, user: Any) -> Dict[str, Any]:
+        """
+        Import every row of `file` (csv or xlsx) into `entity`
+
+        Returns the job report: counts, throughput and per-row errors
+        (1-based line numbers, the header being line 1).
+        """
+        if entity not in IMPORT_SOURCES:
+            raise ValueError(f"Unsupported entity: {entity}. Available: {', '.join(IMPORT_SOURCES)}")
+        if file_format not in READERS:
+            raise ValueError(f"Unsupported format: {file_format}. Use csv or xlsx")
+        source = IMPORT_SOURCES[entity]
+        report = ImportReport(entity)
+        rows = READERS[file_format](file)
+        chunk_size = settings.IMPORT_CHUNK_SIZE
+
+        try:
+            while True:
+                chunk = await asyncio.to_thread(read_chunk, rows, chunk_size, report.total_rows + 2)
+                if not chunk:
+                    break
+                report.total_rows += len(chunk)
+                models, errors = await asyncio.to_thread(validate_chunk, source.schema, chunk)
+                report.add_errors(errors)
+                if not models:
+                    continue
+                try:
+                    ids = await id_service.reserve(db, source.prefix, len(models))
+                    report.imported += await self._load_chunk(db, source, self.records(source, models, ids, user))
+                    report.chunks += 1
+                except CHUNK_ERRORS as e:
+                    await db.rollback()
+                    report.fail_chunk(chunk[0][0], chunk[-1][0], len(models), chunk_error_message(e))
+        finally:
+            if report.chunks:
+                analytics_cache.clear()
+        return report.as_dict()
+
+import_service = ImportService()
@@ -6,6 +6,8 @@ from app.integrations.bank_adapter import BankAdapter
 from app.integrations.mobile_money_adapter import MobileMoneyAdapter
 from app.models.payment import Payment
 from app.models.audit_log import AuditLog
+from app.services.rollup_service import rollup_service
+from app.services.version_service import version_service
 
 class PaymentService:
     """Payment processing service that routes payments to appropriate adapters"""
@@ -44,6 +46,7 @@ class PaymentService:
         """
         # Get the appropriate adapter
         adapter = self.get_adapter(payment.method)
+        before = rollup_service.snapshot_payment(payment)
         
         # Prepare payment data
         payment_data = {
@@ -79,6 +82,10 @@ class PaymentService:
         )
         db.add(audit_log)
         
+        # Move the payment between rollup buckets in the same transaction
+        await rollup_service.record_payment_change(db, before, rollup_service.snapshot_payment(payment))
+        await version_service.bump(db, "payments")
+        
         await db.commit()
         await db.refresh(payment)
         
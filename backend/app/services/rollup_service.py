@@ -0,0 +1,184 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import Date, Table, cast, delete, func, literal, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.payment import Payment
+from app.models.revenue import Revenue
+from app.models.rollup import PaymentRollup, RevenueRollup
+from app.services.analytics_service import PAYMENT_PERIOD_DATE, to_utc, utc_bucket
+from app.services.version_service import version_service
+
+# (rollup key, amount) describing one row's contribution to a rollup table
+Contribution = Tuple[tuple, Decimal]
+# (before, after) contributions of one write; None on the missing side for creates/deletes
+Change = Tuple[Optional[Contribution], Optional[Contribution]]
+
+def _month(value: Optional[datetime]) -> date:
+    """First day of the UTC month containing value (now when value is unset)"""
+    value = to_utc(value) if value else datetime.utcnow()
+    return value.date().replace(day=1)
+
+def _default(column) -> str:
+    """Python-side column default, for objects that have not been flushed yet"""
+    return column.default.arg
+
+class RollupService:
+    """
+    Keeps payment_rollups and revenue_rollups in step with the source tables.
+
+    Write paths take a snapshot of the row before and after the change and call
+    record_*_change before committing, so the rollup delta lands in the same
+    transaction as the write itself.
+    """
+
+    def snapshot_payment(self, payment: Payment) -> Contribution:
+        """Rollup key (month, method, status, payee) and amount for a payment"""
+        key = (
+            _month(payment.payment_date or payment.created_at),
+            payment.method,
+            payment.status or _default(Payment.__table__.c.status),
+            payment.payee,
+        )
+        return key, Decimal(payment.amount)
+
+    def snapshot_revenue(self, revenue: Revenue) -> Contribution:
+        """Rollup key (month, category, status) and amount for a revenue record"""
+        key = (
+            _month(revenue.collected_date or revenue.created_at),
+            revenue.category,
+            revenue.status or _default(Revenue.__table__.c.status),
+        )
+        return key, Decimal(revenue.amount)
+
+    async def record_payment_change(
+        self,
+        db: AsyncSession,
+        before: Optional[Contribution],
+        after: Optional[Contribution],
+    ) -> None:
+        """Apply a payment create (before=None), update or delete (after=None)"""
+        await self.record_payment_changes(db, [(before, after)])
+
+    async def record_revenue_change(
+        self,
+        db: AsyncSession,
+        before: Optional[Contribution],
+        after: Optional[Contribution],
+    ) -> None:
+        """Apply a revenue create (before=None), update or delete (after=None)"""
+        await self.record_revenue_changes(db, [(before, after)])
+
+    async def record_payment_changes(self, db: AsyncSession, changes: Iterable[Change]) -> None:
+        """Apply many (before, after) payment changes in one statement"""
+        await self._apply(db, PaymentRollup, ("month", "method", "status", "payee"), changes)
+
+    async def record_revenue_changes(self, db: AsyncSession, changes: Iterable[Change]) -> None:
+        """Apply many (before, after) revenue changes in one statement"""
+        await self._apply(db, RevenueRollup, ("month", "category", "status"), changes)
+
+    async def _apply(self, db: AsyncSession, model, key_columns, changes: Iterable[Change]) -> None:
+        deltas = {}
+        for before, after in changes:
+            if before is not None:
+                key, amount = before
+                count, total = deltas.get(key, (0, Decimal(0)))
+                deltas[key] = (count - 1, total - amount)
+            if after is not None:
+                key, amount = after
+                count, total = deltas.get(key, (0, Decimal(0)))
+                deltas[key] = (count + 1, total + amount)
+
+        # Sorted so concurrent writers always lock rollup rows in the same order
+        rows = [
+            {**dict(zip(key_columns, key)), "count": count, "amount": total}
+            for key, (count, total) in sorted(deltas.items())
+            if count or total
+        ]
+        if not rows:
+            return
+
+        stmt = insert(model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={
+                "count": model.count + stmt.excluded.count,
+                "amount": model.amount + stmt.excluded.amount,
+                "updated_at": func.now(),
+            },
+        )
+        await db.execute(stmt)
+
+    async def record_bulk_insert(self, db: AsyncSession, model, staging: Table) -> None:
+        """
+        Add the contributions of rows bulk-loaded from a staging table in one statement
+
+        `staging` has the source table's columns; rows without a business date
+        fall into the current month, as their created_at will be now().
+        """
+        if model is Payment:
+            rollup, date_column = PaymentRollup, staging.c.payment_date
+            keys = [staging.c.method, staging.c.status, staging.c.payee]
+        elif model is Revenue:
+            rollup, date_column = RevenueRollup, staging.c.collected_date
+            keys = [staging.c.category, staging.c.status]
+        else:
+            return
+        month = cast(utc_bucket(func.coalesce(date_column, func.now()), "month"), Date)
+        columns = ["month", *[key.name for key in keys]]
+        stmt = insert(rollup).from_select(
+            [*columns, "count", "amount"],
+            # Ordered so concurrent writers lock rollup rows in the same order
+            select(month, *keys, func.count(), func.sum(staging.c.amount))
+            .group_by(month, *keys)
+            .order_by(month, *keys),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=columns,
+            set_={
+                "count": rollup.count + stmt.excluded.count,
+                "amount": rollup.amount + stmt.excluded.amount,
+                "updated_at": func.now(),
+            },
+        )
+        await db.execute(stmt)
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """
+        Recompute both rollup tables from scratch (backfill / repair)
+
+        Source tables are locked against writes for the duration so no change
+        can slip between the aggregate and the commit.
+        """
+        await db.execute(text("LOCK TABLE payments, revenues IN SHARE MODE"))
+
+        await db.execute(delete(PaymentRollup))
+        month = cast(utc_bucket(PAYMENT_PERIOD_DATE, "month"), Date)
+        status = func.coalesce(Payment.status, literal(_default(Payment.__table__.c.status), literal_execute=True))
+        await db.execute(
+            insert(PaymentRollup).from_select(
+                ["month", "method", "status", "payee", "count", "amount"],
+                select(month, Payment.method, status, Payment.payee, func.count(), func.sum(Payment.amount))
+                .group_by(month, Payment.method, status, Payment.payee),
+            )
+        )
+
+        await db.execute(delete(RevenueRollup))
+        month = cast(utc_bucket(func.coalesce(Revenue.collected_date, Revenue.created_at), "month"), Date)
+        status = func.coalesce(Revenue.status, literal(_default(Revenue.__table__.c.status), literal_execute=True))
+        await db.execute(
+            insert(RevenueRollup).from_select(
+                ["month", "category", "status", "count", "amount"],
+                select(month, Revenue.category, status, func.count(), func.sum(Revenue.amount))
+                .group_by(month, Revenue.category, status),
+            )
+        )
+
+        # Rebuilt totals may differ from what ETags and cached bodies were built from
+        await version_service.bump(db, "payments", "revenue")
+        await db.commit()
+
+rollup_service = RollupService()
@@ -0,0 +1,128 @@
+import html
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import case, func, literal, or_
+from sqlalchemy.future import select
+
+from app.models.payment import Payment
+from app.models.procurement import Procurement
+from app.models.purchase_request import PurchaseRequest
+from app.models.revenue import Revenue
+from app.services.analytics_service import run_concurrently
+
+MIN_QUERY_LENGTH = 2
+
+# entity -> (model, searchable columns (first is the display title), extra columns returned)
+SEARCH_SOURCES: Dict[str, Tuple[Any, Dict[str, Any], Dict[str, Any]]] = {
+    "payments": (
+        Payment,
+        {"payee": Payment.payee, "payment_id": Payment.payment_id, "reference": Payment.reference},
+        {"status": Payment.status, "amount": Payment.amount},
+    ),
+    "revenue": (
+        Revenue,
+        {"source": Revenue.source, "revenue_id": Revenue.revenue_id},
+        {"status": Revenue.status, "amount": Revenue.amount},
+    ),
+    "purchase_requests": (
+        PurchaseRequest,
+        {"title": PurchaseRequest.title, "request_id": PurchaseRequest.request_id},
+        {"status": PurchaseRequest.status, "amount": PurchaseRequest.total_value},
+    ),
+    "procurement": (
+        Procurement,
+        {"title": Procurement.title, "tender_id": Procurement.tender_id},
+        {"status": Procurement.status, "amount": Procurement.estimated_value},
+    ),
+}
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def highlight(value: Optional[str], query: str, tag: str = "mark") -> Optional[str]:
+    """
+    HTML-escape `value` and wrap case-insensitive occurrences of the query's words
+
+    Returns None when no word occurs literally (e.g. a fuzzy-only match).
+    """
+    if not value:
+        return None
+    words = [re.escape(w) for w in query.split() if len(w) >= MIN_QUERY_LENGTH]
+    spans = [m.span() for word in words for m in re.finditer(word, value, re.IGNORECASE)]
+    if not spans:
+        return None
+    merged: List[List[int]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    parts, cursor = [], 0
+    for start, end in merged:
+        parts.append(html.escape(value[cursor:start]))
+        parts.append(f"<{tag}>{html.escape(value[start:end])}</{tag}>")
+        cursor = end
+    parts.append(html.escape(value[cursor:]))
+    return "".join(parts)
+
+class SearchService:
+    """Ranked substring/fuzzy search over the pg_trgm-indexed text columns"""
+
+    def build(self, entity: str, query: str, limit: int):
+        """
+        Top-`limit` rows of one entity type, best match first
+
+        A column matches on substring (ILIKE) or trigram word similarity
+        (the %> operator); both are served by the GIN trigram indexes. Substring
+        hits score 1.0, fuzzy hits their word_similarity.
+        """
+        model, fields, extras = SEARCH_SOURCES[entity]
+        pattern = f"%{escape_like(query)}%"
+        term = literal(query)
+        scores = [
+            case((column.ilike(pattern), 1.0), else_=func.word_similarity(term, column))
+            for column in fields.values()
+        ]
+        score = (func.greatest(*scores) if len(scores) > 1 else scores[0]).label("score")
+        return (
+            select(
+                model.id,
+                *[column.label(name) for name, column in fields.items()],
+                *[column.label(name) for name, column in extras.items()],
+                score,
+            )
+            .where(or_(*[or_(column.ilike(pattern), column.op("%>")(term)) for column in fields.values()]))
+            .order_by(score.desc(), model.id.desc())
+            .limit(limit)
+        )
+
+    def format(self, entity: str, rows, query: str) -> List[Dict[str, Any]]:
+        _, fields, _ = SEARCH_SOURCES[entity]
+        title_field = next(iter(fields))
+        results = []
+        for row in rows:
+            mapping = row._mapping
+            highlights = {name: highlight(mapping[name], query) for name in fields}
+            results.append({
+                "id": mapping["id"],
+                "title": mapping[title_field],
+                "status": mapping["status"],
+                "amount": float(mapping["amount"]) if mapping["amount"] is not None else None,
+                "score": round(float(mapping["score"]), 4),
+                "highlights": {name: h for name, h in highlights.items() if h},
+            })
+        return results
+
+    async def search(self, query: str, entities: Sequence[str], limit: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        """Search several entity types concurrently (one pooled connection each)"""
+        query = query.strip()
+        if len(query) < MIN_QUERY_LENGTH:
+            raise ValueError(f"Search query must be at least {MIN_QUERY_LENGTH} characters")
+        unknown = [e for e in entities if e not in SEARCH_SOURCES]
+        if unknown:
+            raise ValueError(f"Unsupported type(s): {', '.join(unknown)}. Available: {', '.join(SEARCH_SOURCES)}")
+        entities = list(dict.fromkeys(entities))
+        results = await run_concurrently(*[self.build(entity, query, limit) for entity in entities])
+        return {entity: self.format(entity, rows, query) for entity, rows in zip(entities, results)}
+
+search_service = SearchService()
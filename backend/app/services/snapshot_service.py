@@ -0,0 +1,344 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.db import engine
+from app.models.payment import Payment
+from app.models.procurement import Procurement
+from app.models.revenue import Revenue
+from app.services.analytics_service import bucket_range, resolve_range, to_utc
+
+logger = logging.getLogger(__name__)
+
+# Column kinds: "int" -> int64, "money" -> int64 minor units (cents),
+# "datetime" -> datetime64[s] UTC (NaT for NULL), "str" -> int32 codes + dictionary
+SNAPSHOT_TABLES: Dict[str, Tuple[Any, Dict[str, str]]] = {
+    "payments": (Payment, {
+        "id": "int", "status": "str", "method": "str", "payee": "str",
+        "amount": "money", "payment_date": "datetime", "created_at": "datetime",
+    }),
+    "revenues": (Revenue, {
+        "id": "int", "status": "str", "category": "str", "source": "str",
+        "amount": "money", "collected_date": "datetime", "created_at": "datetime",
+    }),
+    "procurements": (Procurement, {
+        "id": "int", "status": "str", "category": "str", "estimated_value": "money",
+        "bids_count": "int", "published_date": "datetime", "created_at": "datetime",
+    }),
+}
+
+CURRENT_POINTER = "CURRENT"
+MANIFEST = "manifest.json"
+# Arbitrary key so only one worker at a time rebuilds the shared snapshot
+BUILD_LOCK_ID = 0x52495A4F
+
+class _ColumnWriter:
+    """Accumulates one column chunk by chunk and encodes it as a fixed-width array"""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.chunks: List[np.ndarray] = []
+        self.dictionary: Dict[str, int] = {}
+
+    def extend(self, values: Sequence[Any]) -> None:
+        if self.kind == "int":
+            chunk = np.array([v if v is not None else 0 for v in values], dtype=np.int64)
+        elif self.kind == "money":
+            chunk = np.array([int(Decimal(v) * 100) if v is not None else 0 for v in values], dtype=np.int64)
+        elif self.kind == "datetime":
+            chunk = np.array([to_utc(v) if v is not None else None for v in values], dtype="datetime64[s]")
+        else:
+            codes = self.dictionary
+            chunk = np.array(
+                [codes.setdefault(v, len(codes)) if v is not None else -1 for v in values],
+                dtype=np.int32,
+            )
+        self.chunks.append(chunk)
+
+    def save(self, directory: Path, name: str) -> None:
+        empty = {"int": np.int64, "money": np.int64, "datetime": "datetime64[s]", "str": np.int32}[self.kind]
+        array = np.concatenate(self.chunks) if self.chunks else np.array([], dtype=empty)
+        np.save(directory / f"{name}.npy", array)
+        if self.kind == "str":
+            with open(directory / f"{name}.dict.json", "w") as f:
+                json.dump(list(self.dictionary), f)
+
+def _extend(writers: Dict[str, _ColumnWriter], columns: Dict[str, str], partition: Sequence[Any]) -> None:
+    for column, values in zip(columns, zip(*partition)):
+        writers[column].extend(values)
+
+class SnapshotTable:
+    """
+    Memory-mapped columns of one exported table
+
+    Every column is opened up front: a mapping stays valid once its build
+    directory is pruned, whereas a file opened later would be gone.
+    """
+
+    def __init__(self, directory: Path, columns: Dict[str, str], rows: int):
+        self.directory = directory
+        self.kinds = columns
+        self.rows = rows
+        # Zero-length files cannot be mapped
+        mode = "r" if rows else None
+        self._arrays: Dict[str, np.ndarray] = {
+            name: np.load(directory / f"{name}.npy", mmap_mode=mode) for name in columns
+        }
+        self._dictionaries: Dict[str, List[str]] = {}
+        for name, kind in columns.items():
+            if kind == "str":
+                with open(directory / f"{name}.dict.json") as f:
+                    self._dictionaries[name] = json.load(f)
+
+    def array(self, name: str) -> np.ndarray:
+        return self._arrays[name]
+
+    def dictionary(self, name: str) -> List[str]:
+        return self._dictionaries[name]
+
+    def mask(
+        self,
+        equals: Optional[Dict[str, Any]] = None,
+        date_column: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> np.ndarray:
+        """Boolean row mask for equality filters and a half-open date range"""
+        mask = np.ones(self.rows, dtype=bool)
+        for name, value in (equals or {}).items():
+            if self.kinds[name] == "str":
+                dictionary = self.dictionary(name)
+                if value not in dictionary:
+                    return np.zeros(self.rows, dtype=bool)
+                mask &= self.array(name) == dictionary.index(value)
+            else:
+                mask &= self.array(name) == value
+        if date_column and (start or end):
+            dates = self.array(date_column)
+            mask &= ~np.isnat(dates)
+            if start:
+                mask &= dates >= np.datetime64(to_utc(start), "s")
+            if end:
+                mask &= dates < np.datetime64(to_utc(end), "s")
+        return mask
+
+    def _values(self, name: Optional[str], mask: np.ndarray) -> np.ndarray:
+        if name is None:
+            return np.ones(int(mask.sum()))
+        values = np.asarray(self.array(name)[mask], dtype=np.float64)
+        return values / 100 if self.kinds[name] == "money" else values
+
+    def group_by(self, by: str, value: Optional[str] = None, mask: Optional[np.ndarray] = None) -> Dict[str, Dict[str, float]]:
+        """Count and sum of `value` per distinct value of the string column `by`"""
+        mask = np.ones(self.rows, dtype=bool) if mask is None else mask
+        codes = np.asarray(self.array(by)[mask])
+        values = self._values(value, mask)
+        valid = codes >= 0
+        dictionary = self.dictionary(by)
+        counts = np.bincount(codes[valid], minlength=len(dictionary))
+        sums = np.bincount(codes[valid], weights=values[valid], minlength=len(dictionary))
+        return {
+            dictionary[code]: {"count": int(counts[code]), "amount": float(sums[code])}
+            for code in np.flatnonzero(counts)
+        }
+
+class ColumnarSnapshot:
+    """A complete, immutable snapshot build loaded from disk"""
+
+    def __init__(self, directory: Path):
+        with open(directory / MANIFEST) as f:
+            manifest = json.load(f)
+        self.directory = directory
+        self.built_at = datetime.fromisoformat(manifest["built_at"])
+        self.tables = {
+            name: SnapshotTable(directory / name, spec["columns"], spec["rows"])
+            for name, spec in manifest["tables"].items()
+        }
+
+    @property
+    def age_seconds(self) -> float:
+        return (datetime.utcnow() - self.built_at).total_seconds()
+
+    def spending_by_period(
+        self,
+        granularity: str = "month",
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[datetime, float]]:
+        """Vectorized equivalent of AnalyticsService.spending_by_period"""
+        start, upper = resolve_range(granularity, start_date, end_date)
+        expected = bucket_range(start, upper - timedelta(microseconds=1), granularity)
+        payments = self.tables["payments"]
+        # PAYMENT_PERIOD_DATE: payment_date, falling back to created_at
+        payment_dates = np.asarray(payments.array("payment_date"))
+        period_dates = np.where(np.isnat(payment_dates), np.asarray(payments.array("created_at")), payment_dates)
+        mask = payments.mask({"status": "completed"})
+        mask &= ~np.isnat(period_dates)
+        mask &= (period_dates >= np.datetime64(to_utc(start), "s")) & (period_dates < np.datetime64(to_utc(upper), "s"))
+        dates = period_dates[mask]
+        amounts = payments._values("amount", mask)
+        buckets = bucket_starts(dates, granularity)
+        keys = np.array(expected, dtype="datetime64[s]")
+        totals = np.zeros(len(keys))
+        positions = np.searchsorted(keys, buckets)
+        in_range = (positions < len(keys)) & (keys[np.minimum(positions, len(keys) - 1)] == buckets)
+        np.add.at(totals, positions[in_range], amounts[in_range])
+        return list(zip(expected, totals.tolist()))
+
+    def top_vendors(self, limit: int, start: Optional[datetime] = None, end: Optional[datetime] = None, method: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Vectorized equivalent of AnalyticsService.top_vendors"""
+        payments = self.tables["payments"]
+        equals = {"status": "completed"}
+        if method:
+            equals["method"] = method
+        mask = payments.mask(equals, "payment_date", start, end)
+        mask &= payments.array("payee") >= 0
+        codes = np.asarray(payments.array("payee")[mask])
+        amounts = payments._values("amount", mask)
+        dates = np.asarray(payments.array("payment_date")[mask]).astype(np.int64)
+        dictionary = payments.dictionary("payee")
+        size = len(dictionary)
+        counts = np.bincount(codes, minlength=size)
+        totals = np.bincount(codes, weights=amounts, minlength=size)
+        last = np.full(size, np.iinfo(np.int64).min)
+        np.maximum.at(last, codes, dates)
+        present = np.flatnonzero(counts)
+        order = present[np.lexsort((np.array(dictionary, dtype=object)[present], -totals[present]))][:limit]
+        return [
+            {
+                "payee": dictionary[code],
+                "count": int(counts[code]),
+                "total": float(totals[code]),
+                "average": float(totals[code] / counts[code]),
+                "last_payment_date": (
+                    np.datetime64(int(last[code]), "s").astype(datetime)
+                    if last[code] != np.iinfo(np.int64).min else None
+                ),
+            }
+            for code in order
+        ]
+
+def bucket_starts(dates: np.ndarray, granularity: str) -> np.ndarray:
+    """Vectorized truncate(): bucket start (datetime64[s]) for each date"""
+    if granularity == "day":
+        return dates.astype("datetime64[D]").astype("datetime64[s]")
+    if granularity == "week":
+        days = dates.astype("datetime64[D]").astype(np.int64)
+        # 1970-01-01 was a Thursday; shift back to the preceding Monday
+        return (days - (days + 3) % 7).astype("datetime64[D]").astype("datetime64[s]")
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    if granularity == "quarter":
+        months = months - months % 3
+    return months.astype("datetime64[M]").astype("datetime64[s]")
+
+class SnapshotService:
+    """
+    Builds and serves columnar snapshots of payments, revenues and procurements.
+
+    Each build is written to a fresh directory and published by atomically
+    replacing the CURRENT pointer file, so readers never see a partial build.
+    Columns are loaded with mmap, so the OS page cache is shared between
+    worker processes.
+    """
+
+    def __init__(self, root: str = settings.SNAPSHOT_DIR):
+        self.root = Path(root)
+        self._loaded: Optional[ColumnarSnapshot] = None
+
+    async def build(self, chunk_size: int = 50_000) -> Optional[Path]:
+        """
+        Export all snapshot tables; returns the new build directory
+
+        Returns None when another worker is already building.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        async with engine.connect() as conn:
+            locked = await conn.scalar(text("SELECT pg_try_advisory_lock(:id)"), {"id": BUILD_LOCK_ID})
+            await conn.commit()
+            if not locked:
+                return None
+            try:
+                # One REPEATABLE READ transaction so all tables share a point in time
+                await conn.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"))
+                build_dir = self.root / f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+                manifest = {"built_at": datetime.utcnow().isoformat(), "tables": {}}
+                for name, (model, columns) in SNAPSHOT_TABLES.items():
+                    table_dir = build_dir / name
+                    table_dir.mkdir(parents=True)
+                    writers = {column: _ColumnWriter(kind) for column, kind in columns.items()}
+                    rows = 0
+                    statement = select(*[getattr(model, column) for column in columns])
+                    result = await conn.stream(statement.execution_options(yield_per=chunk_size))
+                    # Encoding and writing are CPU/disk bound: keep them off the event loop
+                    async for partition in result.partitions(chunk_size):
+                        await asyncio.to_thread(_extend, writers, columns, partition)
+                        rows += len(partition)
+                    for column, writer in writers.items():
+                        await asyncio.to_thread(writer.save, table_dir, column)
+                    manifest["tables"][name] = {"rows": rows, "columns": columns}
+                await conn.commit()
+            finally:
+                await conn.rollback()
+                await conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": BUILD_LOCK_ID})
+                await conn.commit()
+
+        with open(build_dir / MANIFEST, "w") as f:
+            json.dump(manifest, f)
+        await asyncio.to_thread(self._publish, build_dir)
+        return build_dir
+
+    def _publish(self, build_dir: Path) -> None:
+        pointer = self.root / CURRENT_POINTER
+        temp = self.root / f".{CURRENT_POINTER}.{uuid.uuid4().hex}"
+        temp.write_text(build_dir.name)
+        os.replace(temp, pointer)
+        # Other workers may have just read the old pointer and still be opening
+        # that build, so superseded builds are kept for a while rather than by count
+        cutoff = time.time() - settings.SNAPSHOT_RETENTION_SECONDS
+        for old in self.root.iterdir():
+            if old.is_dir() and old != build_dir and old.stat().st_mtime < cutoff:
+                shutil.rmtree(old, ignore_errors=True)
+
+    def current(self) -> Optional[ColumnarSnapshot]:
+        """The most recently published snapshot, or None if none exists"""
+        pointer = self.root / CURRENT_POINTER
+        try:
+            name = pointer.read_text().strip()
+        except FileNotFoundError:
+            return None
+        if self._loaded is None or self._loaded.directory.name != name:
+            self._loaded = ColumnarSnapshot(self.root / name)
+        return self._loaded
+
+    def get(self, max_staleness: Optional[float]) -> Optional[ColumnarSnapshot]:
+        """The current snapshot if the caller opted in and it is fresh enough"""
+        if max_staleness is None:
+            return None
+        snapshot = self.current()
+        if snapshot is None or snapshot.age_seconds > max_staleness:
+            return None
+        return snapshot
+
+    async def refresh_forever(self, interval: float) -> None:
+        """Rebuild every `interval` seconds (run as a background task)"""
+        while True:
+            started = time.monotonic()
+            try:
+                await self.build()
+            except Exception:
+                logger.exception("Snapshot build failed")
+            await asyncio.sleep(max(interval - (time.monotonic() - started), 1))
+
+snapshot_service = SnapshotService()
@@ -0,0 +1,179 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Sequence, Tuple
+from sqlalchemy import func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.payment import Payment
+from app.models.procurement import Procurement
+from app.models.purchase_request import PurchaseRequest
+from app.models.revenue import Revenue
+from app.services.analytics_service import bucket_label, to_utc, utc_bucket
+
+MODES = ("sets", "rollup", "cube")
+AGGREGATES = {"sum": func.sum, "avg": func.avg, "min": func.min, "max": func.max}
+MAX_DIMENSIONS = 4
+
+# entity -> (model, groupable dimensions, numeric columns usable in measures)
+SOURCES: Dict[str, Tuple[Any, Dict[str, Any], Dict[str, Any]]] = {
+    "payments": (
+        Payment,
+        {
+            "status": Payment.status,
+            "method": Payment.method,
+            "payee": Payment.payee,
+            "month": utc_bucket(Payment.payment_date, "month"),
+        },
+        {"amount": Payment.amount},
+    ),
+    "revenue": (
+        Revenue,
+        {
+            "status": Revenue.status,
+            "category": Revenue.category,
+            "source": Revenue.source,
+            "month": utc_bucket(Revenue.collected_date, "month"),
+        },
+        {"amount": Revenue.amount},
+    ),
+    "procurement": (
+        Procurement,
+        {
+            "status": Procurement.status,
+            "category": Procurement.category,
+            "month": utc_bucket(Procurement.published_date, "month"),
+        },
+        {"estimated_value": Procurement.estimated_value, "bids_count": Procurement.bids_count},
+    ),
+    "purchase_requests": (
+        PurchaseRequest,
+        {
+            "status": PurchaseRequest.status,
+            "department": PurchaseRequest.department,
+            "month": utc_bucket(PurchaseRequest.created_at, "month"),
+        },
+        {"total_value": PurchaseRequest.total_value},
+    ),
+}
+
+def grouping_sets(dimensions: Sequence[Any], mode: str) -> Any:
+    """
+    GROUP BY clause covering every breakdown in one scan
+
+    sets:   one grouping set per dimension plus the grand total
+    rollup: hierarchical subtotals in the order given
+    cube:   every combination of dimensions
+    """
+    if mode == "rollup":
+        return func.rollup(*dimensions)
+    if mode == "cube":
+        return func.cube(*dimensions)
+    return func.grouping_sets(*dimensions, tuple_())
+
+def grouped_dimensions(mask: int, names: Sequence[str]) -> List[str]:
+    """Decode a Postgres GROUPING() bit mask (leftmost argument = highest bit, 1 = not grouped)"""
+    count = len(names)
+    return [name for i, name in enumerate(names) if not (mask >> (count - 1 - i)) & 1]
+
+def parse_measure(spec: str, columns: Dict[str, Any]) -> Tuple[str, Any]:
+    """Turn 'count' or '<agg>:<column>' into (output name, SQL expression)"""
+    if spec == "count":
+        return "count", func.count()
+    aggregate, _, column = spec.partition(":")
+    if aggregate not in AGGREGATES or column not in columns:
+        raise ValueError(
+            f"Invalid measure '{spec}'. Use 'count' or one of "
+            f"{', '.join(sorted(AGGREGATES))} with a column from: {', '.join(columns)}"
+        )
+    return f"{aggregate}_{column}", AGGREGATES[aggregate](columns[column])
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return bucket_label(to_utc(value), "month")
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+class SummaryService:
+    """Multi-dimensional breakdowns computed with one GROUPING SETS query"""
+
+    def build(
+        self,
+        entity: str,
+        dimensions: Sequence[str],
+        measures: Sequence[str] = ("count",),
+        mode: str = "sets",
+    ):
+        """
+        Build the summary statement for an entity
+
+        Returns:
+            (statement, dimension names, measure names)
+        """
+        if entity not in SOURCES:
+            raise ValueError(f"Unsupported entity: {entity}")
+        if mode not in MODES:
+            raise ValueError(f"Unsupported mode: {mode}")
+        _, available, columns = SOURCES[entity]
+
+        dimensions = list(dict.fromkeys(dimensions))
+        if not dimensions:
+            raise ValueError("At least one dimension is required")
+        if len(dimensions) > MAX_DIMENSIONS:
+            raise ValueError(f"At most {MAX_DIMENSIONS} dimensions are allowed")
+        unknown = [d for d in dimensions if d not in available]
+        if unknown:
+            raise ValueError(
+                f"Unsupported dimension(s) for {entity}: {', '.join(unknown)}. "
+                f"Available: {', '.join(available)}"
+            )
+
+        parsed = [parse_measure(spec, columns) for spec in dict.fromkeys(measures or ["count"])]
+        expressions = [available[d] for d in dimensions]
+        statement = (
+            select(
+                *[expr.label(f"dim_{name}") for name, expr in zip(dimensions, expressions)],
+                func.grouping(*expressions).label("grouping_mask"),
+                *[expr.label(name) for name, expr in parsed],
+            )
+            .group_by(grouping_sets(expressions, mode))
+        )
+        return statement, dimensions, [name for name, _ in parsed]
+
+    def format(self, rows, dimensions: Sequence[str], measures: Sequence[str]) -> Dict[str, Any]:
+        """
+        Split result rows by grouping set
+
+        Returns:
+            {"total": {measures}, "groups": {"status": [...], "status,method": [...]}}
+        """
+        total: Dict[str, Any] = {}
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            mapping = row._mapping
+            grouped = grouped_dimensions(mapping["grouping_mask"], dimensions)
+            values = {name: _json_value(mapping[name]) for name in measures}
+            if not grouped:
+                total = values
+                continue
+            entry = {name: _json_value(mapping[f"dim_{name}"]) for name in grouped}
+            entry.update(values)
+            groups.setdefault(",".join(grouped), []).append(entry)
+        return {"total": total, "groups": groups}
+
+    async def summarize(
+        self,
+        db: AsyncSession,
+        entity: str,
+        dimensions: Sequence[str],
+        measures: Sequence[str] = ("count",),
+        mode: str = "sets",
+    ) -> Dict[str, Any]:
+        statement, dimensions, measure_names = self.build(entity, dimensions, measures, mode)
+        result = await db.execute(statement)
+        summary = self.format(result.all(), dimensions, measure_names)
+        summary.update({"entity": entity, "dimensions": dimensions, "measures": measure_names, "mode": mode})
+        return summary
+
+summary_service = SummaryService()
@@ -0,0 +1,49 @@
+from typing import Any, Dict, Optional, Sequence
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+
+from app.models.data_version import DataVersion
+
+class VersionService:
+    """
+    Monotonic version counters for datasets (payments, revenue, procurement, ...)
+
+    Writers bump the counter inside their own transaction, so a reader that sees
+    an unchanged version is guaranteed that the underlying rows are unchanged.
+    """
+
+    async def bump(self, db: AsyncSession, *names: str) -> None:
+        """Increment the given counters; call before the write is committed"""
+        for name in sorted(set(names)):
+            statement = insert(DataVersion).values(name=name, version=1)
+            await db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[DataVersion.name],
+                    set_={"version": DataVersion.version + 1, "updated_at": func.now()},
+                )
+            )
+
+    async def get(self, db: AsyncSession, names: Sequence[str]) -> Dict[str, int]:
+        """Current counters for the given datasets (0 if never written)"""
+        result = await db.execute(
+            select(DataVersion.name, DataVersion.version).where(DataVersion.name.in_(list(names)))
+        )
+        versions = dict(result.all())
+        return {name: versions.get(name, 0) for name in names}
+
+    async def row_version(self, db: AsyncSession, model: Any, row_id: int) -> Optional[str]:
+        """
+        Last modification time of a single row, or None if it does not exist
+
+        Reads only the timestamp columns so detail endpoints can answer a
+        conditional request without loading the full row.
+        """
+        result = await db.execute(
+            select(func.coalesce(model.updated_at, model.created_at)).where(model.id == row_id)
+        )
+        row = result.first()
+        return None if row is None else str(row[0])
+
+version_service = VersionService()
@@ -0,0 +1,19 @@
+import asyncio
+import sys
+import os
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.snapshot_service import snapshot_service
+
+async def build():
+    print("Building columnar analytics snapshot...")
+    build_dir = await snapshot_service.build()
+    if build_dir is None:
+        print("Another process is already building a snapshot")
+        return
+    print(f"Snapshot published: {build_dir}")
+
+if __name__ == "__main__":
+    asyncio.run(build())
@@ -0,0 +1,18 @@
+import asyncio
+import sys
+import os
+
+# Add parent directory to path to import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import AsyncSessionLocal
+from app.services.rollup_service import rollup_service
+
+async def rebuild():
+    print("Rebuilding payment and revenue rollups...")
+    async with AsyncSessionLocal() as session:
+        await rollup_service.rebuild(session)
+    print("Rollups rebuilt successfully")
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
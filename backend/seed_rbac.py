@@ -5,16 +5,13 @@ import os
 # Add parent directory to path to import app
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.db import AsyncSessionLocal, engine, Base
+from app.db import AsyncSessionLocal
 from app.models.role import Role
 from app.models.permission import Permission
+from app.services.version_service import version_service
 from sqlalchemy.future import select
 
 async def seed():
-    print("Creating tables...")
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
     print("Seeding RBAC data...")
     async with AsyncSessionLocal() as session:
         # Create permissions
@@ -85,6 +82,8 @@ async def seed():
                 
                 session.add(role)
         
+        # Make running workers reload their permission matrix
+        await version_service.bump(session, "roles")
         await session.commit()
         print("RBAC seeded successfully")
 
@@ -0,0 +1,26 @@
+from datetime import datetime
+import pytest
+from app.services.analytics_service import bucket_range, bucket_label, resolve_range, truncate
+
+def test_truncate_granularities():
+    value = datetime(2024, 5, 15, 13, 45)
+    assert truncate(value, "day") == datetime(2024, 5, 15)
+    assert truncate(value, "week") == datetime(2024, 5, 13)
+    assert truncate(value, "month") == datetime(2024, 5, 1)
+    assert truncate(value, "quarter") == datetime(2024, 4, 1)
+
+def test_month_buckets_use_calendar_months():
+    buckets = bucket_range(datetime(2023, 11, 30), datetime(2024, 2, 1), "month")
+    assert [bucket_label(b, "month") for b in buckets] == ["2023-11", "2023-12", "2024-01", "2024-02"]
+
+def test_resolve_range_defaults_to_twelve_buckets():
+    start, upper = resolve_range("month", None, datetime(2024, 3, 10))
+    assert start == datetime(2023, 4, 1)
+    assert upper == datetime(2024, 4, 1)
+
+def test_resolve_range_rejects_inverted_range():
+    with pytest.raises(ValueError):
+        resolve_range("day", datetime(2024, 3, 10), datetime(2024, 3, 1))
+
+def test_quarter_label():
+    assert bucket_label(datetime(2024, 7, 1), "quarter") == "2024-Q3"
@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.schemas.batch import BatchCreateRequest, BatchRequest
+from app.schemas.payment import PaymentCreate, PaymentUpdate
+from app.services.batch_service import BatchError, batch_service
+
+PaymentBatch = BatchRequest[PaymentCreate, PaymentUpdate]
+ITEM = {"payee": "Acme", "reference": "INV-1", "method": "check", "amount": "10.00"}
+
+class Savepoint:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeSession:
+    def begin_nested(self):
+        return Savepoint()
+
+async def insert_rejecting(items):
+    """Stands in for a multi-row INSERT: fails if any item is bad"""
+    if any(item.get("bad") for item in items):
+        raise DBAPIError("INSERT", {}, Exception("check constraint violated"))
+    return [SimpleNamespace(**item) for item in items]
+
+def test_batch_size_is_bounded():
+    with pytest.raises(ValidationError):
+        PaymentBatch(create=[])
+    with pytest.raises(ValidationError):
+        PaymentBatch(create=[ITEM] * (settings.BATCH_MAX_ITEMS + 1))
+    batch = PaymentBatch(mode="best_effort", create=[ITEM], update=[{"id": 3, "changes": {"status": "completed"}}])
+    assert batch.update[0].changes.model_dump(exclude_unset=True) == {"status": "completed"}
+
+def test_payment_batches_cannot_update():
+    # Payments change only through /process, which checks and records who processed them
+    batch = BatchCreateRequest[PaymentCreate](create=[ITEM])
+    assert batch.update == ()
+    with pytest.raises(ValidationError):
+        BatchCreateRequest[PaymentCreate](create=[ITEM], update=[{"id": 3, "changes": {"status": "completed"}}])
+    with pytest.raises(ValidationError):
+        BatchCreateRequest[PaymentCreate](create=[])
+
+async def test_best_effort_retries_items_one_by_one_after_a_failure():
+    items = [{"n": 0}, {"n": 1, "bad": True}, {"n": 2}]
+    rows, errors = await batch_service._run(FakeSession(), True, insert_rejecting, items)
+    assert [row.n for row in rows] == [0, 2]
+    assert errors == {1: "check constraint violated"}
+
+async def test_all_or_nothing_aborts_on_first_failure():
+    with pytest.raises(BatchError):
+        await batch_service._run(FakeSession(), False, insert_rejecting, [{"bad": True}, {}])
+
+def test_rolled_back_report_keeps_item_errors():
+    batch = PaymentBatch(create=[ITEM, ITEM])
+    results = {("create", 1): {"op": "create", "index": 1, "status": "error", "error": "boom"}}
+    report = batch_service._rolled_back(batch, results, "Invalid items")
+    assert report["committed"] is False and report["created"] == 0
+    assert [r["status"] for r in report["results"]] == ["rolled_back", "error"]
@@ -0,0 +1,28 @@
+import time
+from app.core.cache import TTLCache
+
+def test_hit_and_miss_counters():
+    cache = TTLCache(ttl=60)
+    assert cache.get("dashboard") is None
+    cache.set("dashboard", {"active_tenders": 3})
+    assert cache.get("dashboard") == {"active_tenders": 3}
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+def test_entries_expire(monkeypatch):
+    cache = TTLCache(ttl=10)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.set("key", "value")
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert cache.get("key") is None
+    assert cache.stats()["size"] == 0
+
+def test_clear_invalidates_everything():
+    cache = TTLCache(ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.clear()
+    assert cache.get("a") is None and cache.get("b") is None
@@ -0,0 +1,82 @@
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+from openpyxl import load_workbook
+from sqlalchemy.dialects import postgresql
+
+from app.services.export_service import export_service
+
+class FakeStreamResult:
+    def __init__(self, batches):
+        self.batches = batches
+
+    async def partitions(self):
+        for batch in self.batches:
+            yield batch
+
+class FakeSession:
+    def __init__(self, batches):
+        self.batches = batches
+        self.statements = []
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    async def stream(self, statement):
+        self.statements.append(statement)
+        return FakeStreamResult(self.batches)
+
+def test_export_selects_only_exported_columns():
+    sql = str(export_service.statement("payments").compile(dialect=postgresql.dialect()))
+    assert sql.startswith("SELECT payments.id, payments.amount, payments.payee, payments.status")
+    assert "payments.notes" not in sql and sql.endswith("ORDER BY payments.id")
+
+async def test_csv_is_streamed_one_chunk_per_cursor_batch():
+    paid = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    session = FakeSession([
+        [(1, Decimal("10.50"), "Acme, Ltd", "completed", paid, "check")],
+        [(2, Decimal("3.00"), "Globex", "pending_approval", None, "bank_transfer")],
+    ])
+    chunks = [chunk async for chunk in export_service.stream_csv(lambda: session, "payments")]
+    assert len(chunks) == 2
+    assert b"".join(chunks).decode().splitlines() == [
+        "id,amount,vendor,status,date,method",
+        '1,10.50,"Acme, Ltd",completed,2024-03-01 00:00:00+00:00,check',
+        "2,3.00,Globex,pending_approval,,bank_transfer",
+    ]
+    assert session.statements[0].get_execution_options()["yield_per"] > 0
+    assert session.closed
+
+async def test_empty_export_still_has_a_header():
+    chunks = [chunk async for chunk in export_service.stream_csv(lambda: FakeSession([]), "procurement")]
+    assert chunks == [b"id,title,status,budget,deadline\r\n"]
+
+async def test_xlsx_has_a_sheet_per_module_with_typed_cells():
+    detected = datetime(2024, 3, 1, 9, 30, tzinfo=timezone.utc)
+    sessions = {
+        "payments": [[(1, Decimal("1234.50"), "Acme", "completed", detected, "check")]],
+        "fraud_alerts": [[(7, 1, "high", "Duplicate invoice", False, detected.replace(tzinfo=None))]],
+    }
+
+    class MultiSession(FakeSession):
+        async def stream(self, statement):
+            table = statement.get_final_froms()[0].name
+            return FakeStreamResult(sessions["fraud_alerts" if table == "fraud_alerts" else "payments"])
+
+    file = await export_service.build_xlsx(lambda: MultiSession([]), ["payments", "fraud_alerts"])
+    content = b"".join([chunk async for chunk in export_service.iter_file(file)])
+    assert file.closed
+
+    workbook = load_workbook(io.BytesIO(content))
+    assert workbook.sheetnames == ["payments", "fraud_alerts"]
+    payments = workbook["payments"]
+    assert [c.value for c in payments[1]] == ["id", "amount", "vendor", "status", "date", "method"]
+    amount, paid = payments["B2"], payments["E2"]
+    assert amount.value == 1234.5
+    assert amount.number_format == "#,##0.00"
+    assert paid.value == datetime(2024, 3, 1, 9, 30) and paid.is_date
+    assert workbook["fraud_alerts"]["D2"].value == "Duplicate invoice"
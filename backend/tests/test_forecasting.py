@@ -0,0 +1,40 @@
+import numpy as np
+from app.services.forecasting import ForecastingService, fit_holt_winters, forecast
+
+def _seasonal_series(n_obs):
+    t = np.arange(n_obs)
+    return 100 + 2 * t + 10 * np.sin(2 * np.pi * t / 12)
+
+def test_recovers_trend_and_seasonality():
+    fit = fit_holt_winters(np.vstack([_seasonal_series(36)]))
+    assert fit.method == "holt_winters"
+    expected = _seasonal_series(48)[36:]
+    result = forecast(fit, 12)
+    assert np.allclose(result.mean[0], expected, atol=1e-6)
+
+def test_batched_series_are_fitted_independently():
+    y = np.vstack([_seasonal_series(36), np.full(36, 50.0)])
+    result = forecast(fit_holt_winters(y), 6)
+    assert result.mean.shape == (2, 6)
+    assert np.allclose(result.mean[1], 50.0)
+
+def test_short_history_falls_back_to_holt():
+    fit = fit_holt_winters(np.vstack([100 + 3 * np.arange(12.0)]))
+    assert fit.method == "holt"
+    assert np.allclose(forecast(fit, 3).mean[0], [136, 139, 142])
+
+def test_intervals_widen_with_horizon():
+    rng = np.random.default_rng(0)
+    y = np.vstack([_seasonal_series(48) + rng.normal(0, 5, 48)])
+    result = forecast(fit_holt_winters(y), 12, confidence=0.9)
+    width = result.upper[0] - result.lower[0]
+    assert np.all(result.lower[0] < result.mean[0])
+    assert np.all(np.diff(width) >= 0)
+
+def test_fits_are_cached_until_data_changes():
+    service = ForecastingService()
+    y = np.vstack([_seasonal_series(30)])
+    first = service.fit(y)
+    assert service.fit(y.copy()) is first
+    y[0, -1] += 1
+    assert service.fit(y) is not first
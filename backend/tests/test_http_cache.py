@@ -0,0 +1,53 @@
+from fastapi import Response
+from starlette.requests import Request
+from app.api.v1.endpoints import payments
+from app.core.cache import analytics_cache
+from app.core.http_cache import make_etag, not_modified
+
+def make_request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+def test_etag_changes_with_version():
+    assert make_etag("payments", {"payments": 1}) == make_etag("payments", {"payments": 1})
+    assert make_etag("payments", {"payments": 1}) != make_etag("payments", {"payments": 2})
+
+def test_matching_etag_returns_304_with_headers():
+    etag = make_etag("dashboard", 7)
+    cached = not_modified(make_request(f'"other", {etag}'), Response(), etag)
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert "must-revalidate" in cached.headers["Cache-Control"]
+
+def test_weak_comparison_and_mismatch():
+    etag = make_etag("dashboard", 7)
+    assert not_modified(make_request(etag.removeprefix("W/")), Response(), etag) is not None
+
+    response = Response()
+    assert not_modified(make_request(make_etag("dashboard", 8)), response, etag) is None
+    assert response.headers["ETag"] == etag
+    assert not_modified(make_request(), Response(), etag) is None
+
+async def test_cached_stats_body_is_tied_to_the_versions_it_was_built_from(monkeypatch):
+    versions = {"payments": 1}
+
+    async def get_versions(db, names):
+        return dict(versions)
+
+    class FakeSession:
+        async def execute(self, statement):
+            return FakeResult()
+
+    class FakeResult:
+        def first(self):
+            return (versions["payments"], 10, 0, 0, 0, 0)
+
+    monkeypatch.setattr(payments.version_service, "get", get_versions)
+    analytics_cache.clear()
+    request = Request({"type": "http", "method": "GET", "path": "/stats", "headers": []})
+    first = await payments.get_payment_stats(request, Response(), FakeSession())
+    # A write handled by another worker bumps the version without clearing this cache
+    versions["payments"] = 2
+    second = await payments.get_payment_stats(request, Response(), FakeSession())
+    assert first["pending"]["count"] == 1 and second["pending"]["count"] == 2
+    analytics_cache.clear()
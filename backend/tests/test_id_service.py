@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+import pytest
+from app.services.id_service import IdService, sequence_name
+
+class FakeConnection:
+    def __init__(self, increment):
+        self.increment = increment
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        return SimpleNamespace(scalar=lambda: self.increment)
+
+class FakeBind:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def begin(self):
+        conn = self.conn
+
+        class Transaction:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Transaction()
+
+class FakeSequenceSession:
+    """Emulates nextval() on a sequence created with INCREMENT BY `increment`"""
+
+    def __init__(self, increment, start=1000):
+        self.increment = increment
+        self.value = start - increment
+        self.conn = FakeConnection(increment)
+        self.bind = FakeBind(self.conn)
+        self.nextval_calls = 0
+
+    async def execute(self, statement, params):
+        self.nextval_calls += 1
+        values = []
+        for _ in range(params["blocks"]):
+            self.value += self.increment
+            values.append(self.value)
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: values))
+
+async def test_ids_are_served_from_blocks():
+    db = FakeSequenceSession(increment=3)
+    service = IdService(block_size=3)
+    ids = [await service.next_id(db, "PAY", 2024) for _ in range(7)]
+    assert ids[:4] == ["PAY-2024-1000", "PAY-2024-1001", "PAY-2024-1002", "PAY-2024-1003"]
+    assert len(set(ids)) == 7
+    assert db.nextval_calls == 3
+    # The sequence is created once per process and year
+    assert sum("CREATE SEQUENCE IF NOT EXISTS business_id_pay_2024" in s for s in db.conn.statements) == 1
+
+async def test_reserve_claims_whole_blocks_without_touching_the_current_one():
+    db = FakeSequenceSession(increment=5)
+    service = IdService(block_size=5)
+    first = await service.next_id(db, "REV", 2024)
+    reserved = await service.reserve(db, "REV", 7, 2024)
+    assert first == "REV-2024-1000"
+    assert reserved == [f"REV-2024-{n}" for n in range(1005, 1012)]
+    assert await service.next_id(db, "REV", 2024) == "REV-2024-1001"
+
+def test_unknown_prefix_is_rejected():
+    with pytest.raises(ValueError):
+        sequence_name("DROP TABLE", 2024)
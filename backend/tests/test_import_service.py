@@ -0,0 +1,128 @@
+import io
+from decimal import Decimal
+from types import SimpleNamespace
+import asyncpg
+import pytest
+from openpyxl import Workbook
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.models.payment import Payment
+from app.services.import_service import (
+    IMPORT_SOURCES, ImportReport, import_service, iter_csv, iter_xlsx, read_chunk, validate_chunk,
+)
+from app.services.id_service import id_service
+from app.services.rollup_service import rollup_service
+
+CSV = "\ufeffpayee,reference,method,amount,payment_date\nAcme,INV-1,bank_transfer,150.00,2024-03-01T10:00:00\nGlobex,INV-2,check,not-a-number,\n"
+
+def test_csv_rows_are_validated_with_line_numbers():
+    rows = iter_csv(io.BytesIO(CSV.encode()))
+    chunk = read_chunk(rows, 10, first_line=2)
+    valid, errors = validate_chunk(IMPORT_SOURCES["payments"].schema, chunk)
+    assert [p.payee for p in valid] == ["Acme"]
+    assert valid[0].amount == Decimal("150.00")
+    assert errors == [{"row": 3, "errors": [{"field": "amount", "message": errors[0]["errors"][0]["message"]}]}]
+
+def test_xlsx_rows_stream_from_first_sheet():
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["title", "department", "total_value", None])
+    sheet.append(["Laptops", "IT", 2500, "ignored"])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    [(line, row)] = read_chunk(iter_xlsx(buffer), 10, first_line=2)
+    valid, errors = validate_chunk(IMPORT_SOURCES["purchase_requests"].schema, [(line, row)])
+    assert not errors and valid[0].total_value == Decimal(2500)
+
+def test_records_fill_ids_defaults_and_user_columns():
+    source = IMPORT_SOURCES["purchase_requests"]
+    model = source.schema(title="Chairs", department="Admin", total_value=Decimal("99.50"))
+    [record] = import_service.records(source, [model], ["PR-2024-1000"], SimpleNamespace(id=7))
+    assert dict(zip(source.columns, record)) == {
+        "request_id": "PR-2024-1000",
+        "title": "Chairs",
+        "department": "Admin",
+        "description": None,
+        "total_value": Decimal("99.50"),
+        "requester_id": 7,
+        "status": "pending_approval",
+    }
+
+def test_report_caps_listed_errors():
+    report = ImportReport("payments")
+    report.add_errors([{"row": n, "errors": []} for n in range(settings.IMPORT_MAX_REPORTED_ERRORS + 5)])
+    result = report.as_dict()
+    assert result["failed"] == settings.IMPORT_MAX_REPORTED_ERRORS + 5
+    assert len(result["errors"]) == settings.IMPORT_MAX_REPORTED_ERRORS and result["errors_truncated"]
+
+async def test_bulk_rollup_update_is_one_grouped_upsert():
+    statements = []
+
+    class FakeSession:
+        async def execute(self, statement):
+            statements.append(statement)
+
+    staging = import_service.staging_table(IMPORT_SOURCES["payments"])
+    await rollup_service.record_bulk_insert(FakeSession(), Payment, staging)
+    sql = str(statements[0].compile(dialect=postgresql.dialect()))
+    assert "INSERT INTO payment_rollups" in sql and "FROM import_payments GROUP BY" in sql
+    assert "ON CONFLICT (month, method, status, payee) DO UPDATE" in sql
+
+class FakeCopyConnection:
+    """asyncpg stand-in whose COPY rejects the first chunk with `error`"""
+
+    def __init__(self, error):
+        self.error = error
+        self.copies = []
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copies.append(records)
+        if len(self.copies) == 1:
+            raise self.error
+
+class FakeImportSession:
+    def __init__(self, error):
+        self.driver = FakeCopyConnection(error)
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, statement, params=None):
+        return SimpleNamespace(rowcount=len(self.driver.copies[-1]) if self.driver.copies else 0)
+
+    async def connection(self):
+        driver = self.driver
+
+        class Connection:
+            async def get_raw_connection(self):
+                return SimpleNamespace(driver_connection=driver)
+
+        return Connection()
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+@pytest.mark.parametrize("error", [
+    # Rejected by the server
+    asyncpg.exceptions.NumericValueOutOfRangeError("numeric field overflow"),
+    # Rejected while asyncpg encodes the record, before anything is sent
+    asyncpg.exceptions._base.DataError("invalid input for query argument $5: numeric field overflow"),
+])
+async def test_chunk_rejected_by_copy_is_reported_and_import_continues(monkeypatch, error):
+    async def reserve(db, prefix, count):
+        return [f"{prefix}-2024-{1000 + n}" for n in range(count)]
+
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 2)
+    monkeypatch.setattr(id_service, "reserve", reserve)
+    rows = "".join(f"Acme,INV-{n},check,{amount}\n" for n, amount in enumerate(["1e20", "5.00", "7.00"]))
+    db = FakeImportSession(error)
+    report = await import_service.run(
+        db, "payments", io.BytesIO(("payee,reference,method,amount\n" + rows).encode()), "csv", SimpleNamespace(id=1)
+    )
+    assert report["total_rows"] == 3 and report["imported"] == 1 and report["failed"] == 2
+    assert report["errors"] == [{"rows": "2-3", "errors": [{"field": None, "message": str(error)}]}]
+    assert db.rollbacks == 1 and db.commits == 1
@@ -0,0 +1,102 @@
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_COUNT_KIND_HEADER, Explain, count_cache, count_total,
+    decode_cursor, encode_cursor, paginate,
+)
+from app.models.attachment import Attachment
+from app.models.audit_log import AuditLog
+from app.models.fraud_alert import FraudAlert
+from app.models.notification import Notification
+from app.models.payment import Payment
+from app.models.procurement import Procurement
+from app.models.purchase_request import PurchaseRequest
+from app.models.revenue import Revenue
+
+class FakeSession:
+    """Answers count/estimate queries with `scalar` and page queries with `rows`"""
+
+    def __init__(self, rows, scalar=0):
+        self.rows = rows
+        self.scalar = scalar
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        return SimpleNamespace(
+            scalars=lambda: SimpleNamespace(all=lambda: self.rows),
+            scalar=lambda: self.scalar,
+        )
+
+@pytest.fixture(autouse=True)
+def clear_count_cache():
+    count_cache.clear()
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+def test_cursor_round_trip():
+    ts = datetime(2024, 3, 1, 12, 30)
+    cursor = encode_cursor(ts, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (ts, 42)
+
+def test_invalid_cursor_raises():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+async def test_full_page_sets_next_cursor_from_last_row():
+    rows = [SimpleNamespace(id=i, created_at=datetime(2024, 1, i)) for i in (3, 2, 1)]
+    db, response = FakeSession(rows), Response()
+    page = await paginate(db, select(Payment), Payment.created_at, Payment.id, response, limit=2)
+    assert [r.id for r in page] == [3, 2]
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == (datetime(2024, 1, 2), 2)
+    assert "LIMIT" in _sql(db.statements[-1])
+
+async def test_cursor_uses_keyset_instead_of_offset():
+    db, response = FakeSession([]), Response()
+    cursor = encode_cursor(datetime(2024, 1, 2), 2)
+    assert await paginate(db, select(Payment), Payment.created_at, Payment.id, response, cursor, skip=50) == []
+    sql = _sql(db.statements[-1])
+    assert "(payments.created_at, payments.id) <" in sql and "OFFSET" not in sql
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+async def test_bad_cursor_is_a_400():
+    with pytest.raises(HTTPException) as exc:
+        await paginate(FakeSession([]), select(Payment), Payment.created_at, Payment.id, Response(), "!!")
+    assert exc.value.status_code == 400
+
+async def test_small_unfiltered_table_is_counted_exactly():
+    db, response = FakeSession([], scalar=7), Response()
+    await paginate(db, select(Payment), Payment.created_at, Payment.id, response)
+    assert response.headers[TOTAL_COUNT_HEADER] == "7"
+    assert response.headers[TOTAL_COUNT_KIND_HEADER] == "exact"
+    assert "count(*)" in _sql(db.statements[1])
+
+async def test_large_filtered_query_uses_plan_estimate_and_is_cached():
+    plan = '[{"Plan": {"Plan Rows": %d}}]' % (settings.COUNT_EXACT_THRESHOLD * 3)
+    db = FakeSession([], scalar=plan)
+    query = select(Payment).where(Payment.status == "completed")
+    assert await count_total(db, query) == (settings.COUNT_EXACT_THRESHOLD * 3, "estimate")
+    assert isinstance(db.statements[0], Explain)
+    assert _sql(db.statements[0]).startswith("EXPLAIN (FORMAT JSON) SELECT")
+
+    assert await count_total(db, query) == (settings.COUNT_EXACT_THRESHOLD * 3, "estimate")
+    assert len(db.statements) == 1
+    await count_total(db, select(Payment).where(Payment.status == "failed"))
+    assert len(db.statements) > 1
+
+@pytest.mark.parametrize("column", [
+    Payment.created_at, Revenue.created_at, Procurement.created_at, PurchaseRequest.created_at,
+    AuditLog.created_at, Notification.created_at, Attachment.uploaded_at, FraudAlert.detected_at,
+])
+def test_keyset_order_columns_cannot_be_null(column):
+    # A NULL would fail encode_cursor and never satisfy (column, id) < cursor
+    assert not column.nullable
+    assert column.server_default is not None
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+from app.core import permissions
+from app.core.config import settings
+from app.core.permissions import PermissionMatrix, PermissionMatrixCache
+
+ROWS = [
+    ("admin", "payments", "read"),
+    ("admin", "payments", "create"),
+    ("analyst", "payments", "read"),
+    ("customer", None, None),
+]
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return SimpleNamespace(all=lambda: self.rows)
+
+def test_matrix_lookups():
+    matrix = PermissionMatrix.from_rows(ROWS, version=1)
+    assert matrix.allows("admin", "payments", "create") is True
+    assert matrix.allows("analyst", "payments", "create") is False
+    assert matrix.allows("customer", "payments", "read") is False
+    assert matrix.allows("ghost", "payments", "read") is None
+
+async def test_cache_reloads_only_when_version_changes(monkeypatch):
+    version = {"roles": 1}
+
+    async def fake_get(db, names):
+        return dict(version)
+
+    monkeypatch.setattr(permissions.version_service, "get", fake_get)
+    monkeypatch.setattr(settings, "ROLE_VERSION_CHECK_SECONDS", 0)
+    cache = PermissionMatrixCache()
+    db = FakeSession(ROWS)
+
+    await cache.get(db)
+    await cache.get(db)
+    assert db.queries == 1
+
+    version["roles"] = 2
+    db.rows = ROWS + [("analyst", "payments", "create")]
+    matrix = await cache.get(db)
+    assert db.queries == 2
+    assert matrix.allows("analyst", "payments", "create")
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+from app.core.pool_metrics import Histogram, InstrumentedAsyncQueuePool, pool_stats
+
+class FakeConnection:
+    def close(self):
+        pass
+
+def test_histogram_is_cumulative():
+    histogram = Histogram((1, 10))
+    for value in (0.5, 5, 5, 50):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"1": 1, "10": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+
+async def test_pool_records_waits_overflow_and_timeouts():
+    pool = InstrumentedAsyncQueuePool(FakeConnection, pool_size=1, max_overflow=1, timeout=0.05, logging_name="exhausted")
+    metrics = pool.metrics
+    before_waits = metrics.wait_ms.count
+    before_overflow = metrics.overflow_events
+    before_timeouts = metrics.timeouts
+
+    def exhaust_pool():
+        first = pool.connect()
+        second = pool.connect()  # beyond pool_size -> overflow
+        with pytest.raises(exc.TimeoutError):
+            pool.connect()
+        stats = pool_stats(pool)
+        first.close()
+        second.close()
+        return stats
+
+    # The asyncio queue pool must be driven from SQLAlchemy's greenlet bridge
+    stats = await greenlet_spawn(exhaust_pool)
+    assert stats["checked_out"] == 2
+    assert stats["overflow"] == 1
+    assert metrics.overflow_events == before_overflow + 1
+    assert metrics.timeouts == before_timeouts + 1
+    assert metrics.wait_ms.count == before_waits + 3
+
+def test_metrics_are_per_pool_and_survive_recreate():
+    primary = InstrumentedAsyncQueuePool(FakeConnection, logging_name="primary_test")
+    replica = InstrumentedAsyncQueuePool(FakeConnection, logging_name="replica_test")
+    primary.metrics.timeouts += 1
+    assert replica.metrics.timeouts == 0
+    assert primary.recreate().metrics is primary.metrics
+    assert pool_stats(replica)["timeouts"] == 0 and pool_stats(primary)["timeouts"] == 1
@@ -0,0 +1,37 @@
+import asyncio
+import pytest
+from app.services import analytics_service as module
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+class FakeConnection:
+    active = 0
+    peak = 0
+
+    async def __aenter__(self):
+        FakeConnection.active += 1
+        FakeConnection.peak = max(FakeConnection.peak, FakeConnection.active)
+        return self
+
+    async def __aexit__(self, *exc):
+        FakeConnection.active -= 1
+
+    async def execute(self, statement):
+        await asyncio.sleep(0.01)
+        return FakeResult([statement])
+
+class FakeEngine:
+    def connect(self):
+        return FakeConnection()
+
+@pytest.mark.asyncio
+async def test_run_concurrently_preserves_order_and_caps_connections(monkeypatch):
+    monkeypatch.setattr(module, "engine", FakeEngine())
+    results = await module.run_concurrently("a", "b", "c", "d", "e", max_concurrency=2)
+    assert results == [["a"], ["b"], ["c"], ["d"], ["e"]]
+    assert FakeConnection.peak == 2
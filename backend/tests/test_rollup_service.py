@@ -0,0 +1,49 @@
+from datetime import date, datetime, timezone, timedelta
+from decimal import Decimal
+from sqlalchemy.dialects import postgresql
+from app.models.payment import Payment
+from app.models.revenue import Revenue
+from app.services.rollup_service import rollup_service
+
+def test_payment_snapshot_uses_utc_month_and_default_status():
+    payment = Payment(
+        payee="Acme",
+        reference="INV-1",
+        method="bank_transfer",
+        amount=Decimal("150.00"),
+        payment_date=datetime(2024, 3, 1, 1, 30, tzinfo=timezone(timedelta(hours=2))),
+    )
+    key, amount = rollup_service.snapshot_payment(payment)
+    assert key == (date(2024, 2, 1), "bank_transfer", "pending_approval", "Acme")
+    assert amount == Decimal("150.00")
+
+def test_revenue_snapshot_prefers_collected_date():
+    revenue = Revenue(
+        source="Market fees",
+        category="fees",
+        amount=Decimal("20"),
+        status="collected",
+        collected_date=datetime(2024, 5, 20, tzinfo=timezone.utc),
+        created_at=datetime(2024, 1, 2, tzinfo=timezone.utc),
+    )
+    key, _ = rollup_service.snapshot_revenue(revenue)
+    assert key == (date(2024, 5, 1), "fees", "collected")
+
+async def test_rebuild_bumps_payment_and_revenue_versions():
+    class FakeSession:
+        def __init__(self):
+            self.statements = []
+            self.committed = False
+
+        async def execute(self, statement):
+            self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+
+        async def commit(self):
+            self.committed = True
+
+    db = FakeSession()
+    await rollup_service.rebuild(db)
+    bumps = [s for s in db.statements if s.startswith("INSERT INTO data_versions")]
+    assert len(bumps) == 2 and db.committed
+    # Month buckets use the same date as the day/week spending query
+    assert "coalesce(payments.payment_date, payments.created_at)" in db.statements[2]
@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.services.search_service import escape_like, highlight, search_service
+
+def test_highlight_marks_each_word_and_escapes_html():
+    assert highlight("Acme <Supplies> Ltd", "acme ltd") == "<mark>Acme</mark> &lt;Supplies&gt; <mark>Ltd</mark>"
+    assert highlight("PAY-2024-001", "2024") == "PAY-<mark>2024</mark>-001"
+
+def test_highlight_merges_overlaps_and_skips_fuzzy_only_matches():
+    assert highlight("Globex", "glob lobex") == "<mark>Globex</mark>"
+    assert highlight("Globex", "glbx") is None
+    assert highlight(None, "acme") is None
+
+def test_like_wildcards_are_escaped():
+    assert escape_like("50%_off") == "50\\%\\_off"
+
+def test_query_uses_trigram_operators_and_limit():
+    sql = str(search_service.build("payments", "acme", 5).compile(dialect=postgresql.dialect()))
+    assert "word_similarity" in sql and "%%>" in sql and "ILIKE" in sql
+    assert "ORDER BY score DESC" in sql
+
+async def test_rejects_short_query_and_unknown_type():
+    with pytest.raises(ValueError):
+        await search_service.search("a", ["payments"])
+    with pytest.raises(ValueError):
+        await search_service.search("acme", ["vendors"])
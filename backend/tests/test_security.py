@@ -0,0 +1,33 @@
+import asyncio
+import bcrypt
+from app.core import security
+from app.core.config import settings
+
+async def test_async_hash_round_trip(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    hashed = await security.get_password_hash_async("s3cret")
+    assert await security.verify_password_async("s3cret", hashed)
+    assert not await security.verify_password_async("wrong", hashed)
+    assert not security.needs_rehash(hashed)
+
+def test_needs_rehash_when_cost_changes(monkeypatch):
+    old = bcrypt.hashpw(b"s3cret", bcrypt.gensalt(rounds=4)).decode()
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    assert security.needs_rehash(old)
+    assert security.needs_rehash("not-a-bcrypt-hash")
+
+async def test_hashing_does_not_block_event_loop(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 10)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    task = asyncio.create_task(ticker())
+    await security.get_password_hash_async("s3cret")
+    task.cancel()
+    assert ticks > 1
+    assert security.hash_queue_stats()["queue_depth"] == 0
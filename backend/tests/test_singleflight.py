@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime
+import pytest
+from app.api.v1.endpoints import analytics
+from app.core.singleflight import SingleFlight, flight_key
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    runs = 0
+
+    async def query():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.01)
+        return {"by_status": {"active": 2}}
+
+    results = await asyncio.gather(*[flight.do(flight_key("procurement-trends"), query) for _ in range(10)])
+    assert runs == 1
+    assert all(r == {"by_status": {"active": 2}} for r in results)
+    assert flight.stats() == {"calls": 10, "executions": 1, "coalesced": 9, "in_flight": 0}
+
+@pytest.mark.asyncio
+async def test_key_is_released_after_completion():
+    flight = SingleFlight()
+
+    async def query():
+        return 1
+
+    await flight.do("k", query)
+    await flight.do("k", query)
+    assert flight.executions == 2
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_all_waiters():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(*[flight.do("k", failing) for _ in range(3)], return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+def test_flight_key_normalizes_parameters():
+    when = datetime(2024, 1, 1)
+    assert flight_key("summary", b=[1, 2], a=when) == flight_key("summary", a=when, b=(1, 2))
+    assert flight_key("summary", a=1) != flight_key("trends", a=1)
+
+@pytest.mark.asyncio
+async def test_leader_cancellation_does_not_close_the_shared_session():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    sessions = []
+
+    class FakeSession:
+        closed = False
+
+        async def __aenter__(self):
+            sessions.append(self)
+            return self
+
+        async def __aexit__(self, *exc):
+            self.closed = True
+
+    async def query(session):
+        await release.wait()
+        assert not session.closed
+        return "rows"
+
+    leader = asyncio.ensure_future(flight.do("k", lambda: analytics._in_own_session(FakeSession, query)))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("k", lambda: analytics._in_own_session(FakeSession, query)))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+    assert await follower == "rows"
+    assert leader.cancelled()
+    assert len(sessions) == 1 and sessions[0].closed
@@ -0,0 +1,82 @@
+import json
+import os
+from datetime import datetime, timedelta
+import numpy as np
+from app.services.snapshot_service import (
+    MANIFEST, SNAPSHOT_TABLES, ColumnarSnapshot, SnapshotService, _ColumnWriter, bucket_starts,
+)
+
+PAYMENTS = [
+    (1, "completed", "bank_transfer", "Acme", "100.10", datetime(2024, 1, 5), datetime(2024, 1, 5)),
+    (2, "completed", "check", "Acme", "50.00", datetime(2024, 2, 20), datetime(2024, 2, 20)),
+    (3, "completed", "check", "Globex", "500.00", datetime(2024, 2, 21), datetime(2024, 2, 21)),
+    (4, "pending_approval", "check", "Globex", "999.99", None, datetime(2024, 2, 22)),
+]
+
+def write_snapshot(root, built_at, name="build", rows=PAYMENTS):
+    build_dir = root / name
+    manifest = {"built_at": built_at.isoformat(), "tables": {}}
+    for name, (_, columns) in SNAPSHOT_TABLES.items():
+        table_rows = rows if name == "payments" else []
+        (build_dir / name).mkdir(parents=True)
+        for i, (column, kind) in enumerate(columns.items()):
+            writer = _ColumnWriter(kind)
+            if table_rows:
+                writer.extend([row[i] for row in table_rows])
+            writer.save(build_dir / name, column)
+        manifest["tables"][name] = {"rows": len(table_rows), "columns": columns}
+    (build_dir / MANIFEST).write_text(json.dumps(manifest))
+    return build_dir
+
+def test_group_by_sums_exact_amounts(tmp_path):
+    snapshot = ColumnarSnapshot(write_snapshot(tmp_path, datetime.utcnow()))
+    by_status = snapshot.tables["payments"].group_by("status", "amount")
+    assert by_status["completed"] == {"count": 3, "amount": 650.10}
+    assert by_status["pending_approval"]["count"] == 1
+    assert snapshot.tables["procurements"].group_by("status") == {}
+
+def test_spending_and_top_vendors_match_sql_semantics(tmp_path):
+    snapshot = ColumnarSnapshot(write_snapshot(tmp_path, datetime.utcnow()))
+    buckets = snapshot.spending_by_period("month", datetime(2024, 1, 1), datetime(2024, 3, 1))
+    assert buckets == [(datetime(2024, 1, 1), 100.10), (datetime(2024, 2, 1), 550.0), (datetime(2024, 3, 1), 0.0)]
+
+    vendors = snapshot.top_vendors(limit=1)
+    assert [v["payee"] for v in vendors] == ["Globex"]
+    assert vendors[0]["total"] == 500.0
+    assert vendors[0]["last_payment_date"] == datetime(2024, 2, 21)
+    assert snapshot.top_vendors(limit=5, method="bank_transfer")[0]["payee"] == "Acme"
+
+def test_day_buckets_fall_back_to_created_at_like_the_rollups(tmp_path):
+    snapshot = ColumnarSnapshot(write_snapshot(tmp_path, datetime.utcnow(), rows=[
+        *PAYMENTS, (5, "completed", "check", "Initech", "25.00", None, datetime(2024, 1, 6, 9)),
+    ]))
+    days = dict(snapshot.spending_by_period("day", datetime(2024, 1, 5), datetime(2024, 1, 6)))
+    assert days == {datetime(2024, 1, 5): 100.10, datetime(2024, 1, 6): 25.0}
+
+def test_bucket_starts_match_truncate():
+    dates = np.array([datetime(2024, 5, 15, 13, 45)], dtype="datetime64[s]")
+    assert bucket_starts(dates, "week")[0] == np.datetime64("2024-05-13T00:00:00")
+    assert bucket_starts(dates, "quarter")[0] == np.datetime64("2024-04-01T00:00:00")
+
+def test_stale_snapshot_is_not_served(tmp_path):
+    service = SnapshotService(str(tmp_path))
+    assert service.get(60) is None
+    service._publish(write_snapshot(tmp_path, datetime.utcnow() - timedelta(minutes=5)))
+    assert service.get(None) is None
+    assert service.get(60) is None
+    assert service.get(3600) is not None
+
+def test_superseded_builds_are_pruned_by_age_and_loaded_ones_stay_readable(tmp_path):
+    service = SnapshotService(str(tmp_path))
+    old = write_snapshot(tmp_path, datetime.utcnow(), "old")
+    service._publish(old)
+    loaded = service.current()
+    recent = write_snapshot(tmp_path, datetime.utcnow(), "recent")
+    service._publish(recent)
+    assert old.exists()  # superseded, but other workers may still be opening it
+
+    hour_ago = (datetime.utcnow() - timedelta(hours=1)).timestamp()
+    os.utime(old, (hour_ago, hour_ago))
+    service._publish(write_snapshot(tmp_path, datetime.utcnow(), "newest"))
+    assert not old.exists() and recent.exists()
+    assert loaded.tables["payments"].group_by("status")["completed"]["count"] == 3
@@ -0,0 +1,42 @@
+import time
+import pytest
+from types import SimpleNamespace
+from fastapi import HTTPException
+from app.api import deps
+from app.core import security
+from app.core.config import settings
+from app.core.revocation import MemoryRevocationBackend, revocation_list
+
+class NoDatabase:
+    async def execute(self, statement):
+        raise AssertionError("stateless tokens must not query the database")
+
+USER = SimpleNamespace(id=7, email="jwt@example.com", full_name="Token User", role="analyst", is_superuser=False)
+
+@pytest.fixture(autouse=True)
+def stateless(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_STATELESS_TOKENS", True)
+
+async def test_claims_authorize_without_database():
+    token = security.create_access_token(USER.email, claims=security.user_claims(USER, 3))
+    user = await deps.get_current_user(NoDatabase(), token)
+    assert (user.id, user.role, user.permissions_version) == (7, "analyst", 3)
+
+async def test_revoked_and_refresh_tokens_are_rejected():
+    token = security.create_access_token(USER.email, claims=security.user_claims(USER, 3))
+    payload = security.verify_token(token)
+    await revocation_list.revoke(payload["jti"], payload["exp"])
+    with pytest.raises(HTTPException):
+        await deps.get_current_user(NoDatabase(), token)
+
+    refresh = security.create_refresh_token(USER.email, USER.id)
+    with pytest.raises(HTTPException):
+        await deps.get_current_user(NoDatabase(), refresh)
+
+async def test_memory_backend_forgets_expired_entries():
+    backend = MemoryRevocationBackend()
+    await backend.revoke("old", time.time() - 1)
+    await backend.revoke("new", time.time() + 60)
+    assert not await backend.is_revoked("old")
+    assert await backend.is_revoked("new")
+    assert "old" not in backend._revoked
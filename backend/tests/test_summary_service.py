@@ -0,0 +1,33 @@
+import pytest
+from app.services.summary_service import grouped_dimensions, summary_service
+
+class FakeRow:
+    def __init__(self, **values):
+        self._mapping = values
+
+def test_grouped_dimensions_decodes_grouping_mask():
+    names = ["status", "method"]
+    assert grouped_dimensions(0b00, names) == ["status", "method"]
+    assert grouped_dimensions(0b01, names) == ["status"]
+    assert grouped_dimensions(0b10, names) == ["method"]
+    assert grouped_dimensions(0b11, names) == []
+
+def test_format_splits_rows_by_grouping_set():
+    rows = [
+        FakeRow(dim_status="completed", dim_method=None, grouping_mask=0b01, count=3),
+        FakeRow(dim_status=None, dim_method="check", grouping_mask=0b10, count=2),
+        FakeRow(dim_status=None, dim_method=None, grouping_mask=0b11, count=5),
+    ]
+    summary = summary_service.format(rows, ["status", "method"], ["count"])
+    assert summary["total"] == {"count": 5}
+    assert summary["groups"]["status"] == [{"status": "completed", "count": 3}]
+    assert summary["groups"]["method"] == [{"method": "check", "count": 2}]
+
+def test_build_rejects_unknown_dimensions_and_measures():
+    with pytest.raises(ValueError):
+        summary_service.build("payments", ["department"])
+    with pytest.raises(ValueError):
+        summary_service.build("payments", ["status"], ["sum:estimated_value"])
+    _, dimensions, measures = summary_service.build("procurement", ["status", "status"], ["count", "avg:bids_count"])
+    assert dimensions == ["status"]
+    assert measures == ["count", "avg_bids_count"]
@@ -0,0 +1,54 @@
+import pytest
+from types import SimpleNamespace
+from app.api import deps
+from app.core import security
+from app.core.config import settings
+from app.core.user_cache import CachedUser, invalidate_user, user_cache
+
+class FakeSession:
+    def __init__(self, user):
+        self.user = user
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(first=lambda: self.user))
+
+def make_user(role="analyst"):
+    return SimpleNamespace(
+        id=1, email="cache@example.com", full_name="Cache Test",
+        is_active=True, is_superuser=False, role=role,
+    )
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+async def test_second_request_is_served_from_cache():
+    db = FakeSession(make_user())
+    token = security.create_access_token("cache@example.com")
+    first = await deps.get_current_user(db, token)
+    second = await deps.get_current_user(db, token)
+    assert db.queries == 1
+    assert isinstance(first, CachedUser) and second == first
+    assert user_cache.stats()["hits"] >= 1
+
+async def test_invalidation_picks_up_role_change():
+    db = FakeSession(make_user())
+    token = security.create_access_token("cache@example.com")
+    await deps.get_current_user(db, token)
+    db.user = make_user(role="admin")
+    invalidate_user("cache@example.com")
+    assert (await deps.get_current_user(db, token)).role == "admin"
+    assert db.queries == 2
+
+async def test_cache_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "USER_CACHE_ENABLED", False)
+    user = make_user()
+    db = FakeSession(user)
+    token = security.create_access_token("cache@example.com")
+    assert await deps.get_current_user(db, token) is user
+    await deps.get_current_user(db, token)
+    assert db.queries == 2